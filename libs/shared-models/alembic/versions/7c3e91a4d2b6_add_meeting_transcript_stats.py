@@ -0,0 +1,55 @@
+"""Add meeting_transcript_stats rollup table
+
+Revision ID: 7c3e91a4d2b6
+Revises: 5befe308fa8b
+Create Date: 2026-10-18 10:12:41.508214
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '7c3e91a4d2b6'
+down_revision = '5befe308fa8b'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Fresh databases are created from the models (init_db) before being stamped, so the table may exist
+    if not sa.inspect(op.get_bind()).has_table('meeting_transcript_stats'):
+        op.create_table('meeting_transcript_stats',
+            sa.Column('meeting_id', sa.Integer(), nullable=False),
+            sa.Column('segment_count', sa.Integer(), server_default='0', nullable=False),
+            sa.Column('speech_seconds', sa.Float(), server_default='0', nullable=False),
+            sa.Column('speakers', postgresql.ARRAY(sa.String(length=255)), server_default='{}', nullable=False),
+            sa.Column('languages', postgresql.ARRAY(sa.String(length=10)), server_default='{}', nullable=False),
+            sa.Column('last_segment_at', sa.DateTime(), nullable=True),
+            sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+            sa.ForeignKeyConstraint(['meeting_id'], ['meetings.id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('meeting_id')
+        )
+    # Backfill from the stored transcriptions; the collector keeps the rows current from here on
+    op.execute("""
+        INSERT INTO meeting_transcript_stats (meeting_id, segment_count, speech_seconds, speakers, languages, last_segment_at)
+        SELECT t.meeting_id,
+               count(*),
+               coalesce(sum(t.end_time - t.start_time), 0),
+               coalesce(array_agg(DISTINCT t.speaker ORDER BY t.speaker) FILTER (WHERE t.speaker <> ''), '{}'),
+               coalesce(array_agg(DISTINCT t.language ORDER BY t.language) FILTER (WHERE t.language <> ''), '{}'),
+               max((s.session_start_time AT TIME ZONE 'UTC') + make_interval(secs => t.end_time))
+        FROM transcriptions t
+        LEFT JOIN (
+            SELECT meeting_id, session_uid, min(session_start_time) AS session_start_time
+            FROM meeting_sessions
+            GROUP BY meeting_id, session_uid
+        ) s ON s.meeting_id = t.meeting_id AND s.session_uid = t.session_uid
+        GROUP BY t.meeting_id
+        ON CONFLICT (meeting_id) DO NOTHING
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('meeting_transcript_stats')
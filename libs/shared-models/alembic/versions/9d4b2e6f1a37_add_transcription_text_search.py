@@ -0,0 +1,33 @@
+"""Add full-text search column and GIN index to transcriptions
+
+Revision ID: 9d4b2e6f1a37
+Revises: 7c3e91a4d2b6
+Create Date: 2026-10-18 11:02:17.334520
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9d4b2e6f1a37'
+down_revision = '7c3e91a4d2b6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Adding a stored generated column rewrites the table once (under an exclusive lock)
+    op.execute(
+        "ALTER TABLE transcriptions ADD COLUMN IF NOT EXISTS text_search tsvector "
+        "GENERATED ALWAYS AS (to_tsvector('simple'::regconfig, text)) STORED"
+    )
+    # Built without blocking the collector's inserts
+    with op.get_context().autocommit_block():
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_transcription_text_search ON transcriptions USING gin (text_search)")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_transcription_text_search")
+    op.drop_column('transcriptions', 'text_search')
@@ -1,8 +1,8 @@
 import sqlalchemy
-from sqlalchemy import (Column, String, Text, Integer, DateTime, Float, ForeignKey, Index, UniqueConstraint)
-from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy import (Column, Computed, String, Text, Integer, DateTime, Float, ForeignKey, Index, UniqueConstraint)
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, TSVECTOR
 from sqlalchemy.sql import func, text
-from sqlalchemy.orm import declarative_base, relationship
+from sqlalchemy.orm import declarative_base, deferred, relationship
 from datetime import datetime # Needed for Transcription model default
 from shared_models.schemas import Platform # Import Platform for the static method
 from typing import Optional # Added for the return type hint in constructed_meeting_url
@@ -97,8 +97,25 @@ class Transcription(Base):
     
     session_uid = Column(String, nullable=True, index=True) # Link to the specific bot session
 
+    # Full-text search vector, generated by PostgreSQL; deferred so transcript reads don't fetch it
+    text_search = deferred(Column(TSVECTOR, Computed("to_tsvector('simple'::regconfig, text)", persisted=True)))
+
     # Index for efficient querying by meeting_id and start_time
-    __table_args__ = (Index('ix_transcription_meeting_start', 'meeting_id', 'start_time'),)
+    __table_args__ = (
+        Index('ix_transcription_meeting_start', 'meeting_id', 'start_time'),
+        Index('ix_transcription_text_search', 'text_search', postgresql_using='gin'),
+    )
+
+# Per-meeting transcript rollup, maintained by the transcription collector as it stores segments
+class MeetingTranscriptStats(Base):
+    __tablename__ = "meeting_transcript_stats"
+    meeting_id = Column(Integer, ForeignKey("meetings.id", ondelete="CASCADE"), primary_key=True)
+    segment_count = Column(Integer, nullable=False, server_default='0', default=0)
+    speech_seconds = Column(Float, nullable=False, server_default='0', default=0.0) # Sum of segment durations
+    speakers = Column(ARRAY(String(255)), nullable=False, server_default='{}', default=list) # Distinct, sorted
+    languages = Column(ARRAY(String(10)), nullable=False, server_default='{}', default=list) # Distinct, sorted
+    last_segment_at = Column(DateTime, nullable=True) # UTC end of the latest stored segment (session start + end_time)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
 
 # New table to store session start times
 class MeetingSession(Base):
@@ -551,7 +551,33 @@ class TranscriptionResponse(BaseModel): # Doesn't inherit MeetingResponse to avo
         orm_mode = True # Allows creation from ORM models (e.g., joined query result)
         use_enum_values = True
 
-# --- Utility Schemas --- 
+class TranscriptSearchHit(BaseModel):
+    """A stored transcript segment matching a search."""
+    meeting_id: int = Field(..., description="Internal database ID for the meeting")
+    platform: Platform
+    native_meeting_id: Optional[str]
+    start_time: float = Field(..., alias='start')
+    end_time: float = Field(..., alias='end')
+    text: str
+    speaker: Optional[str] = None
+    language: Optional[str] = None
+    absolute_start_time: Optional[datetime] = Field(None, description="Absolute start timestamp of the segment (UTC)")
+    snippet: str = Field(..., description="The segment text around the matches, with each match wrapped in <mark></mark> (the text itself is not HTML-escaped)")
+    rank: float = Field(..., description="Relevance; results are ordered by it")
+
+    class Config:
+        allow_population_by_field_name = True
+        use_enum_values = True
+
+class TranscriptSearchResponse(BaseModel):
+    """A page of transcript search results."""
+    query: str
+    results: List[TranscriptSearchHit]
+    limit: int
+    offset: int
+    has_more: bool = Field(..., description="Whether a request with offset + limit returns more results")
+
+# --- Utility Schemas ---
 
 class HealthResponse(BaseModel):
     status: str
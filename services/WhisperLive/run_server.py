@@ -47,11 +47,33 @@ if __name__ == "__main__":
     # VAD settings
     parser.add_argument('--vad_onset', type=float, default=settings.VAD_ONSET)
     parser.add_argument('--vad_no_speech_thresh', type=float, default=settings.VAD_NO_SPEECH_THRESH)
+    parser.add_argument('--no_batch_vad', action='store_true', default=not settings.BATCH_VAD,
+                        help='Run the streaming VAD of each TensorRT session separately instead of in shared batches.')
 
     # Transcription output management
     parser.add_argument('--same_output_threshold', type=int, default=settings.SAME_OUTPUT_THRESHOLD)
     parser.add_argument('--show_prev_out_thresh_s', type=float, default=settings.SHOW_PREV_OUT_THRESH_S)
     parser.add_argument('--add_pause_thresh_s', type=float, default=settings.ADD_PAUSE_THRESH_S)
+    parser.add_argument('--no_collector_delta', action='store_true', default=not settings.COLLECTOR_DELTA,
+                        help='Publish the full segment window to the collector stream on every update.')
+
+    # Cross-session batched inference (faster_whisper, single model only)
+    parser.add_argument('--batch_inference', action='store_true', default=settings.BATCH_INFERENCE,
+                        help='Decode pending audio of all sessions together in one batch.')
+    parser.add_argument('--batch_max_size', type=int, default=settings.BATCH_MAX_SIZE)
+    parser.add_argument('--batch_max_wait_s', type=float, default=settings.BATCH_MAX_WAIT_S)
+
+    # Incremental sliding-window decoding (faster_whisper)
+    parser.add_argument('--incremental_decoding', action='store_true', default=settings.INCREMENTAL_DECODING,
+                        help='Decode only the uncommitted tail of the buffer using a local-agreement commit policy.')
+    parser.add_argument('--incremental_overlap_s', type=float, default=settings.INCREMENTAL_OVERLAP_S)
+    parser.add_argument('--incremental_step_s', type=float, default=settings.INCREMENTAL_STEP_S)
+
+    # Asyncio server mode
+    parser.add_argument('--async_server', action='store_true', default=settings.ASYNC_SERVER,
+                        help='Serve all connections from one asyncio event loop with a bounded inference pool.')
+    parser.add_argument('--inference_workers', type=int, default=settings.ASYNC_INFERENCE_WORKERS,
+                        help='Inference threads used in async server mode.')
 
     args = parser.parse_args()
 
@@ -80,8 +102,18 @@ if __name__ == "__main__":
             "min_audio_s": args.min_audio_s,
             "vad_onset": args.vad_onset,
             "vad_no_speech_thresh": args.vad_no_speech_thresh,
+            "batch_vad": not args.no_batch_vad,
             "same_output_threshold": args.same_output_threshold,
             "show_prev_out_thresh_s": args.show_prev_out_thresh_s,
             "add_pause_thresh_s": args.add_pause_thresh_s,
+            "collector_delta": not args.no_collector_delta,
+            "batch_inference": args.batch_inference,
+            "batch_max_size": args.batch_max_size,
+            "batch_max_wait_s": args.batch_max_wait_s,
+            "incremental_decoding": args.incremental_decoding,
+            "incremental_overlap_s": args.incremental_overlap_s,
+            "incremental_step_s": args.incremental_step_s,
+            "async_mode": args.async_server,
+            "inference_workers": args.inference_workers,
         }
     )
@@ -0,0 +1,86 @@
+"""
+Micro-benchmark: bytes copied per second of audio by the per-client audio buffer.
+
+Compares the previous `np.concatenate` based buffer in ServeClientBase (concatenate on
+every packet, slice on trim, `.copy()` of the pending tail in
+get_audio_chunk_for_processing and another `.copy()` in speech_to_text) with
+AudioRingBuffer, which copies each packet once and hands out zero-copy views.
+
+Usage:
+    python scripts/bench_audio_buffer.py [--minutes 10] [--packet_ms 256] [--max_buffer_s 120]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from whisper_live import settings  # noqa: E402
+from whisper_live.audio_buffer import AudioRingBuffer  # noqa: E402
+
+RATE = 16000
+
+
+def run_concatenate(packets, max_buffer_s, discard_buffer_s, pending_s, decode_every):
+    copied = 0
+    frames_np = None
+    for i, packet in enumerate(packets):
+        if frames_np is not None and frames_np.shape[0] > max_buffer_s * RATE:
+            # basic slicing is a view; the next concatenate pays for it
+            frames_np = frames_np[int(discard_buffer_s * RATE):]
+        if frames_np is None:
+            frames_np = packet.copy()
+            copied += packet.nbytes
+        else:
+            frames_np = np.concatenate((frames_np, packet), axis=0)
+            copied += frames_np.nbytes
+        if i % decode_every == 0:
+            tail = frames_np[-int(pending_s * RATE):].copy()    # get_audio_chunk_for_processing
+            sample = tail.copy()                                # speech_to_text
+            copied += tail.nbytes + sample.nbytes
+    return copied
+
+
+def run_ring_buffer(packets, max_buffer_s, discard_buffer_s, pending_s, decode_every):
+    buffer = AudioRingBuffer(max_buffer_s + discard_buffer_s, rate=RATE)
+    for i, packet in enumerate(packets):
+        if buffer.duration > max_buffer_s:
+            buffer.discard(discard_buffer_s)
+        buffer.append(packet)
+        if i % decode_every == 0:
+            buffer.view(buffer.end_time - pending_s)
+    return buffer.bytes_copied
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--minutes", type=float, default=10)
+    parser.add_argument("--packet_ms", type=int, default=256)
+    parser.add_argument("--max_buffer_s", type=float, default=settings.MAX_BUFFER_S)
+    parser.add_argument("--discard_buffer_s", type=float, default=settings.DISCARD_BUFFER_S)
+    parser.add_argument("--pending_s", type=float, default=10.0,
+                        help="Average uncommitted audio handed to the transcriber per decode")
+    parser.add_argument("--decode_interval_s", type=float, default=1.0)
+    args = parser.parse_args()
+
+    packet = np.zeros(int(RATE * args.packet_ms / 1000), dtype=np.float32)
+    packets = [packet] * int(args.minutes * 60 * 1000 / args.packet_ms)
+    decode_every = max(1, int(args.decode_interval_s * 1000 / args.packet_ms))
+    audio_s = len(packets) * args.packet_ms / 1000
+
+    for name, fn in (("concatenate", run_concatenate), ("ring_buffer", run_ring_buffer)):
+        t0 = time.perf_counter()
+        copied = fn(packets, args.max_buffer_s, args.discard_buffer_s, args.pending_s, decode_every)
+        elapsed = time.perf_counter() - t0
+        print(
+            f"{name:12s} audio={audio_s:.0f}s bytes_copied/s_audio={copied / audio_s / 1024:.1f} KiB "
+            f"total={copied / 2**20:.1f} MiB wall={elapsed * 1000:.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Micro-benchmark: JSON vs compact msgpack entries on the transcription stream.
+
+Measures bytes per segment and the encode (WhisperLive) + decode (collector) cost of
+one transcription update, for the full last-N window and for a delta update. The
+decode side mirrors the collector: JSON entries are `json.loads`ed and every time is
+`float()`ed; compact entries are unpacked and expanded into segment dicts.
+
+Usage:
+    python scripts/bench_stream_format.py [--updates 20000] [--window 11] [--delta 2]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from whisper_live import stream_format  # noqa: E402
+
+TOKEN = "x" * 40
+PLATFORM = "teams"
+MEETING_ID = "19:meeting_NjA5ZTM2YjMtNDg4Yi00ZDQ0LWI2NzctYjVkZjBhNTE3ZGUx@thread.v2"
+UID = "6f1c2a9e-4f5b-4b8e-9a57-3d7f0c2e1b44"
+
+
+def make_segments(count):
+    segments = []
+    for i in range(count):
+        start = 600.0 + i * 4.2
+        segments.append({
+            'start': "{:.3f}".format(start),
+            'end': "{:.3f}".format(start + 3.9),
+            'text': " so the next step is to move the rollout to the second region on monday",
+            'completed': i < count - 1,
+            'language': "en",
+        })
+    return segments
+
+
+def json_roundtrip(segments, seq):
+    fields = {"payload": json.dumps({
+        "type": "transcription", "token": TOKEN, "platform": PLATFORM,
+        "meeting_id": MEETING_ID, "segments": segments, "uid": UID, "seq": seq, "delta": True,
+    })}
+    data = json.loads(fields["payload"])
+    for segment in data["segments"]:
+        float(segment["start"]), float(segment["end"])
+    return len(fields["payload"].encode("utf-8"))
+
+
+def compact_roundtrip(segments, seq):
+    fields = stream_format.encode_transcription(UID, segments, seq)
+    raw = fields[stream_format.COMPACT_FIELD]
+    document = stream_format.msgpack.unpackb(raw, raw=False)
+    expanded = [
+        {"start": s[0], "end": s[1], "text": s[2], "completed": s[3], "language": s[4]}
+        for s in document["s"]
+    ]
+    for segment in expanded:
+        float(segment["start"]), float(segment["end"])
+    return len(raw)
+
+
+def run(name, fn, segments, updates):
+    t0 = time.perf_counter()
+    size = 0
+    for seq in range(updates):
+        size = fn(segments, seq)
+    elapsed = time.perf_counter() - t0
+    print(
+        f"  {name:8s} bytes/update={size:5d} bytes/segment={size / len(segments):6.1f} "
+        f"encode+decode={elapsed / updates * 1e6:6.1f} us/update"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--updates", type=int, default=20000)
+    parser.add_argument("--window", type=int, default=11, help="Segments in a full-window update (10 + partial)")
+    parser.add_argument("--delta", type=int, default=2, help="Segments in a delta update")
+    args = parser.parse_args()
+
+    if not stream_format.compact_available():
+        sys.exit("msgpack is not installed")
+
+    for label, count in (("full window", args.window), ("delta", args.delta)):
+        segments = make_segments(count)
+        print(f"{label} ({count} segments):")
+        run("json", json_roundtrip, segments, args.updates)
+        run("msgpack", compact_roundtrip, segments, args.updates)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+import unittest
+
+import numpy as np
+
+from whisper_live.audio_buffer import AudioRingBuffer
+
+
+class TestAudioRingBuffer(unittest.TestCase):
+    def setUp(self):
+        self.rate = 10
+        self.buffer = AudioRingBuffer(capacity_s=2, rate=self.rate)
+
+    def append_seconds(self, start, seconds):
+        frames = np.arange(start, start + seconds * self.rate, dtype=np.float32)
+        self.buffer.append(frames)
+        return frames
+
+    def test_view_uses_absolute_timeline(self):
+        self.append_seconds(0, 1)
+        self.append_seconds(10, 1)
+        self.buffer.discard(0.5)
+
+        self.assertAlmostEqual(self.buffer.start_time, 0.5)
+        self.assertAlmostEqual(self.buffer.end_time, 2.0)
+        np.testing.assert_array_equal(self.buffer.view(1.0, 1.3), [10, 11, 12])
+        np.testing.assert_array_equal(self.buffer.view(0.0)[:2], [5, 6])
+
+    def test_views_survive_compaction(self):
+        self.append_seconds(0, 3)
+        held = self.buffer.view(2.0)
+        expected = held.copy()
+        self.buffer.discard(2.5)
+        for i in range(5):
+            self.append_seconds(100 + 10 * i, 1)
+
+        np.testing.assert_array_equal(held, expected)
+        self.assertAlmostEqual(self.buffer.end_time, 8.0)
+        np.testing.assert_array_equal(self.buffer.view(7.0, 7.2), [140, 141])
+
+    def test_view_shares_memory_with_buffer(self):
+        self.append_seconds(0, 1)
+        view = self.buffer.view()
+        self.assertTrue(np.shares_memory(view, self.buffer.view(0.5)))
+
+
+if __name__ == "__main__":
+    unittest.main()
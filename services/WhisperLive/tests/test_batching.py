@@ -0,0 +1,75 @@
+import threading
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from whisper_live.server import BatchedInferenceScheduler
+
+
+class FakePipeline:
+    def __init__(self):
+        self.calls = []
+        self.word_timestamps = []
+        self.no_speech_thresholds = []
+
+    def transcribe_batch(self, audios, language, **kwargs):
+        self.calls.append((language, len(audios)))
+        self.word_timestamps.append(kwargs.get("word_timestamps"))
+        self.no_speech_thresholds.append(kwargs.get("no_speech_threshold"))
+        return [f"{language}:{len(audio)}" for audio in audios]
+
+
+class TestBatchedInferenceScheduler(unittest.TestCase):
+    def setUp(self):
+        self.pipeline = FakePipeline()
+        with mock.patch("whisper_live.server.BatchedInferencePipeline", return_value=self.pipeline):
+            self.scheduler = BatchedInferenceScheduler(
+                transcriber=None, model_lock=threading.Lock(), max_batch_size=8, max_wait_s=0.2
+            )
+
+    def test_concurrent_windows_share_one_batch(self):
+        futures = [
+            self.scheduler.submit(np.zeros(16000 * (i + 1), dtype=np.float32), "en")
+            for i in range(3)
+        ]
+        results = [future.result(timeout=5) for future in futures]
+
+        self.assertEqual(results, ["en:16000", "en:32000", "en:48000"])
+        self.assertEqual(self.pipeline.calls, [("en", 3)])
+        self.assertEqual(self.scheduler.get_metrics()["batches_run"], 1)
+
+    def test_windows_with_different_languages_are_grouped(self):
+        futures = [
+            self.scheduler.submit(np.zeros(16000, dtype=np.float32), "en"),
+            self.scheduler.submit(np.zeros(16000, dtype=np.float32), "de"),
+            self.scheduler.submit(np.zeros(16000, dtype=np.float32), "en"),
+        ]
+        results = [future.result(timeout=5) for future in futures]
+
+        self.assertEqual(results, ["en:16000", "de:16000", "en:16000"])
+        self.assertEqual(sorted(self.pipeline.calls), [("de", 1), ("en", 2)])
+
+    def test_word_timestamp_windows_are_grouped_separately(self):
+        futures = [
+            self.scheduler.submit(np.zeros(16000, dtype=np.float32), "en"),
+            self.scheduler.submit(np.zeros(16000, dtype=np.float32), "en", word_timestamps=True),
+        ]
+        [future.result(timeout=5) for future in futures]
+
+        self.assertEqual(self.pipeline.calls, [("en", 1), ("en", 1)])
+        self.assertEqual(sorted(self.pipeline.word_timestamps), [False, True])
+
+    def test_windows_with_different_no_speech_thresholds_are_grouped(self):
+        futures = [
+            self.scheduler.submit(np.zeros(16000, dtype=np.float32), "en", no_speech_thresh=0.6),
+            self.scheduler.submit(np.zeros(16000, dtype=np.float32), "en", no_speech_thresh=0.9),
+        ]
+        [future.result(timeout=5) for future in futures]
+
+        self.assertEqual(self.pipeline.calls, [("en", 1), ("en", 1)])
+        self.assertEqual(sorted(self.pipeline.no_speech_thresholds), [0.6, 0.9])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+from collections import namedtuple
+
+from whisper_live.server import LocalAgreementBuffer
+
+Word = namedtuple("Word", ["start", "end", "word"])
+
+
+class TestLocalAgreementBuffer(unittest.TestCase):
+    def test_commits_only_agreed_prefix(self):
+        buffer = LocalAgreementBuffer()
+
+        first = buffer.insert([Word(0.0, 0.4, " Hello"), Word(0.5, 0.9, " word")], window_start=10.0)
+        self.assertEqual(first, [])
+
+        second = buffer.insert(
+            [Word(0.0, 0.4, " hello,"), Word(0.5, 0.9, " world"), Word(1.0, 1.3, " again")],
+            window_start=10.0,
+        )
+        self.assertEqual(second, [(10.0, 10.4, " hello,")])
+        self.assertAlmostEqual(buffer.committed_end, 10.4)
+        self.assertEqual([w[2] for w in buffer.hypothesis], [" world", " again"])
+
+    def test_overlapping_words_are_not_committed_twice(self):
+        buffer = LocalAgreementBuffer()
+        buffer.insert([Word(0.0, 0.4, " one"), Word(0.5, 0.9, " two")], window_start=0.0)
+        buffer.insert([Word(0.0, 0.4, " one"), Word(0.5, 0.9, " two")], window_start=0.0)
+
+        # Next window re-decodes the tail of the committed audio as overlap.
+        committed = buffer.insert([Word(0.0, 0.3, " two"), Word(0.4, 0.8, " three")], window_start=0.6)
+        self.assertEqual(committed, [])
+        self.assertEqual([w[2] for w in buffer.hypothesis], [" three"])
+
+    def test_flush_commits_pending_hypothesis_and_builds_prompt(self):
+        buffer = LocalAgreementBuffer()
+        buffer.insert([Word(0.0, 0.4, " Good"), Word(0.5, 0.9, " morning.")], window_start=0.0)
+
+        self.assertEqual(len(buffer.flush()), 2)
+        self.assertEqual(buffer.hypothesis, [])
+        self.assertEqual(buffer.prompt(), "Good morning.")
+        self.assertEqual(buffer.prompt("Meeting notes:"), "Meeting notes: Good morning.")
+
+
+if __name__ == "__main__":
+    unittest.main()
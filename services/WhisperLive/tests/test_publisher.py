@@ -0,0 +1,170 @@
+import json
+import threading
+import unittest
+from types import SimpleNamespace
+
+import msgpack
+
+from whisper_live.server import ServeClientBase, TranscriptionCollectorClient, merge_segment_updates
+
+
+def segment(start, text, completed=True):
+    return {"start": f"{start:.3f}", "end": f"{start + 1:.3f}", "text": text, "completed": completed}
+
+
+class FakePipeline:
+    def __init__(self, redis_client):
+        self.redis_client = redis_client
+        self.commands = []
+
+    def xadd(self, stream_key, fields):
+        self.commands.append((stream_key, fields))
+
+    def execute(self, raise_on_error=True):
+        self.redis_client.gate.wait(timeout=5)
+        self.redis_client.batches.append(self.commands)
+        return [f"{i}-0" for i in range(len(self.commands))]
+
+
+class FakeRedis:
+    def __init__(self):
+        self.gate = threading.Event()
+        self.batches = []
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class OfflineCollectorClient(TranscriptionCollectorClient):
+    def connect(self):
+        self.redis_client = FakeRedis()
+        self.is_connected = True
+
+
+class TestMergeSegmentUpdates(unittest.TestCase):
+    def test_drops_superseded_partial_and_keeps_scrolled_out_segments(self):
+        queued = [segment(0, "one"), segment(1, "two"), segment(2, "thr", completed=False)]
+        new = [segment(1, "two"), segment(2, "three"), segment(3, "fo", completed=False)]
+
+        merged, dropped = merge_segment_updates(queued, new)
+
+        self.assertEqual([s["text"] for s in merged], ["one", "two", "three", "fo"])
+        self.assertEqual(dropped, 1)
+
+    def test_delta_update_keeps_queued_partials_it_does_not_repeat(self):
+        queued = [segment(0, "one"), segment(1, "tw", completed=False), segment(2, "th", completed=False)]
+        new = [segment(2, "three", completed=False)]
+
+        merged, dropped = merge_segment_updates(queued, new, delta=True)
+
+        self.assertEqual([s["text"] for s in merged], ["one", "tw", "three"])
+        self.assertEqual(dropped, 1)
+
+
+def delta_client():
+    client = SimpleNamespace(collector_published={}, collector_seq=0, collector_delta=True,
+                             token="t", platform="teams", meeting_id="m", client_uid="s1")
+    client._collector_signature = ServeClientBase._collector_signature
+    client.collector_segment_delta = lambda segments: ServeClientBase.collector_segment_delta(client, segments)
+    client.mark_collector_published = lambda segments: ServeClientBase.mark_collector_published(client, segments)
+    return client
+
+
+class TestCollectorSegmentDelta(unittest.TestCase):
+    def test_completed_segments_are_published_once(self):
+        client = delta_client()
+
+        def publish(segments):
+            delta = client.collector_segment_delta(segments)
+            client.mark_collector_published(delta)
+            return delta
+
+        first = publish([segment(0, "one"), segment(1, "tw", completed=False)])
+        second = publish([segment(0, "one"), segment(1, "two"), segment(2, "th", completed=False)])
+        third = publish([segment(0, "one"), segment(1, "two"), segment(2, "th", completed=False)])
+
+        self.assertEqual([s["text"] for s in first], ["one", "tw"])
+        self.assertEqual([s["text"] for s in second], ["two", "th"])
+        self.assertEqual(third, [])
+
+    def test_segments_before_the_window_are_forgotten(self):
+        client = delta_client()
+        client.mark_collector_published(client.collector_segment_delta([segment(0, "one"), segment(1, "two")]))
+        client.mark_collector_published(client.collector_segment_delta([segment(1, "two"), segment(2, "three")]))
+
+        self.assertEqual(sorted(client.collector_published), ["1.000", "2.000"])
+
+    def test_dropped_update_is_sent_again(self):
+        client = delta_client()
+        sent = []
+        accept = [False, True]
+        client.collector_client = SimpleNamespace(
+            send_transcription=lambda **kwargs: sent.append(kwargs) or accept.pop(0))
+
+        ServeClientBase.forward_to_collector(client, [segment(0, "one")])
+        ServeClientBase.forward_to_collector(client, [segment(0, "one"), segment(1, "two")])
+
+        self.assertEqual([s["text"] for s in sent[1]["segments"]], ["one", "two"])
+        self.assertEqual([call["seq"] for call in sent], [1, 1])
+        self.assertEqual(client.collector_seq, 1)
+        self.assertEqual(sorted(client.collector_published), ["0.000", "1.000"])
+
+
+class TestTranscriptionCollectorClientPublisher(unittest.TestCase):
+    def setUp(self):
+        self.client = OfflineCollectorClient(redis_stream_url="redis://fake")
+        self.redis = self.client.redis_client
+
+    def tearDown(self):
+        self.redis.gate.set()
+        self.client.disconnect()
+
+    def test_updates_queued_behind_a_slow_write_are_coalesced(self):
+        self.client.send_transcription("t", "teams", "m", [segment(0, "a", completed=False)], session_uid="s1")
+        # The publisher is now blocked on the first batch; these must not block the caller
+        for i in range(1, 5):
+            segments = [segment(0, "a")] + [segment(j, f"w{j}", completed=j == i - 1) for j in range(1, i + 1)]
+            self.assertTrue(self.client.send_transcription("t", "teams", "m", segments, session_uid="s1"))
+        self.redis.gate.set()
+        self.assertTrue(self.client.flush(timeout=5))
+
+        written = [json.loads(fields["payload"]) for batch in self.redis.batches for _, fields in batch]
+        transcriptions = [p for p in written if p["type"] == "transcription"]
+        self.assertEqual(written[0]["type"], "session_start")
+        self.assertLessEqual(len(transcriptions), 3)
+        self.assertEqual(transcriptions[-1]["segments"][-1]["text"], "w4")
+        metrics = self.client.get_publish_metrics()
+        self.assertEqual(metrics["publish_queue_depth"], 0)
+        self.assertGreaterEqual(metrics["publish_coalesced"], 2)
+
+    def test_delta_updates_queued_behind_a_slow_write_keep_unchanged_partials(self):
+        self.client.send_transcription("t", "teams", "m", [segment(0, "zero")], session_uid="s3", seq=1)
+        # Blocked on the first batch: the next two deltas are merged while queued
+        self.client.send_transcription("t", "teams", "m", [segment(1, "on", completed=False)], session_uid="s3", seq=2)
+        self.client.send_transcription("t", "teams", "m", [segment(2, "tw", completed=False)], session_uid="s3", seq=3)
+        self.redis.gate.set()
+        self.assertTrue(self.client.flush(timeout=5))
+
+        written = [json.loads(fields["payload"]) for batch in self.redis.batches for _, fields in batch]
+        transcriptions = [p for p in written if p["type"] == "transcription"]
+        # "zero" may or may not have been merged too, depending on when the publisher picked it up
+        self.assertEqual([s["text"] for s in transcriptions[-1]["segments"]][-2:], ["on", "tw"])
+        self.assertEqual(transcriptions[-1]["seq"], 3)
+
+    def test_compact_sessions_send_the_header_once(self):
+        self.client.stream_format = "msgpack"
+        self.client.collector_accepts_compact = True
+        self.redis.gate.set()
+        self.client.send_transcription("t", "teams", "m", [segment(0, "a")], session_uid="s2", seq=1)
+        self.assertTrue(self.client.flush(timeout=5))
+
+        written = [fields for batch in self.redis.batches for _, fields in batch]
+        documents = [msgpack.unpackb(fields["mp"]) for fields in written]
+        self.assertEqual([d["t"] for d in documents], ["start", "tx"])
+        self.assertEqual(documents[0]["token"], "t")
+        self.assertNotIn("token", documents[1])
+        self.assertEqual(documents[1]["s"], [[0.0, 1.0, "a", True, None]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,9 @@
 import unittest
 import numpy as np
 from whisper_live.tensorrt_utils import load_audio
-from whisper_live.vad import VoiceActivityDetector
+import threading
+
+from whisper_live.vad import VoiceActivityDetector, StreamingVoiceActivityDetector, BatchedVADService
 
 
 class TestVoiceActivityDetection(unittest.TestCase):
@@ -24,3 +26,103 @@ class TestVoiceActivityDetection(unittest.TestCase):
         audio_tensor = load_audio("assets/jfk.flac")
         is_speech_present = self.vad(audio_tensor)
         self.assertTrue(is_speech_present, "VAD failed to identify speech segment.")
+
+
+class FakeSileroModel:
+    """Returns the mean of each window as its speech probability and counts steps in the state."""
+
+    def __init__(self):
+        self.calls = []
+
+    def run_numpy(self, x, state, sr=16000):
+        self.calls.append(x.shape)
+        return x[:, 64:].mean(axis=1), state + 1
+
+
+class TestStreamingVoiceActivityDetector(unittest.TestCase):
+    def setUp(self):
+        self.model = FakeSileroModel()
+        self.vad = StreamingVoiceActivityDetector(model=self.model)
+
+    def test_only_new_windows_are_evaluated(self):
+        self.assertFalse(self.vad(np.zeros(700, dtype=np.float32)))
+        self.assertEqual(len(self.model.calls), 1)
+        self.assertEqual(self.vad.pending.shape[0], 700 - 512)
+
+        self.assertFalse(self.vad(np.zeros(400, dtype=np.float32)))
+        self.assertEqual(len(self.model.calls), 2)
+        self.assertTrue(all(shape == (1, 576) for shape in self.model.calls))
+
+    def test_state_and_context_carry_across_packets(self):
+        self.vad(np.full(512, 0.25, dtype=np.float32))
+        self.vad(np.ones(1024, dtype=np.float32))
+
+        self.assertEqual(float(self.vad.state[0, 0, 0]), 3.0)
+        np.testing.assert_array_equal(self.vad.context, np.ones(64, dtype=np.float32))
+
+    def test_short_packet_repeats_previous_decision(self):
+        self.assertTrue(self.vad(np.ones(512, dtype=np.float32)))
+        self.assertTrue(self.vad(np.zeros(100, dtype=np.float32)))
+        self.assertEqual(len(self.model.calls), 1)
+
+    def test_sessions_do_not_share_state(self):
+        other = StreamingVoiceActivityDetector(model=self.model)
+        self.vad(np.ones(512, dtype=np.float32))
+        self.assertFalse(other(np.zeros(512, dtype=np.float32)))
+        self.assertEqual(float(other.state[0, 0, 0]), 1.0)
+
+
+class GatedSileroModel(FakeSileroModel):
+    """Blocks the first call until released, so every stream can queue its windows."""
+
+    def __init__(self):
+        super().__init__()
+        self.release = threading.Event()
+
+    def run_numpy(self, x, state, sr=16000):
+        self.release.wait(timeout=5)
+        return super().run_numpy(x, state, sr)
+
+
+class TestBatchedVADService(unittest.TestCase):
+    def test_streams_are_scored_in_shared_batches(self):
+        model = GatedSileroModel()
+        service = BatchedVADService(model=model)
+        streams = [StreamingVoiceActivityDetector(model=model, service=service) for _ in range(4)]
+        results = {}
+
+        def feed(index):
+            level = 1.0 if index % 2 else 0.0
+            results[index] = streams[index](np.full(1024, level, dtype=np.float32))
+
+        threads = [threading.Thread(target=feed, args=(i,)) for i in range(len(streams))]
+        for thread in threads:
+            thread.start()
+        while True:
+            with service.condition:
+                if all(len(stream.queue) == 2 for stream in streams[1:]):
+                    break
+        model.release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results, {0: False, 1: True, 2: False, 3: True})
+        self.assertEqual(service.windows, 8)
+        # the first tick may only hold stream 0; after that all streams share each tick
+        self.assertLessEqual(service.ticks, 3)
+        for stream in streams:
+            self.assertEqual(float(stream.state[0, 0, 0]), 2.0)
+
+    def test_windows_left_after_a_timeout_are_reported_next_time(self):
+        model = GatedSileroModel()
+        service = BatchedVADService(model=model, timeout=0.05)
+        stream = StreamingVoiceActivityDetector(model=model, service=service)
+
+        self.assertFalse(stream(np.ones(512, dtype=np.float32)))  # not scored before the timeout
+        model.release.set()
+        while True:
+            with service.condition:
+                if not stream.queue:
+                    break
+        self.assertTrue(stream(np.zeros(512, dtype=np.float32)))
+        self.assertFalse(stream(np.zeros(512, dtype=np.float32)))
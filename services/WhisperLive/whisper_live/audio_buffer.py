@@ -0,0 +1,105 @@
+import numpy as np
+
+
+class AudioRingBuffer:
+    """
+    Fixed-capacity audio buffer with zero-copy reads on an absolute timeline.
+
+    Samples are appended into a preallocated array and exposed as contiguous
+    NumPy views, so readers (VAD, transcriber) never copy the audio they
+    consume. Discarding old audio only advances the start index. When the
+    write position reaches the end of the storage, the retained samples are
+    moved into a fresh array; outstanding views keep the old array alive, so a
+    view handed to another thread is never overwritten.
+
+    Positions are tracked as absolute sample indices since the start of the
+    stream; `start_time`/`end_time` expose them in seconds.
+    """
+
+    def __init__(self, capacity_s, rate=16000, dtype=np.float32):
+        """
+        Args:
+            capacity_s (float): Expected maximum amount of retained audio in seconds.
+                The storage is sized at twice this, so compaction happens at most once
+                per `capacity_s` seconds of appended audio.
+            rate (int): Sample rate of the stream.
+            dtype: Sample dtype.
+        """
+        self.rate = rate
+        self.dtype = dtype
+        self._storage = np.empty(max(1, int(2 * capacity_s * rate)), dtype=dtype)
+        self._start = 0           # storage index of the oldest retained sample
+        self._end = 0             # storage index one past the newest sample
+        self._base_index = 0      # absolute sample index of storage[0]
+        self.bytes_copied = 0     # total bytes written or moved, for instrumentation
+
+    def __len__(self):
+        return self._end - self._start
+
+    @property
+    def start_index(self):
+        """Absolute index of the oldest retained sample."""
+        return self._base_index + self._start
+
+    @property
+    def end_index(self):
+        """Absolute index one past the newest sample."""
+        return self._base_index + self._end
+
+    @property
+    def start_time(self):
+        return self.start_index / self.rate
+
+    @property
+    def end_time(self):
+        return self.end_index / self.rate
+
+    @property
+    def duration(self):
+        return len(self) / self.rate
+
+    def append(self, frames):
+        """Copy `frames` to the end of the buffer."""
+        n = frames.shape[0]
+        if self._end + n > self._storage.shape[0]:
+            self._compact(n)
+        self._storage[self._end:self._end + n] = frames
+        self._end += n
+        self.bytes_copied += n * self._storage.itemsize
+
+    def discard(self, seconds):
+        """Drop up to `seconds` of the oldest audio without moving any samples."""
+        self._start = min(self._end, self._start + int(seconds * self.rate))
+
+    def view(self, from_time=None, to_time=None):
+        """
+        Return a view of the retained audio between two absolute times.
+
+        The view must be treated as read-only; it stays valid (and unchanged) after
+        further appends and discards.
+
+        Args:
+            from_time (float, optional): Start time in seconds; clamped to the retained range.
+            to_time (float, optional): End time in seconds; defaults to the newest sample.
+
+        Returns:
+            np.ndarray: A view into the buffer (no samples are copied).
+        """
+        start = self._start
+        end = self._end
+        if from_time is not None:
+            start = min(end, max(start, int(from_time * self.rate) - self._base_index))
+        if to_time is not None:
+            end = max(start, min(end, int(to_time * self.rate) - self._base_index))
+        return self._storage[start:end]
+
+    def _compact(self, incoming):
+        retained = len(self)
+        size = max(self._storage.shape[0], 2 * (retained + incoming))
+        storage = np.empty(size, dtype=self.dtype)
+        storage[:retained] = self._storage[self._start:self._end]
+        self.bytes_copied += retained * storage.itemsize
+        self._base_index += self._start
+        self._storage = storage
+        self._start = 0
+        self._end = retained
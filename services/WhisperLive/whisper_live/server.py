@@ -4,6 +4,11 @@ import threading
 import json
 import functools
 import logging
+import queue
+import re
+import collections
+import asyncio
+from concurrent.futures import Future, ThreadPoolExecutor
 from enum import Enum
 from typing import List, Optional
 import datetime
@@ -14,9 +19,15 @@ import socket  # Added to resolve container IP for ws_url
 import torch
 import numpy as np
 from websockets.sync.server import serve
+try:
+    from websockets.asyncio.server import serve as async_serve
+except ImportError:  # websockets < 13
+    from websockets.server import serve as async_serve
 from websockets.exceptions import ConnectionClosed
-from whisper_live.vad import VoiceActivityDetector
-from whisper_live.transcriber import WhisperModel
+from whisper_live.vad import StreamingVoiceActivityDetector, BatchedVADService
+from whisper_live.audio_buffer import AudioRingBuffer
+from whisper_live import stream_format
+from whisper_live.transcriber import WhisperModel, BatchedInferencePipeline
 try:
     from whisper_live.transcriber_tensorrt import WhisperTRTLLM
     TENSORRT_AVAILABLE = True
@@ -68,9 +79,48 @@ logger = logging.getLogger("transcription")
 logger.setLevel(logging.INFO)
 logger.addHandler(file_handler)
 
+def merge_segment_updates(queued_segments, new_segments, delta=False):
+    """Fold a newer transcription update for a session into one still waiting in the outbound queue.
+
+    Segments are keyed by start time; the newer version of a segment wins. Partial
+    (non-completed) segments of the queued update are dropped, since the newer update
+    re-decodes the same audio. Completed segments only present in the queued update are
+    kept, so nothing is lost when they have scrolled out of the newer update's window.
+
+    Delta updates (delta=True) only carry the segments that changed, so a queued partial
+    missing from the newer update is unchanged rather than superseded and is kept.
+
+    Returns:
+        tuple: (merged segments sorted by start time, number of superseded partials dropped)
+    """
+    merged = {}
+    dropped = 0
+    new_starts = {segment.get('start') for segment in new_segments}
+    for segment in queued_segments:
+        if segment.get('completed') or (delta and segment.get('start') not in new_starts):
+            merged[segment.get('start')] = segment
+        else:
+            dropped += 1
+    for segment in new_segments:
+        merged[segment.get('start')] = segment
+
+    def start_key(segment):
+        try:
+            return float(segment.get('start'))
+        except (TypeError, ValueError):
+            return 0.0
+    return sorted(merged.values(), key=start_key), dropped
+
+
 class TranscriptionCollectorClient:
     """Client that maintains connection to Redis on a separate thread
-    and attempts auto-reconnection when the connection is lost."""
+    and attempts auto-reconnection when the connection is lost.
+
+    Stream writes never happen on the caller's thread: messages go to an outbound
+    queue that a publisher thread writes to Redis in pipelined batches. While a
+    transcription update for a session is still queued, newer updates for that
+    session are merged into it instead of queued behind it.
+    """
 
     def __init__(self, redis_stream_url=None):
         """Initialize client with redis connection URL.
@@ -104,9 +154,38 @@ class TranscriptionCollectorClient:
         
         # Track session_uids for which we've published session_start events
         self.session_starts_published = set()
+
+        # Wire format: "json" (default) or "msgpack". The compact format is only used if the
+        # collector advertises it; the choice is fixed per session at session_start.
+        self.stream_format = os.getenv("WL_STREAM_FORMAT", "json").strip().lower()
+        if self.stream_format == "msgpack" and not stream_format.compact_available():
+            logging.warning("WL_STREAM_FORMAT=msgpack but msgpack is not installed; using JSON")
+            self.stream_format = "json"
+        self.collector_accepts_compact = False
+        self.compact_sessions = set()
+
+        # Outbound queue drained by the publisher thread
+        self.publish_queue_max = int(os.getenv("WL_PUBLISH_QUEUE_MAX", "10000"))
+        self.publish_batch_size = int(os.getenv("WL_PUBLISH_BATCH_SIZE", "256"))
+        self.outbound = collections.deque()
+        self.outbound_cond = threading.Condition()
+        self.pending_transcriptions = {}  # session_uid -> queued transcription entry
+        self.publisher_thread = None
+        self.publish_stats = {
+            "enqueued": 0,
+            "published": 0,
+            "dropped": 0,
+            "superseded_partials": 0,
+            "coalesced": 0,
+            "batches": 0,
+            "failed_batches": 0,
+            "latency_total_s": 0.0,
+            "latency_max_s": 0.0,
+        }
         
         # Connect on initialization 
         self.connect()
+        self.start_publisher()
 
     def connect(self):
         """Connect to Redis in a separate thread with auto-reconnection."""
@@ -153,6 +232,7 @@ class TranscriptionCollectorClient:
                 while not self.stop_requested:
                     # Ping Redis to keep connection alive and check health
                     self.redis_client.ping()
+                    self._negotiate_stream_format()
                     time.sleep(5)  # Check connection every 5 seconds
                 
             except redis.ConnectionError as e:
@@ -176,8 +256,158 @@ class TranscriptionCollectorClient:
             time.sleep(retry_delay)
             retry_delay = min(retry_delay * 2, max_retry_delay)
     
+    def _negotiate_stream_format(self):
+        """Use the compact format for new sessions only while every live collector replica advertises it.
+
+        If a replica that cannot read it joins, running compact sessions switch back to JSON:
+        JSON entries carry the full session header, so the collector needs nothing else.
+        """
+        if self.stream_format != "msgpack":
+            return
+        accepts = "msgpack" in self.redis_client.smembers(stream_format.FORMATS_KEY)
+        if accepts != self.collector_accepts_compact:
+            logging.info(f"Collector {'accepts' if accepts else 'does not accept'} compact msgpack stream entries")
+            if not accepts:
+                self.compact_sessions.clear()
+        self.collector_accepts_compact = accepts
+
+    def start_publisher(self):
+        """Start the thread that writes queued messages to Redis."""
+        if self.publisher_thread and self.publisher_thread.is_alive():
+            return
+        self.publisher_thread = threading.Thread(target=self._publisher_worker, daemon=True)
+        self.publisher_thread.start()
+
+    def _enqueue(self, stream_key, fields, kind, session_uid=None, droppable=False, **extra):
+        """Queue one stream entry for the publisher thread.
+
+        Droppable entries (transcription updates, speaker events) are rejected when the
+        queue is full; session lifecycle events are always queued.
+
+        Returns:
+            The queued entry, or None if it was dropped.
+        """
+        entry = {
+            "stream_key": stream_key,
+            "fields": fields,
+            "kind": kind,
+            "session_uid": session_uid,
+            "enqueued_at": time.monotonic(),
+            **extra,
+        }
+        with self.outbound_cond:
+            if droppable and len(self.outbound) >= self.publish_queue_max:
+                self.publish_stats["dropped"] += 1
+                if self.publish_stats["dropped"] % 100 == 1:
+                    logging.warning(f"Redis publish queue full ({len(self.outbound)} entries); dropping {kind} for UID {session_uid}")
+                return None
+            self.outbound.append(entry)
+            self.publish_stats["enqueued"] += 1
+            self.outbound_cond.notify()
+        return entry
+
+    def _publisher_worker(self):
+        """Drain the outbound queue into Redis, one pipeline per batch.
+
+        A batch that fails (e.g. while Redis reconnects) is put back at the head of the
+        queue and retried, so stream order is preserved.
+        """
+        while True:
+            with self.outbound_cond:
+                while not self.outbound and not self.stop_requested:
+                    self.outbound_cond.wait()
+                if not self.outbound and self.stop_requested:
+                    return
+                redis_client = self.redis_client if self.is_connected else None
+                if redis_client is None:
+                    batch = None
+                else:
+                    batch = [self.outbound.popleft() for _ in range(min(self.publish_batch_size, len(self.outbound)))]
+                    for entry in batch:
+                        # Later updates for this session can no longer merge into a popped entry
+                        if entry["kind"] == "transcription" and self.pending_transcriptions.get(entry["session_uid"]) is entry:
+                            del self.pending_transcriptions[entry["session_uid"]]
+
+            if batch is None:
+                if self.stop_requested:
+                    return
+                time.sleep(0.5)  # wait for the connection thread to reconnect
+                continue
+
+            try:
+                pipe = redis_client.pipeline(transaction=False)
+                for entry in batch:
+                    pipe.xadd(entry["stream_key"], entry["fields"])
+                results = pipe.execute(raise_on_error=False)
+            except Exception as e:
+                logging.error(f"Error publishing batch of {len(batch)} messages to Redis: {e}")
+                with self.outbound_cond:
+                    self.outbound.extendleft(reversed(batch))
+                    self.publish_stats["failed_batches"] += 1
+                time.sleep(0.5)
+                continue
+
+            now = time.monotonic()
+            with self.outbound_cond:
+                self.publish_stats["batches"] += 1
+                for entry, result in zip(batch, results):
+                    if isinstance(result, Exception):
+                        logging.error(f"Failed to publish {entry['kind']} for UID {entry['session_uid']} to {entry['stream_key']}: {result}")
+                        continue
+                    latency = now - entry["enqueued_at"]
+                    self.publish_stats["published"] += 1
+                    self.publish_stats["latency_total_s"] += latency
+                    self.publish_stats["latency_max_s"] = max(self.publish_stats["latency_max_s"], latency)
+                    self._log_published(entry)
+
+    def _log_published(self, entry):
+        kind = entry["kind"]
+        if kind == "speaker_event":
+            if WL_LOG_SPEAKER_PUBLISH:
+                event_type = entry["fields"].get('event_type', 'N/A')
+                logging.info(f"Published speaker event ({event_type}) for UID {entry['session_uid']} to {entry['stream_key']}")
+        elif kind == "transcription":
+            logging.debug(f"Published transcription for UID {entry['session_uid']} to {entry['stream_key']}")
+        else:
+            logging.info(f"Published {kind} event for UID {entry['session_uid']} to {entry['stream_key']}")
+
+    def flush(self, timeout=5.0):
+        """Wait until the outbound queue is empty. Returns True if it drained in time."""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            with self.outbound_cond:
+                if not self.outbound:
+                    return True
+            time.sleep(0.05)
+        return False
+
+    def get_publish_metrics(self):
+        """Outbound queue depth, drop counts and enqueue-to-publish latency for /metrics."""
+        with self.outbound_cond:
+            stats = dict(self.publish_stats)
+            depth = len(self.outbound)
+        published = stats["published"]
+        return {
+            "publish_queue_depth": depth,
+            "publish_enqueued": stats["enqueued"],
+            "publish_published": published,
+            "publish_dropped": stats["dropped"],
+            "publish_coalesced": stats["coalesced"],
+            "publish_superseded_partials": stats["superseded_partials"],
+            "publish_batches": stats["batches"],
+            "publish_failed_batches": stats["failed_batches"],
+            "publish_avg_batch_size": (published / stats["batches"]) if stats["batches"] else 0,
+            "publish_latency_avg_ms": (stats["latency_total_s"] / published * 1000) if published else 0,
+            "publish_latency_max_ms": stats["latency_max_s"] * 1000,
+        }
+
     def disconnect(self):
         """Disconnect from Redis and stop the connection thread."""
+        if self.is_connected and not self.flush(timeout=2.0):
+            logging.warning("Disconnecting with unpublished messages still queued")
+        with self.outbound_cond:
+            self.stop_requested = True
+            self.outbound_cond.notify_all()
         with self.connection_lock:
             self.stop_requested = True
             self.is_connected = False
@@ -195,7 +425,7 @@ class TranscriptionCollectorClient:
             logging.info("Disconnected from Redis")
 
     def publish_session_start_event(self, token, platform, meeting_id, session_uid):
-        """Publish a session_start event to the Redis stream.
+        """Queue a session_start event for the Redis stream.
         
         Args:
             token: User's API token
@@ -204,17 +434,12 @@ class TranscriptionCollectorClient:
             session_uid: Unique identifier for this session
         
         Returns:
-            Boolean indicating success or failure
+            Boolean indicating whether the event was queued
         """
         if session_uid in self.session_starts_published:
             logging.debug(f"Session start already published for {session_uid}")
             return True
             
-        # Check connection
-        if not self.is_connected or not self.redis_client:
-            logging.warning("Cannot publish session_start: Not connected to Redis")
-            return False
-            
         # Validate required fields
         if not all([token, platform, meeting_id, session_uid]):
             logging.error("Missing required fields for session_start event")
@@ -234,43 +459,34 @@ class TranscriptionCollectorClient:
                 "start_timestamp": timestamp_iso
             }
             
-            # Publish to Redis stream
-            message = {
-                "payload": json.dumps(payload)
-            }
-            
-            result = self.redis_client.xadd(
-                self.stream_key,
-                message
-            )
-            
-            if result:
-                logging.info(f"Published session_start event for session {session_uid}")
-                # Mark this session as having a published start event
-                self.session_starts_published.add(session_uid)
-                return True
+            # Queue for the Redis stream; the publisher retries until it is written
+            if self.collector_accepts_compact:
+                # The compact session_start carries the session header sent once per session
+                self.compact_sessions.add(session_uid)
+                message = stream_format.encode_session_start(session_uid, token, platform, meeting_id, timestamp_iso)
             else:
-                logging.error(f"Failed to publish session_start event for {session_uid}")
-                return False
+                message = {
+                    "payload": json.dumps(payload)
+                }
+            self._enqueue(self.stream_key, message, "session_start", session_uid)
+            # Mark this session as having a published start event
+            self.session_starts_published.add(session_uid)
+            return True
                 
         except Exception as e:
             logging.error(f"Error publishing session_start event: {e}")
             return False
 
     def publish_speaker_event(self, event_data: dict):
-        """Publish a speaker_activity event to the new Redis stream.
+        """Queue a speaker_activity event for the speaker events Redis stream.
         
         Args:
             event_data: The payload from the Vexa Bot's speaker_activity message.
                         This includes uid, relative_client_timestamp_ms, participant_name, etc.
         
         Returns:
-            Boolean indicating success or failure
+            Boolean indicating whether the event was queued
         """
-        if not self.is_connected or not self.redis_client:
-            logging.warning(f"Cannot publish speaker event to {self.speaker_events_stream_key}: Not connected to Redis")
-            return False
-            
         if not event_data or not isinstance(event_data, dict):
             logging.error(f"Invalid event_data for publishing to {self.speaker_events_stream_key}")
             return False
@@ -288,26 +504,18 @@ class TranscriptionCollectorClient:
             # (typically strings, numbers, or booleans)
             # For simplicity, we assume the structure is already flat as per planstate.md
             
-            result = self.redis_client.xadd(
+            entry = self._enqueue(
                 self.speaker_events_stream_key,
-                redis_message_payload 
+                redis_message_payload,
+                "speaker_event",
+                redis_message_payload.get('uid', 'N/A'),
+                droppable=True,
             )
-            
-            if result:
-                if WL_LOG_SPEAKER_PUBLISH:
-                    uid = redis_message_payload.get('uid', 'N/A')
-                    event_type = redis_message_payload.get('event_type', 'N/A')
-                    logging.info(f"Published speaker event ({event_type}) for UID {uid} to {self.speaker_events_stream_key}")
-                return True
-            else:
-                uid = redis_message_payload.get('uid', 'N/A')
-                logging.error(f"Failed to publish speaker event for UID {uid} to {self.speaker_events_stream_key}")
-                return False
+            return entry is not None
                 
         except Exception as e:
             uid = event_data.get('uid', 'N/A')
             logging.error(f"Error publishing speaker event for UID {uid} to {self.speaker_events_stream_key}: {e}")
-            logging.error(f"Error publishing transcription: {e}")
             return False
 
     def publish_session_end_event(self, token, platform, meeting_id, session_uid):
@@ -323,9 +531,6 @@ class TranscriptionCollectorClient:
         #     "end_timestamp": timestamp_iso 
         # }
         # to self.stream_key (transcription_segments stream)
-        if not self.is_connected or not self.redis_client:
-            logging.warning(f"Cannot publish session_end for UID {session_uid}: Not connected to Redis")
-            return False
         try:
             now = datetime.datetime.utcnow()
             timestamp_iso = now.isoformat() + "Z"
@@ -337,23 +542,34 @@ class TranscriptionCollectorClient:
                 "uid": session_uid,
                 "end_timestamp": timestamp_iso
             }
-            message = {"payload": json.dumps(payload)}
-            result = self.redis_client.xadd(self.stream_key, message)
-            if result:
-                logging.info(f"Published session_end event for UID {session_uid} to {self.stream_key}")
-                # Remove from published starts if present, as session is now considered ended
-                if session_uid in self.session_starts_published:
-                    self.session_starts_published.remove(session_uid)
-                return True
+            if session_uid in self.compact_sessions:
+                self.compact_sessions.discard(session_uid)
+                message = stream_format.encode_session_end(session_uid, timestamp_iso)
             else:
-                logging.error(f"Failed to publish session_end for UID {session_uid} to {self.stream_key}")
-                return False
+                message = {"payload": json.dumps(payload)}
+            with self.outbound_cond:
+                # Transcriptions after session_end must not merge into an update queued before it
+                self.pending_transcriptions.pop(session_uid, None)
+            self._enqueue(self.stream_key, message, "session_end", session_uid)
+            # Remove from published starts if present, as session is now considered ended
+            self.session_starts_published.discard(session_uid)
+            return True
         except Exception as e:
             logging.error(f"Error publishing session_end for UID {session_uid} to {self.stream_key}: {e}")
             return False
 
-    def send_transcription(self, token, platform, meeting_id, segments, session_uid=None):
-        """Send transcription segments to Redis stream (self.stream_key).
+    def _transcription_fields(self, payload):
+        """Encode a transcription payload in the session's wire format."""
+        if payload["uid"] in self.compact_sessions:
+            return stream_format.encode_transcription(payload["uid"], payload["segments"], payload.get("seq"))
+        # Per current structure, the whole payload is JSON dumped into one field
+        return {"payload": json.dumps(payload)}
+
+    def send_transcription(self, token, platform, meeting_id, segments, session_uid=None, seq=None):
+        """Queue transcription segments for the Redis stream (self.stream_key).
+
+        Does not block on Redis. If an earlier update for the same session is still
+        queued, the segments are merged into it (see merge_segment_updates).
         
         Args:
             token: User's API token
@@ -361,14 +577,12 @@ class TranscriptionCollectorClient:
             meeting_id: Platform-specific meeting ID
             segments: List of transcription segments
             session_uid: Optional unique identifier for this session
+            seq: Per-session sequence number; when set, `segments` holds only the
+                segments that changed since the previous update (delta publishing)
             
         Returns:
-            Boolean indicating success or failure
+            Boolean indicating whether the update was queued
         """
-        if not self.is_connected or not self.redis_client:
-            logging.warning(f"Cannot send transcription to {self.stream_key}: Not connected to Redis")
-            return False
-            
         # segments can be an empty list (e.g. for an early session_end or empty audio), 
         # but other fields are required
         if not all([token, platform, meeting_id]): 
@@ -394,23 +608,27 @@ class TranscriptionCollectorClient:
                 "segments": segments, 
                 "uid": session_uid
             }
-            
-            message = {
-                # Per current structure, the whole payload is JSON dumped into one field
-                "payload": json.dumps(payload) 
-            }
-            
-            result = self.redis_client.xadd(
-                self.stream_key, 
-                message
-            )
-            
-            if result:
-                logging.debug(f"Published transcription with {len(segments)} segments for UID {session_uid} to {self.stream_key}")
-                return True
-            else:
-                logging.error(f"Failed to publish transcription for UID {session_uid} to {self.stream_key}")
-                return False
+            if seq is not None:
+                payload["seq"] = seq
+                payload["delta"] = True
+
+            with self.outbound_cond:
+                queued = self.pending_transcriptions.get(session_uid)
+                if queued is not None:
+                    payload["segments"], dropped = merge_segment_updates(queued["segments"], segments, delta=seq is not None)
+                    queued["segments"] = payload["segments"]
+                    queued["fields"] = self._transcription_fields(payload)
+                    self.publish_stats["coalesced"] += 1
+                    self.publish_stats["superseded_partials"] += dropped
+                    return True
+
+                message = self._transcription_fields(payload)
+                entry = self._enqueue(self.stream_key, message, "transcription", session_uid,
+                                      droppable=True, segments=list(segments))
+                if entry is None:
+                    return False
+                self.pending_transcriptions[session_uid] = entry
+            return True
                 
         except Exception as e:
             logging.error(f"Error publishing transcription for UID {session_uid} to {self.stream_key}: {e}")
@@ -538,12 +756,66 @@ class BackendType(Enum):
         return self == BackendType.TENSORRT
 
 
+class AsyncWebSocketAdapter:
+    """
+    Gives an asyncio websocket connection the blocking interface the client classes use.
+
+    `send`/`close` may be called from the event loop or from inference threads; they are
+    scheduled on the loop without waiting for the write. `recv` only serves messages that
+    the async handler already received (the options message), since frames are read on
+    the loop by `TranscriptionServer.recv_audio_async`.
+    """
+
+    def __init__(self, websocket, loop):
+        self.websocket = websocket
+        self.loop = loop
+        self.pending_messages = []
+        self.closed = False
+
+    @property
+    def remote_address(self):
+        return self.websocket.remote_address
+
+    def recv(self):
+        if not self.pending_messages:
+            raise RuntimeError("AsyncWebSocketAdapter.recv() called without a preloaded message")
+        return self.pending_messages.pop(0)
+
+    def send(self, message):
+        if self.closed:
+            raise ConnectionClosed(None, None)
+        self._schedule(self.websocket.send(message))
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            self._schedule(self.websocket.close())
+
+    def _schedule(self, coro):
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self.loop:
+            future = self.loop.create_task(coro)
+        else:
+            future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        future.add_done_callback(self._log_failure)
+
+    @staticmethod
+    def _log_failure(future):
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None and not isinstance(error, ConnectionClosed):
+            logging.error(f"Async websocket write failed: {error}")
+
+
 class TranscriptionServer:
     RATE = 16000
 
     def __init__(self):
         self.client_manager = None
-        self.no_voice_activity_chunks = 0
         self.use_vad = True
         self.single_model = False
         
@@ -778,6 +1050,7 @@ class TranscriptionServer:
                 client_uid=options.get("uid"),
                 model=self.whisper_tensorrt_path,
                 single_model=self.single_model,
+                use_vad=options.get("use_vad", True),
                 platform=options.get("platform"),
                 meeting_url=options.get("meeting_url"),
                 token=options.get("token"),
@@ -818,8 +1091,19 @@ class TranscriptionServer:
         Returns:
             A numpy array containing the audio, or False if END_OF_AUDIO, or None if control message processed.
         """
-        frame_data = websocket.recv()
-        
+        return self.decode_websocket_message(websocket, websocket.recv())
+
+    def decode_websocket_message(self, websocket, frame_data):
+        """
+        Turns one received websocket message into audio, dispatching JSON control messages.
+
+        Args:
+            websocket: The websocket the message was received on.
+            frame_data (bytes or str): The raw message.
+
+        Returns:
+            A numpy array containing the audio, or False if END_OF_AUDIO, or None if control message processed.
+        """
         # Handle END_OF_AUDIO signal
         if frame_data == b"END_OF_AUDIO":
             return False
@@ -990,8 +1274,6 @@ class TranscriptionServer:
                 websocket.close()
                 return False  # Indicates that the connection should not continue
 
-            if self.backend and self.backend.is_tensorrt(): # Check if self.backend is not None
-                self.vad_detector = VoiceActivityDetector(frame_rate=self.RATE)
             self.initialize_client(websocket, options, faster_whisper_custom_model_path,
                                    whisper_tensorrt_path, trt_multilingual)
             return True
@@ -1006,7 +1288,9 @@ class TranscriptionServer:
             return False
 
     def process_audio_frames(self, websocket):
-        frame_np = self.get_audio_from_websocket(websocket)
+        return self.process_audio_frame(websocket, self.get_audio_from_websocket(websocket))
+
+    def process_audio_frame(self, websocket, frame_np):
         client = self.client_manager.get_client(websocket)
         
         # Handle different return values from get_audio_from_websocket
@@ -1022,9 +1306,9 @@ class TranscriptionServer:
         if self.backend.is_tensorrt():
             voice_active = self.voice_activity(websocket, frame_np)
             if voice_active:
-                self.no_voice_activity_chunks = 0
+                client.no_voice_activity_chunks = 0
                 client.set_eos(False)
-            if self.use_vad and not voice_active:
+            if client.use_vad and not voice_active:
                 return True
 
         client.add_frames(frame_np)
@@ -1055,6 +1339,130 @@ class TranscriptionServer:
                 websocket.close()
             del websocket
 
+    async def recv_audio_async(self,
+                               websocket,
+                               backend: BackendType = BackendType.FASTER_WHISPER,
+                               faster_whisper_custom_model_path=None,
+                               whisper_tensorrt_path=None,
+                               trt_multilingual=False):
+        """
+        Asyncio counterpart of `recv_audio` for the async server mode.
+
+        Receiving, control-message dispatch and sending all happen on the event loop; client
+        setup (model loading) runs in the default executor and the client's transcription
+        worker runs as a task that offloads inference to `self.inference_executor`.
+        """
+        loop = asyncio.get_running_loop()
+        self.backend = backend
+        connection = AsyncWebSocketAdapter(websocket, loop)
+        try:
+            connection.pending_messages.append(await websocket.recv())
+        except ConnectionClosed:
+            return
+        if not await loop.run_in_executor(None, functools.partial(
+                self.handle_new_connection, connection, faster_whisper_custom_model_path,
+                whisper_tensorrt_path, trt_multilingual)):
+            return
+
+        client = self.client_manager.get_client(connection)
+        worker = None
+        if client and not client.exit:
+            worker = asyncio.ensure_future(client.speech_to_text_async(self.inference_executor))
+
+        try:
+            while not self.client_manager.is_client_timeout(connection):
+                frame_np = self.decode_websocket_message(connection, await websocket.recv())
+                if self.backend.is_tensorrt() and frame_np is not None and frame_np is not False:
+                    # streaming VAD may block on the shared VAD batch; keep it off the loop
+                    keep_going = await loop.run_in_executor(None, self.process_audio_frame, connection, frame_np)
+                else:
+                    keep_going = self.process_audio_frame(connection, frame_np)
+                if not keep_going:
+                    break
+        except ConnectionClosed:
+            logging.info("Connection closed by client")
+        except Exception as e:
+            logging.error(f"Unexpected error: {str(e)}")
+        finally:
+            if self.client_manager.get_client(connection):
+                self.cleanup(connection)
+                await websocket.close()
+            if worker is not None:
+                await worker
+
+    async def run_async(self, host, port, backend, faster_whisper_custom_model_path,
+                        whisper_tensorrt_path, trt_multilingual):
+        """
+        Serve websocket connections and the health/metrics endpoints on one asyncio event loop.
+
+        Model inference runs in a bounded thread pool (`inference_workers`, default
+        settings.ASYNC_INFERENCE_WORKERS), so mostly-silent connections cost no OS thread.
+        """
+        self.inference_executor = ThreadPoolExecutor(
+            max_workers=int(self.server_options.get("inference_workers", 4)),
+            thread_name_prefix="inference",
+        )
+        if os.getenv("REDIS_STREAM_URL"):
+            await self.start_health_check_server_async(host, 9091)
+
+        async with async_serve(
+            functools.partial(
+                self.recv_audio_async,
+                backend=self.backend,
+                faster_whisper_custom_model_path=faster_whisper_custom_model_path,
+                whisper_tensorrt_path=whisper_tensorrt_path,
+                trt_multilingual=trt_multilingual
+            ),
+            host,
+            port
+        ):
+            self.is_healthy = True # WebSocket server is up
+            logger.info(f"SERVER_RUNNING: WhisperLive async server running on {host}:{port} with health check on {host}:9091/health and max_clients={self.config_max_clients}")
+            self._start_self_monitor()
+            await asyncio.Future()  # serve forever
+
+    async def start_health_check_server_async(self, host, port):
+        """Serve /health and /metrics from the event loop (async server mode)."""
+        loop = asyncio.get_running_loop()
+
+        async def handle(reader, writer):
+            try:
+                request_line = await reader.readline()
+                while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass
+                parts = request_line.decode("latin-1").split()
+                path = parts[1] if len(parts) > 1 else "/"
+                if path == "/health":
+                    status, content_type, body = await loop.run_in_executor(None, self.get_health_response)
+                elif path == "/metrics":
+                    metrics = await loop.run_in_executor(None, self.get_metrics)
+                    status, content_type, body = 200, "application/json", json.dumps(metrics).encode("utf-8")
+                else:
+                    status, content_type, body = 404, "text/plain", b"Not Found"
+                reason = {200: "OK", 404: "Not Found", 503: "Service Unavailable"}.get(status, "")
+                writer.write(
+                    f"HTTP/1.0 {status} {reason}\r\nContent-Type: {content_type}\r\n"
+                    f"Content-Length: {len(body)}\r\n\r\n".encode("latin-1") + body
+                )
+                await writer.drain()
+            except Exception as e:
+                logging.debug(f"Health check request failed: {e}")
+            finally:
+                writer.close()
+
+        try:
+            self.health_server = await asyncio.start_server(handle, host, port)
+            logging.info(f"Health check HTTP server started on {host}:{port} (async)")
+        except Exception as e:
+            logging.error(f"Failed to start health check server: {e}")
+
+    def _start_self_monitor(self):
+        if self.self_monitor_thread is None:
+            self._stop_self_monitor.clear()
+            self.self_monitor_thread = threading.Thread(target=self._self_monitor, daemon=True)
+            self.self_monitor_thread.start()
+            logger.info(f"SELF_MONITOR: Started self-monitoring thread. Interval: {self.health_monitor_interval}s, Max Streak: {self.max_unhealthy_streak}")
+
     def run(self,
             host,
             port=9090,  # Unified port for both GPU and CPU versions
@@ -1073,14 +1481,15 @@ class TranscriptionServer:
         self.trt_multilingual = trt_multilingual
         self.single_model = single_model
         self.server_options = server_options or {}
+        async_mode = self.server_options.get("async_mode", False)
 
         # For the health check, we need to know if Redis is being used.
         # This is inferred from the presence of the REDIS_STREAM_URL env var.
         redis_url_for_health_check = os.getenv("REDIS_STREAM_URL")
-        if redis_url_for_health_check:
+        if redis_url_for_health_check and not async_mode:
             self.start_health_check_server(host, 9091)
 
-        logger.info(f"SERVER_START: host={host}, port={port}, backend={self.backend.value}, single_model={single_model}")
+        logger.info(f"SERVER_START: host={host}, port={port}, backend={self.backend.value}, single_model={single_model}, async_mode={async_mode}")
         # Consul self-registration (if enabled)
         try:
             if getattr(self, "_consul_enabled", False):
@@ -1090,6 +1499,11 @@ class TranscriptionServer:
         
         # Start periodic connection cleanup
         threading.Thread(target=self._periodic_cleanup, daemon=True).start()
+
+        if async_mode:
+            asyncio.run(self.run_async(host, port, self.backend, faster_whisper_custom_model_path,
+                                       whisper_tensorrt_path, trt_multilingual))
+            return
         
         with serve(
             functools.partial(
@@ -1109,11 +1523,7 @@ class TranscriptionServer:
             logging.info(f"WhisperLive server started successfully on {host}:{port}")
             
             # Start self-monitoring thread
-            if self.self_monitor_thread is None:
-                self._stop_self_monitor.clear()
-                self.self_monitor_thread = threading.Thread(target=self._self_monitor, daemon=True)
-                self.self_monitor_thread.start()
-                logger.info(f"SELF_MONITOR: Started self-monitoring thread. Interval: {self.health_monitor_interval}s, Max Streak: {self.max_unhealthy_streak}")
+            self._start_self_monitor()
 
             server.serve_forever()
 
@@ -1317,10 +1727,11 @@ class TranscriptionServer:
         """
         Evaluates the voice activity in a given audio frame and manages the state of voice activity detection.
 
-        This method uses the configured voice activity detection (VAD) model to assess whether the given audio frame
-        contains speech. If the VAD model detects no voice activity for more than three consecutive frames,
-        it sets an end-of-speech (EOS) flag for the associated client. This method aims to efficiently manage
-        speech detection to improve subsequent processing steps.
+        This method uses the client's streaming voice activity detector (VAD), which carries the Silero state
+        across packets, to assess whether the given audio frame contains speech. If the VAD model detects no
+        voice activity for more than three consecutive frames of that client, it sets an end-of-speech (EOS)
+        flag for the client. VAD state and the silence counter are per client, so sessions do not affect
+        each other.
 
         Args:
             websocket: The websocket associated with the current client. Used to retrieve the client object
@@ -1333,10 +1744,10 @@ class TranscriptionServer:
                 after detecting no voice activity for more than three consecutive frames, it also triggers the
                 end-of-speech (EOS) flag for the client.
         """
-        if not self.vad_detector(frame_np):
-            self.no_voice_activity_chunks += 1
-            if self.no_voice_activity_chunks > 3:
-                client = self.client_manager.get_client(websocket)
+        client = self.client_manager.get_client(websocket)
+        if not client.vad_detector(frame_np):
+            client.no_voice_activity_chunks += 1
+            if client.no_voice_activity_chunks > 3:
                 if not client.eos:
                     client.set_eos(True)
                 time.sleep(0.1)    # Sleep 100m; wait some voice activity.
@@ -1358,6 +1769,89 @@ class TranscriptionServer:
         else:
             logging.warning("Attempted to cleanup websocket that was not found in client_manager")
 
+    def check_redis_health(self):
+        """Ping Redis through the collector client. Returns (healthy, error description)."""
+        redis_healthy = False
+        redis_ping_error = "Collector client not initialized"
+        redis_collector = self.collector_client
+        if redis_collector: # Check if collector_client was initialized
+            if redis_collector.redis_client:
+                try:
+                    with redis_collector.connection_lock:
+                        if redis_collector.redis_client: # Double check under lock
+                            redis_collector.redis_client.ping()
+                            redis_healthy = True
+                            redis_ping_error = "None"
+                        else:
+                            redis_ping_error = "redis_collector.redis_client is None (within lock)"
+                except redis.exceptions.RedisError as e:
+                    redis_ping_error = str(e)
+                    logging.warning(f"Health check: Redis ping failed: {e}")
+                except Exception as e:
+                    redis_ping_error = f"Unexpected error during ping: {str(e)}"
+                    logging.warning(f"Health check: Unexpected error during Redis ping: {e}")
+            else: # redis_collector exists but its redis_client is None
+                redis_ping_error = "redis_collector.redis_client is None (implies not connected or error in worker)"
+        return redis_healthy, redis_ping_error
+
+    def get_health_response(self):
+        """Evaluate /health. Returns (status code, content type, body bytes)."""
+        redis_healthy, redis_ping_error = self.check_redis_health()
+        if self.is_healthy and redis_healthy:
+            return 200, 'text/plain', b'OK'
+
+        unhealthy_reasons = []
+        if not self.is_healthy:
+            unhealthy_reasons.append("WebSocket server not ready")
+        if not redis_healthy:
+            unhealthy_reasons.append(f"Redis connection unhealthy (ping error: {redis_ping_error})")
+        logging.warning(f"Health check failed: {', '.join(unhealthy_reasons)}")
+        return 503, 'text/plain', f"Service Unavailable: {', '.join(unhealthy_reasons)}".encode('utf-8')
+
+    def get_metrics(self):
+        """JSON-serialisable load metrics served on /metrics."""
+        import hashlib
+
+        redis_healthy, _ = self.check_redis_health()
+        # client_manager is only created once run() starts
+        all_clients = dict(self.client_manager.clients) if self.client_manager is not None else {}
+        current_sessions = len(all_clients)
+        max_clients = getattr(self, 'max_clients', 10)
+        server_id = getattr(self, '_consul_service_id', 'unknown')
+        # Collect current client UIDs and token hashes for deduplication across servers
+        try:
+            clients = [client for client in all_clients.values() if client is not None]
+            uid_list = [getattr(client, 'client_uid', None) for client in clients]
+            raw_tokens = [getattr(client, 'token', None) for client in clients]
+            token_hashes = [
+                hashlib.sha1(t.encode('utf-8')).hexdigest()[:16]
+                for t in raw_tokens if isinstance(t, str) and len(t) > 0
+            ]
+        except Exception:
+            uid_list = []
+            token_hashes = []
+
+        metrics = {
+            "current_sessions": current_sessions,
+            "max_clients": max_clients,
+            "load_percentage": (current_sessions / max_clients * 100) if max_clients > 0 else 0,
+            "server_healthy": self.is_healthy,
+            "redis_healthy": redis_healthy,
+            "server_id": server_id,
+            "active_uid_count": len([u for u in uid_list if u]),
+            "active_token_count": len(set(token_hashes)),
+            "active_token_hashes": token_hashes,
+            "timestamp": time.time()
+        }
+        metrics.update(ServeClientBase.get_worker_stats())
+        if self.collector_client is not None:
+            metrics.update(self.collector_client.get_publish_metrics())
+        if BatchedVADService._shared is not None:
+            metrics.update(BatchedVADService._shared.get_metrics())
+        if ServeClientFasterWhisper.BATCH_SCHEDULER is not None:
+            metrics["batched_inference"] = ServeClientFasterWhisper.BATCH_SCHEDULER.get_metrics()
+        return metrics
+
     def start_health_check_server(self, host, port):
         """Start a simple HTTP server for health checks.
         
@@ -1367,113 +1861,24 @@ class TranscriptionServer:
 
         class HealthCheckHandler(http.server.SimpleHTTPRequestHandler):
             # Store references passed via functools.partial
-            def __init__(self, *args, transcription_server_ref, redis_collector_ref, **kwargs):
+            def __init__(self, *args, transcription_server_ref, **kwargs):
                 self.transcription_server_instance = transcription_server_ref
-                self.redis_collector = redis_collector_ref # This is the TranscriptionCollectorClient instance
                 super().__init__(*args, **kwargs)
             
             def do_GET(self):
-                server_websocket_healthy = self.transcription_server_instance.is_healthy
-                
-                redis_healthy = False
-                redis_ping_error = "Collector client not initialized"
-                if self.redis_collector: # Check if collector_client was initialized
-                    # Access redis_client via the stored reference
-                    if self.redis_collector.redis_client: 
-                        try:
-                            with self.redis_collector.connection_lock:
-                                if self.redis_collector.redis_client: # Double check under lock
-                                    self.redis_collector.redis_client.ping()
-                                    redis_healthy = True
-                                    redis_ping_error = "None"
-                                else:
-                                    redis_ping_error = "redis_collector.redis_client is None (within lock)"
-                        except redis.exceptions.RedisError as e:
-                            redis_ping_error = str(e) # Typo fixed: redis_ping_Error -> redis_ping_error
-                            logging.warning(f"Health check: Redis ping failed: {e}")
-                        except Exception as e:
-                            redis_ping_error = f"Unexpected error during ping: {str(e)}"
-                            logging.warning(f"Health check: Unexpected error during Redis ping: {e}")
-                    else: # redis_collector exists but its redis_client is None
-                        redis_ping_error = "redis_collector.redis_client is None (implies not connected or error in worker)"
-                
                 if self.path == '/health':
-                    if server_websocket_healthy and redis_healthy:
-                        self.send_response(200)
-                        self.send_header('Content-type', 'text/plain')
-                        self.end_headers()
-                        self.wfile.write(b'OK')
-                    else:
-                        unhealthy_reasons = []
-                        if not server_websocket_healthy:
-                            unhealthy_reasons.append("WebSocket server not ready")
-                        if not redis_healthy:
-                            unhealthy_reasons.append(f"Redis connection unhealthy (ping error: {redis_ping_error})")
-                        
-                        logging.warning(f"Health check failed: {', '.join(unhealthy_reasons)}")
-                        self.send_response(503)
-                        self.send_header('Content-type', 'text/plain')
-                        self.end_headers()
-                        self.wfile.write(f"Service Unavailable: {', '.join(unhealthy_reasons)}".encode('utf-8'))
-                
+                    status, content_type, body = self.transcription_server_instance.get_health_response()
                 elif self.path == '/metrics':
                     # Provide JSON metrics for load monitoring
-                    import json
-                    import hashlib
-                    
-                    # Handle case where transcription_server_instance is None
-                    if self.transcription_server_instance is None:
-                        current_sessions = 0
-                        max_clients = 10
-                        server_id = 'unknown'
-                        uid_list = []
-                        token_hashes = []
-                    else:
-                        current_sessions = len(self.transcription_server_instance.client_manager.clients)
-                        max_clients = getattr(self.transcription_server_instance, 'max_clients', 10)
-                        server_id = getattr(self.transcription_server_instance, '_consul_service_id', 'unknown')
-                        # Collect current client UIDs and token hashes for deduplication across servers
-                        try:
-                            uid_list = [
-                                getattr(client, 'client_uid', None)
-                                for client in self.transcription_server_instance.client_manager.clients.values()
-                                if client is not None
-                            ]
-                            raw_tokens = [
-                                getattr(client, 'token', None)
-                                for client in self.transcription_server_instance.client_manager.clients.values()
-                                if client is not None
-                            ]
-                            token_hashes = [
-                                hashlib.sha1(t.encode('utf-8')).hexdigest()[:16]
-                                for t in raw_tokens if isinstance(t, str) and len(t) > 0
-                            ]
-                        except Exception:
-                            uid_list = []
-                            token_hashes = []
-                    
-                    metrics = {
-                        "current_sessions": current_sessions,
-                        "max_clients": max_clients,
-                        "load_percentage": (current_sessions / max_clients * 100) if max_clients > 0 else 0,
-                        "server_healthy": server_websocket_healthy,
-                        "redis_healthy": redis_healthy,
-                        "server_id": server_id,
-                        "active_uid_count": len([u for u in uid_list if u]),
-                        "active_token_count": len(set(token_hashes)),
-                        "active_token_hashes": token_hashes,
-                        "timestamp": time.time()
-                    }
-                    
-                    self.send_response(200)
-                    self.send_header('Content-type', 'application/json')
-                    self.end_headers()
-                    self.wfile.write(json.dumps(metrics).encode('utf-8'))
+                    metrics = self.transcription_server_instance.get_metrics()
+                    status, content_type, body = 200, 'application/json', json.dumps(metrics).encode('utf-8')
                 else:
-                    self.send_response(404)
-                    self.send_header('Content-type', 'text/plain')
-                    self.end_headers()
-                    self.wfile.write(b'Not Found')
+                    status, content_type, body = 404, 'text/plain', b'Not Found'
+
+                self.send_response(status)
+                self.send_header('Content-type', content_type)
+                self.end_headers()
+                self.wfile.write(body)
             
             # Silence server logs by default, can be enabled for debugging
             def log_message(self, format, *args):
@@ -1484,7 +1889,6 @@ class TranscriptionServer:
         handler_with_context = functools.partial(
             HealthCheckHandler,
             transcription_server_ref=parent_server_instance, # TranscriptionServer's self
-            redis_collector_ref=parent_server_instance.collector_client # The collector instance from TranscriptionServer
         )
         
         try:
@@ -1617,6 +2021,11 @@ class ServeClientBase(object):
     _hallucinations = None
     _hallucinations_loaded = False
 
+    # Transcription worker time accounting across all clients (exposed in /metrics)
+    _worker_stats_lock = threading.Lock()
+    _worker_idle_s = 0.0
+    _worker_busy_s = 0.0
+
     def __init__(self, websocket, language="en", task="transcribe", client_uid=None, 
                  platform=None, meeting_url=None, token=None, meeting_id=None,
                  collector_client_ref: Optional[TranscriptionCollectorClient] = None,
@@ -1637,8 +2046,6 @@ class ServeClientBase(object):
         self.is_multilingual = True
         self.frames = b""
         self.timestamp_offset = 0.0
-        self.frames_np = None
-        self.frames_offset = 0.0
         self.text = []
         self.current_out = ''
         self.prev_out = ''
@@ -1652,16 +2059,36 @@ class ServeClientBase(object):
         self.clip_if_no_segment_s = server_options.get("clip_if_no_segment_s", 25)
         self.clip_retain_s = server_options.get("clip_retain_s", 5)
 
+        # Preallocated per-client audio buffer; its start/end are absolute
+        # stream times, so timestamp_offset indexes into it directly.
+        self.audio_buffer = AudioRingBuffer(self.max_buffer_s + self.discard_buffer_s, rate=self.RATE)
+
         self.show_prev_out_thresh = server_options.get("show_prev_out_thresh_s", 5)   # if pause(no output from whisper) show previous output for 5 seconds
         self.add_pause_thresh = server_options.get("add_pause_thresh_s", 3)       # add a blank to segment list as a pause(no speech) for 3 seconds
         self.transcript = []
         self.send_last_n_segments = 10
 
+        # Delta publishing to the collector: only segments that changed since the
+        # previous update are put on the stream, tagged with a per-session sequence number.
+        # The websocket output still carries the last send_last_n_segments segments.
+        self.collector_delta = server_options.get("collector_delta", True)
+        self.collector_published = {}   # start -> (end, text, completed) last published
+        self.collector_seq = 0
+
         # text formatting
         self.pick_previous_segments = 2
 
         # threading
         self.lock = threading.Lock()
+        # Signalled by add_frames once the worker's wake-up target is buffered,
+        # so transcription threads block instead of polling the buffer.
+        self.audio_ready = threading.Condition(self.lock)
+        self.wake_at_end_time = None
+        self.worker_last_wake = None
+        # In async server mode the worker is an asyncio task woken through audio_event
+        self.async_mode = server_options.get("async_mode", False)
+        self.audio_event = None
+        self.audio_loop = None
         
         # Send SERVER_READY message
         ready_message = json.dumps({"status": self.SERVER_READY, "uid": self.client_uid})
@@ -1676,8 +2103,144 @@ class ServeClientBase(object):
         # Load hallucination filter
         self._load_hallucinations()
 
-    def speech_to_text(self):
+    @property
+    def frames_np(self):
+        """Zero-copy view of the buffered audio, or None before the first frame arrives."""
+        if not len(self.audio_buffer):
+            return None
+        return self.audio_buffer.view()
+
+    @property
+    def frames_offset(self):
+        """Stream time (seconds) of the oldest buffered sample."""
+        return self.audio_buffer.start_time
+
+    def transcription_wait_target(self):
+        """
+        Audio the worker waits for before the next pass.
+
+        Returns:
+            tuple: (min_pending_s, since) as accepted by `wait_for_audio`.
+        """
+        return self.min_audio_s, None
+
+    def transcription_step(self):
+        """Run one transcription pass over the pending audio; implemented by each backend."""
         raise NotImplementedError
+
+    def start_transcription_worker(self):
+        """Start the per-client transcription thread (in async mode the server runs the worker as a task)."""
+        if self.async_mode:
+            return
+        self.trans_thread = threading.Thread(target=self.speech_to_text)
+        self.trans_thread.start()
+
+    def speech_to_text(self):
+        """
+        Process the audio stream in a loop until the client disconnects.
+
+        Blocks until the backend's `transcription_wait_target` is buffered, then runs one
+        `transcription_step`, which transcribes the pending audio and sends segments to the client.
+        """
+        while True:
+            if self.exit:
+                logging.info("Exiting speech to text thread")
+                break
+
+            min_pending_s, since = self.transcription_wait_target()
+            if not self.wait_for_audio(min_pending_s, since=since):
+                continue
+            self.transcription_step()
+
+    async def speech_to_text_async(self, executor):
+        """
+        Asyncio counterpart of `speech_to_text` used by the async server mode.
+
+        Waiting for audio happens on the event loop; only `transcription_step` (model inference
+        and output handling) runs in the bounded inference `executor`.
+        """
+        loop = asyncio.get_running_loop()
+        self.audio_loop = loop
+        self.audio_event = asyncio.Event()
+        while not self.exit:
+            min_pending_s, since = self.transcription_wait_target()
+            if not await self.wait_for_audio_async(min_pending_s, since=since):
+                continue
+            await loop.run_in_executor(executor, self.transcription_step)
+        logging.info("Exiting speech to text task")
+
+    def _signal_audio_ready(self):
+        """Wake the worker, whether it is a thread or an asyncio task. Call with self.lock held."""
+        self.audio_ready.notify_all()
+        if self.audio_event is not None and self.audio_loop is not None:
+            self.audio_loop.call_soon_threadsafe(self.audio_event.set)
+
+    def _record_worker_wait(self, started, woke):
+        with ServeClientBase._worker_stats_lock:
+            if self.worker_last_wake is not None:
+                ServeClientBase._worker_busy_s += started - self.worker_last_wake
+            ServeClientBase._worker_idle_s += woke - started
+        self.worker_last_wake = woke
+
+    @classmethod
+    def get_worker_stats(cls):
+        """Cumulative idle/busy seconds of all transcription worker threads."""
+        with cls._worker_stats_lock:
+            idle, busy = cls._worker_idle_s, cls._worker_busy_s
+        total = idle + busy
+        return {
+            "worker_idle_s": round(idle, 3),
+            "worker_busy_s": round(busy, 3),
+            "worker_busy_ratio": (busy / total) if total > 0 else 0,
+        }
+
+    def wait_for_audio(self, min_pending_s, since=None, timeout=1.0):
+        """
+        Block the transcription worker until enough unprocessed audio is buffered.
+
+        Waits until the buffer extends at least `min_pending_s` past `timestamp_offset`
+        (or past `since`, if later). `add_frames` wakes the worker as soon as that point is
+        reached; `cleanup` wakes it on exit. Time spent here is counted as worker idle time,
+        time between two waits as busy time.
+
+        Args:
+            min_pending_s (float): Seconds of audio required past the reference point.
+            since (float, optional): Absolute stream time to measure from instead of
+                `timestamp_offset` when it is later.
+            timeout (float): Maximum seconds to block before returning.
+
+        Returns:
+            bool: True if the audio is available, False on timeout or exit.
+        """
+        started = time.monotonic()
+        with self.audio_ready:
+            self.wake_at_end_time = max(self.timestamp_offset, since or 0.0) + min_pending_s
+            ready = self.audio_ready.wait_for(
+                lambda: self.exit or self.audio_buffer.end_time >= self.wake_at_end_time,
+                timeout=timeout,
+            )
+            self.wake_at_end_time = None
+        self._record_worker_wait(started, time.monotonic())
+        return bool(ready) and not self.exit
+
+    async def wait_for_audio_async(self, min_pending_s, since=None, timeout=1.0):
+        """Asyncio variant of `wait_for_audio`; waits on `audio_event` instead of blocking a thread."""
+        started = time.monotonic()
+        with self.lock:
+            self.wake_at_end_time = max(self.timestamp_offset, since or 0.0) + min_pending_s
+            ready = self.exit or self.audio_buffer.end_time >= self.wake_at_end_time
+            if not ready:
+                self.audio_event.clear()
+        if not ready:
+            try:
+                await asyncio.wait_for(self.audio_event.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        with self.lock:
+            ready = self.audio_buffer.end_time >= self.wake_at_end_time
+            self.wake_at_end_time = None
+        self._record_worker_wait(started, time.monotonic())
+        return ready and not self.exit
     
     def _load_hallucinations(self):
         """Load hallucination strings from file if not already loaded."""
@@ -1765,28 +2328,25 @@ class ServeClientBase(object):
         of audio frames as they are received. It also ensures that the buffer does not exceed a specified size
         to prevent excessive memory usage.
 
-        If the buffer size exceeds a threshold (45 seconds of audio data), it discards the oldest 30 seconds
-        of audio data to maintain a reasonable buffer size. If the buffer is empty, it initializes it with the provided
-        audio frame. The audio stream buffer is used for real-time processing of audio data for transcription.
+        If the buffer size exceeds a threshold (`max_buffer_s`), it discards the oldest `discard_buffer_s`
+        of audio data to maintain a reasonable buffer size. Frames are copied once into the preallocated
+        ring buffer; discarding only advances its start, so no retained audio is moved.
 
         Args:
             frame_np (numpy.ndarray): The audio frame data as a NumPy array.
 
         """
-        self.lock.acquire()
-        if self.frames_np is not None and self.frames_np.shape[0] > self.max_buffer_s * self.RATE:
-            self.frames_offset += self.discard_buffer_s
-            self.frames_np = self.frames_np[int(self.discard_buffer_s * self.RATE):]
-            # check timestamp offset(should be >= self.frame_offset)
-            # this basically means that there is no speech as timestamp offset hasnt updated
-            # and is less than frame_offset
-            if self.timestamp_offset < self.frames_offset:
-                self.timestamp_offset = self.frames_offset
-        if self.frames_np is None:
-            self.frames_np = frame_np.copy()
-        else:
-            self.frames_np = np.concatenate((self.frames_np, frame_np), axis=0)
-        self.lock.release()
+        with self.lock:
+            if self.audio_buffer.duration > self.max_buffer_s:
+                self.audio_buffer.discard(self.discard_buffer_s)
+                # check timestamp offset(should be >= self.frame_offset)
+                # this basically means that there is no speech as timestamp offset hasnt updated
+                # and is less than frame_offset
+                if self.timestamp_offset < self.frames_offset:
+                    self.timestamp_offset = self.frames_offset
+            self.audio_buffer.append(frame_np)
+            if self.wake_at_end_time is not None and self.audio_buffer.end_time >= self.wake_at_end_time:
+                self._signal_audio_ready()
 
     def clip_audio_if_no_valid_segment(self):
         """
@@ -1795,9 +2355,9 @@ class ServeClientBase(object):
         no valid segment for the last 30 seconds from whisper
         """
         with self.lock:
-            if self.frames_np[int((self.timestamp_offset - self.frames_offset)*self.RATE):].shape[0] > self.clip_if_no_segment_s * self.RATE:
-                duration = self.frames_np.shape[0] / self.RATE
-                self.timestamp_offset = self.frames_offset + duration - self.clip_retain_s
+            end_time = self.audio_buffer.end_time
+            if end_time - max(self.timestamp_offset, self.frames_offset) > self.clip_if_no_segment_s:
+                self.timestamp_offset = end_time - self.clip_retain_s
 
     def get_audio_chunk_for_processing(self):
         """
@@ -1806,7 +2366,8 @@ class ServeClientBase(object):
         Calculates which part of the audio data should be processed next, based on
         the difference between the current timestamp offset and the frame's offset, scaled by
         the audio sample rate (RATE). It then returns this chunk of audio data along with its
-        duration in seconds.
+        duration in seconds. The chunk is a zero-copy view into the audio buffer and must not be
+        modified by the caller.
 
         Returns:
             tuple: A tuple containing:
@@ -1814,8 +2375,7 @@ class ServeClientBase(object):
                 - duration (float): The duration of the audio chunk in seconds.
         """
         with self.lock:
-            samples_take = max(0, (self.timestamp_offset - self.frames_offset) * self.RATE)
-            input_bytes = self.frames_np[int(samples_take):].copy()
+            input_bytes = self.audio_buffer.view(self.timestamp_offset)
         duration = input_bytes.shape[0] / self.RATE
         return input_bytes, duration
 
@@ -1879,15 +2439,7 @@ class ServeClientBase(object):
             }
             self.websocket.send(json.dumps(data))
             
-            # Use the instance's self.collector_client
-            if self.collector_client:
-                self.collector_client.send_transcription(
-                    token=self.token,
-                    platform=self.platform,
-                    meeting_id=self.meeting_id,
-                    segments=segments,
-                    session_uid=self.client_uid
-                )
+            self.forward_to_collector(segments)
             
             # Logging: summary by default; full text only if WL_LOG_TRANSCRIPTS=true
             try:
@@ -1954,19 +2506,73 @@ class ServeClientBase(object):
 
         """
         logging.info("Cleaning up.")
-        self.exit = True
+        with self.audio_ready:
+            self.exit = True
+            self._signal_audio_ready()
 
     def forward_to_collector(self, segments):
         """Forward transcriptions to the collector if available"""
-        if self.collector_client and segments:
-            # Send transcription to collector
-            self.collector_client.send_transcription(
-                token=self.token,
-                platform=self.platform,
-                meeting_id=self.meeting_id,
-                segments=segments,
-                session_uid=self.client_uid
-            )
+        if not self.collector_client or not segments:
+            return
+        seq = None
+        if self.collector_delta:
+            segments = self.collector_segment_delta(segments)
+            if not segments:
+                return
+            seq = self.collector_seq + 1
+        # Send transcription to collector
+        queued = self.collector_client.send_transcription(
+            token=self.token,
+            platform=self.platform,
+            meeting_id=self.meeting_id,
+            segments=segments,
+            session_uid=self.client_uid,
+            seq=seq
+        )
+        # A dropped update (publish queue full) is not recorded, so its segments are sent again next time
+        if queued and self.collector_delta:
+            self.collector_seq = seq
+            self.mark_collector_published(segments)
+
+    @staticmethod
+    def _collector_signature(segment):
+        return (segment.get('end'), segment.get('text'), bool(segment.get('completed')))
+
+    def collector_segment_delta(self, segments):
+        """
+        Returns the segments that changed since the last update published to the collector.
+
+        Segments are keyed by start time, the key the collector stores them under. Completed
+        segments are therefore published once; the partial segment is published whenever its
+        text or end changes. Segments older than the current window are forgotten, since they
+        are never resent. Nothing counts as published until mark_collector_published is called.
+
+        Args:
+            segments (list): The segments sent to the websocket client.
+
+        Returns:
+            list: The new or changed segments, in order.
+        """
+        delta = [
+            segment for segment in segments
+            if self.collector_published.get(segment.get('start')) != self._collector_signature(segment)
+        ]
+
+        window_start = segments[0].get('start')
+        try:
+            window_start = float(window_start)
+            self.collector_published = {
+                key: value for key, value in self.collector_published.items()
+                if float(key) >= window_start
+            }
+        except (TypeError, ValueError):
+            pass
+        return delta
+
+    def mark_collector_published(self, segments):
+        """Record segments as published, once their update was queued for the collector."""
+        for segment in segments:
+            self.collector_published[segment.get('start')] = self._collector_signature(segment)
 
 
 class ServeClientTensorRT(ServeClientBase):
@@ -1975,13 +2581,20 @@ class ServeClientTensorRT(ServeClientBase):
     SINGLE_MODEL_LOCK = threading.Lock()
 
     def __init__(self, websocket, task="transcribe", multilingual=False, language=None, 
-                 client_uid=None, model=None, single_model=False, 
+                 client_uid=None, model=None, single_model=False, use_vad=True,
                  platform=None, meeting_url=None, token=None, meeting_id=None,
                  collector_client_ref: Optional[TranscriptionCollectorClient] = None,
                  server_options: Optional[dict] = None):
         super().__init__(websocket, language, task, client_uid, platform, meeting_url, token, meeting_id,
                          collector_client_ref=collector_client_ref, server_options=server_options)
         self.eos = False
+
+        # Per-session streaming VAD: Silero state and silence counter belong to this client.
+        # With batch_vad, windows of all sessions are scored together by one shared service.
+        self.use_vad = use_vad
+        vad_service = BatchedVADService.get_shared() if (server_options or {}).get("batch_vad", True) else None
+        self.vad_detector = StreamingVoiceActivityDetector(frame_rate=self.RATE, service=vad_service)
+        self.no_voice_activity_chunks = 0
         
         # Log the critical parameters
         logging.info(f"Initializing TensorRT client {client_uid} with platform={platform}, meeting_url={meeting_url}, token={token}")
@@ -1995,9 +2608,7 @@ class ServeClientTensorRT(ServeClientBase):
         else:
             self.create_model(model, multilingual)
 
-        # threading
-        self.trans_thread = threading.Thread(target=self.speech_to_text)
-        self.trans_thread.start()
+        self.start_transcription_worker()
 
         self.websocket.send(json.dumps({
             "uid": self.client_uid,
@@ -2112,45 +2723,28 @@ class ServeClientTensorRT(ServeClientBase):
             
             self.timestamp_offset += duration
 
-    def speech_to_text(self):
-        """
-        Process an audio stream in an infinite loop, continuously transcribing the speech.
-
-        This method continuously receives audio frames, performs real-time transcription, and sends
-        transcribed segments to the client via a WebSocket connection.
-
-        If the client's language is not detected, it waits for 30 seconds of audio input to make a language prediction.
-        It utilizes the Whisper ASR model to transcribe the audio, continuously processing and streaming results. Segments
-        are sent to the client in real-time, and a history of segments is maintained to provide context.Pauses in speech
-        (no output from Whisper) are handled by showing the previous output for a set duration. A blank segment is added if
-        there is no speech for a specified duration to indicate a pause.
-
-        Raises:
-            Exception: If there is an issue with audio processing or WebSocket communication.
+    def transcription_wait_target(self):
+        return 0.4, None
 
+    def transcription_step(self):
         """
-        while True:
-            if self.exit:
-                logging.info("Exiting speech to text thread")
-                break
+        Transcribe the pending audio once and send the result to the client.
 
-            if self.frames_np is None:
-                time.sleep(0.02)    # wait for any audio to arrive
-                continue
-
-            self.clip_audio_if_no_valid_segment()
+        Called by the worker loop (`speech_to_text` / `speech_to_text_async`) whenever at least
+        0.4 seconds of unprocessed audio is buffered.
+        """
+        self.clip_audio_if_no_valid_segment()
 
-            input_bytes, duration = self.get_audio_chunk_for_processing()
-            if duration < 0.4:
-                continue
+        input_bytes, duration = self.get_audio_chunk_for_processing()
+        if duration < 0.4:
+            return
 
-            try:
-                input_sample = input_bytes.copy()
-                logging.debug(f"[WhisperTensorRT:] Processing audio with duration: {duration}")
-                self.transcribe_audio(input_sample)
+        try:
+            logging.debug(f"[WhisperTensorRT:] Processing audio with duration: {duration}")
+            self.transcribe_audio(input_bytes)
 
-            except Exception as e:
-                logging.error(f"[ERROR]: {e}")
+        except Exception as e:
+            logging.error(f"[ERROR]: {e}")
 
     def format_segment(self, start, end, text, completed=False, language=None):
         """
@@ -2351,10 +2945,183 @@ class ServeClientTensorRT(ServeClientBase):
             # Log the language detection to file in a more readable format
             logger.info(f"LANGUAGE_DETECTION: client={self.client_uid}, language={self.language}, confidence={info.language_probability:.4f}")
 
+class LocalAgreementBuffer:
+    """
+    Word-level local-agreement commit policy for incremental decoding.
+
+    Each decoding pass yields a word hypothesis for the uncommitted audio. A
+    word is committed once two consecutive passes agree on it (the longest
+    common prefix of the previous and current hypothesis), so only the
+    unstable tail is decoded again on the next pass. Times are absolute
+    seconds on the session timeline.
+    """
+
+    _NORMALIZE_RE = re.compile(r"[^\w']+")
+
+    def __init__(self, prompt_chars=200):
+        self.committed_end = 0.0
+        self.hypothesis = []
+        self.committed_text = ""
+        self.prompt_chars = prompt_chars
+
+    @classmethod
+    def _normalize(cls, text):
+        return cls._NORMALIZE_RE.sub("", text.lower())
+
+    def insert(self, words, window_start):
+        """
+        Compare a new hypothesis with the previous one and commit the agreed prefix.
+
+        Args:
+            words (list): Word objects with `start`, `end` and `word`, relative to the window.
+            window_start (float): Absolute start time of the decoded window.
+
+        Returns:
+            list: Newly committed (start, end, text) tuples.
+        """
+        new = [
+            (window_start + w.start, window_start + w.end, w.word)
+            for w in words
+            if window_start + w.end > self.committed_end + 0.05
+        ]
+        committed = []
+        while new and self.hypothesis and self._normalize(new[0][2]) == self._normalize(self.hypothesis[0][2]):
+            committed.append(new.pop(0))
+            self.hypothesis.pop(0)
+        self.hypothesis = new
+        self._commit(committed)
+        return committed
+
+    def flush(self):
+        """Commit and return the whole pending hypothesis (e.g. when speech stops)."""
+        committed, self.hypothesis = self.hypothesis, []
+        self._commit(committed)
+        return committed
+
+    def _commit(self, committed):
+        if committed:
+            self.committed_end = committed[-1][1]
+            self.committed_text = (self.committed_text + "".join(w[2] for w in committed))[-self.prompt_chars:]
+
+    def prompt(self, initial_prompt=None):
+        """Decoder prompt made of the caller's prompt plus recently committed text."""
+        context = self.committed_text.strip()
+        if initial_prompt:
+            return f"{initial_prompt} {context}".strip()
+        return context or None
+
+
+class BatchedInferenceScheduler:
+    """
+    Server-wide scheduler that decodes the pending audio windows of many
+    ServeClientFasterWhisper sessions in one batched pass over the shared model.
+
+    Each session thread submits its current window and blocks on the returned
+    future; the scheduler thread gathers whatever other sessions submit within
+    `max_wait_s`, groups requests that share a decoder prompt and decoding options
+    (language, task, initial prompt, VAD settings, word timestamps, no-speech
+    threshold) and runs each group through
+    BatchedInferencePipeline.transcribe_batch. Results go back to the
+    submitting session, which feeds them to handle_transcription_output (or
+    handle_incremental_output for incremental decoding).
+    """
+
+    def __init__(self, transcriber, model_lock, max_batch_size=8, max_wait_s=0.05):
+        self.pipeline = BatchedInferencePipeline(transcriber)
+        self.model_lock = model_lock
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait_s = max(0.0, float(max_wait_s))
+        self.requests = queue.Queue()
+
+        # Counters exposed through /metrics
+        self.batches_run = 0
+        self.windows_processed = 0
+        self.last_batch_size = 0
+
+        self.thread = threading.Thread(target=self._run, name="batched-inference", daemon=True)
+        self.thread.start()
+        logging.info(
+            f"CONFIG: batched inference enabled (max_batch_size={self.max_batch_size}, "
+            f"max_wait_s={self.max_wait_s})"
+        )
+
+    def submit(self, input_sample, language, task="transcribe", initial_prompt=None,
+               use_vad=True, vad_parameters=None, no_speech_thresh=0.6, word_timestamps=False) -> Future:
+        """Queue one audio window for the next batch and return a future for its segments."""
+        future = Future()
+        key = (
+            language,
+            task,
+            initial_prompt,
+            bool(use_vad),
+            json.dumps(vad_parameters, sort_keys=True) if use_vad and vad_parameters else None,
+            bool(word_timestamps),
+            no_speech_thresh,
+        )
+        self.requests.put((key, input_sample, future))
+        return future
+
+    def get_metrics(self):
+        return {
+            "batches_run": self.batches_run,
+            "windows_processed": self.windows_processed,
+            "avg_batch_size": (self.windows_processed / self.batches_run) if self.batches_run else 0,
+            "last_batch_size": self.last_batch_size,
+            "queue_depth": self.requests.qsize(),
+        }
+
+    def _collect(self):
+        batch = [self.requests.get()]
+        deadline = time.monotonic() + self.max_wait_s
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self.requests.get(timeout=remaining) if remaining > 0 else self.requests.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            groups = {}
+            for request in batch:
+                groups.setdefault(request[0], []).append(request)
+
+            for key, requests in groups.items():
+                language, task, initial_prompt, use_vad, vad_parameters, word_timestamps, no_speech_thresh = key
+                try:
+                    with self.model_lock:
+                        results = self.pipeline.transcribe_batch(
+                            [request[1] for request in requests],
+                            language=language,
+                            task=task,
+                            initial_prompt=initial_prompt,
+                            vad_filter=use_vad,
+                            vad_parameters=json.loads(vad_parameters) if vad_parameters else None,
+                            no_speech_threshold=no_speech_thresh,
+                            batch_size=self.max_batch_size,
+                            word_timestamps=word_timestamps,
+                        )
+                except Exception as e:
+                    logging.error(f"[BatchScheduler] Batched transcription failed for {len(requests)} window(s): {e}")
+                    for request in requests:
+                        request[2].set_exception(e)
+                    continue
+
+                for request, result in zip(requests, results):
+                    request[2].set_result(result)
+
+            self.batches_run += 1
+            self.windows_processed += len(batch)
+            self.last_batch_size = len(batch)
+
+
 class ServeClientFasterWhisper(ServeClientBase):
 
     SINGLE_MODEL = None
     SINGLE_MODEL_LOCK = threading.Lock()
+    BATCH_SCHEDULER = None
 
     def __init__(self, websocket, task="transcribe", device=None, language=None, 
                  client_uid=None, model="small.en", initial_prompt=None, 
@@ -2385,6 +3152,16 @@ class ServeClientFasterWhisper(ServeClientBase):
         self.no_speech_thresh = server_options.get("vad_no_speech_thresh", 0.45)
         self.same_output_threshold = server_options.get("same_output_threshold", 10)
         self.end_time_for_same_output = None
+        self.batch_scheduler = None
+
+        # Incremental sliding-window decoding: only the uncommitted tail (plus a
+        # short overlap) is decoded on each pass, see incremental_transcription_step.
+        self.incremental = server_options.get("incremental_decoding", False)
+        self.incremental_overlap_s = server_options.get("incremental_overlap_s", 0.5)
+        self.incremental_step_s = server_options.get("incremental_step_s", 1.0)
+        self.agreement = LocalAgreementBuffer()
+        self.pending_words = []
+        self.decoded_until = 0.0
 
         device = "cuda" if torch.cuda.is_available() else "cpu"
         if device == "cuda":
@@ -2404,6 +3181,16 @@ class ServeClientFasterWhisper(ServeClientBase):
                     ServeClientFasterWhisper.SINGLE_MODEL = self.transcriber
                 else:
                     self.transcriber = ServeClientFasterWhisper.SINGLE_MODEL
+                if server_options.get("batch_inference", False):
+                    with ServeClientFasterWhisper.SINGLE_MODEL_LOCK:
+                        if ServeClientFasterWhisper.BATCH_SCHEDULER is None:
+                            ServeClientFasterWhisper.BATCH_SCHEDULER = BatchedInferenceScheduler(
+                                self.transcriber,
+                                ServeClientFasterWhisper.SINGLE_MODEL_LOCK,
+                                max_batch_size=server_options.get("batch_max_size", 8),
+                                max_wait_s=server_options.get("batch_max_wait_s", 0.05),
+                            )
+                    self.batch_scheduler = ServeClientFasterWhisper.BATCH_SCHEDULER
             else:
                 self.create_model(device)
         except Exception as e:
@@ -2418,9 +3205,7 @@ class ServeClientFasterWhisper(ServeClientBase):
 
         self.use_vad = use_vad
 
-        # threading
-        self.trans_thread = threading.Thread(target=self.speech_to_text)
-        self.trans_thread.start()
+        self.start_transcription_worker()
         self.websocket.send(
             json.dumps(
                 {
@@ -2505,6 +3290,19 @@ class ServeClientFasterWhisper(ServeClientBase):
             depends on the implementation of the `transcriber.transcribe` method but typically
             includes the transcribed text.
         """
+        # Once the language is known the window can share a batch with other
+        # sessions; language detection still runs on the per-session path.
+        if self.batch_scheduler is not None and self.language is not None:
+            return self.batch_scheduler.submit(
+                input_sample,
+                self.language,
+                task=self.task,
+                initial_prompt=self.initial_prompt,
+                use_vad=self.use_vad,
+                vad_parameters=self.vad_parameters,
+                no_speech_thresh=self.no_speech_thresh,
+            ).result()
+
         if ServeClientFasterWhisper.SINGLE_MODEL:
             ServeClientFasterWhisper.SINGLE_MODEL_LOCK.acquire()
         result, info = self.transcriber.transcribe(
@@ -2568,50 +3366,192 @@ class ServeClientFasterWhisper(ServeClientBase):
         if len(segments):
             self.send_transcription_to_client(segments)
 
-    def speech_to_text(self):
-        """
-        Process an audio stream in an infinite loop, continuously transcribing the speech.
+    def transcription_wait_target(self):
+        if self.incremental:
+            # wake once min_audio_s is pending and incremental_step_s arrived since the last pass
+            since = max(self.decoded_until, self.timestamp_offset + self.min_audio_s - self.incremental_step_s)
+            return self.incremental_step_s, since
+        # block until min_audio_s of unprocessed audio is buffered
+        return self.min_audio_s, None
 
-        This method continuously receives audio frames, performs real-time transcription, and sends
-        transcribed segments to the client via a WebSocket connection.
+    def transcription_step(self):
+        """
+        Transcribe the pending audio once and send the resulting segments to the client.
 
-        If the client's language is not detected, it waits for 30 seconds of audio input to make a language prediction.
-        It utilizes the Whisper ASR model to transcribe the audio, continuously processing and streaming results. Segments
-        are sent to the client in real-time, and a history of segments is maintained to provide context.Pauses in speech
-        (no output from Whisper) are handled by showing the previous output for a set duration. A blank segment is added if
+        Called by the worker loop (`speech_to_text` / `speech_to_text_async`) whenever enough new
+        audio is buffered. If the client's language is not detected, the pass is used to make a
+        language prediction. Segments are sent to the client in real-time, and a history of
+        segments is maintained to provide context. Pauses in speech (no output from Whisper) are
+        handled by showing the previous output for a set duration. A blank segment is added if
         there is no speech for a specified duration to indicate a pause.
+        """
+        if self.incremental:
+            self.incremental_transcription_step()
+            return
+
+        self.clip_audio_if_no_valid_segment()
 
-        Raises:
-            Exception: If there is an issue with audio processing or WebSocket communication.
+        input_bytes, duration = self.get_audio_chunk_for_processing()
+        if duration < self.min_audio_s:
+            return
+        try:
+            result = self.transcribe_audio(input_bytes)
 
+            if result is None or self.language is None:
+                # no voice activity: skip this audio and wait for the next min_audio_s
+                with self.lock:
+                    self.timestamp_offset += duration
+                return
+            self.handle_transcription_output(result, duration)
+
+        except Exception as e:
+            logging.error(f"[ERROR]: Failed to transcribe audio chunk: {e}")
+            time.sleep(0.01)
+
+    def incremental_transcription_step(self):
         """
-        while True:
-            if self.exit:
-                logging.info("Exiting speech to text thread")
-                break
+        Incremental variant of `transcription_step` that avoids re-decoding whole utterances.
 
-            if self.frames_np is None:
-                continue
+        Instead of transcribing everything from `timestamp_offset` to the end of the buffer on
+        every pass, each pass decodes only the audio after the last committed word (plus
+        `incremental_overlap_s` of overlap) once at least `incremental_step_s` of new audio has
+        arrived. Recently committed text is passed as the decoder prompt, and words are committed
+        with a local-agreement policy (two consecutive passes must agree), after which
+        `timestamp_offset` moves past them. CPU time per pass is therefore bounded by the unstable
+        tail rather than by the utterance length.
+        """
+        self.clip_audio_if_no_valid_segment()
 
-            self.clip_audio_if_no_valid_segment()
+        with self.lock:
+            buffer_end = self.audio_buffer.end_time
+            window_start = max(self.frames_offset, self.timestamp_offset - self.incremental_overlap_s)
+            pending = buffer_end - self.timestamp_offset
+            new_audio = buffer_end - max(self.decoded_until, self.timestamp_offset)
+            if pending < self.min_audio_s or new_audio < self.incremental_step_s:
+                input_sample = None
+            else:
+                input_sample = self.audio_buffer.view(window_start)
+        if input_sample is None:
+            return
 
-            input_bytes, duration = self.get_audio_chunk_for_processing()
-            if duration < self.min_audio_s:
-                time.sleep(0.1)     # wait for audio chunks to arrive
-                continue
-            try:
-                input_sample = input_bytes.copy()
-                result = self.transcribe_audio(input_sample)
+        try:
+            prompt = self.agreement.prompt(self.initial_prompt)
+            if self.batch_scheduler is not None and self.language is not None:
+                # Share the scheduler's queue (and model lock) with the other sessions
+                result = self.batch_scheduler.submit(
+                    input_sample,
+                    self.language,
+                    task=self.task,
+                    initial_prompt=prompt,
+                    use_vad=self.use_vad,
+                    vad_parameters=self.vad_parameters,
+                    no_speech_thresh=self.no_speech_thresh,
+                    word_timestamps=True,
+                ).result()
+                info = None
+            else:
+                if ServeClientFasterWhisper.SINGLE_MODEL:
+                    ServeClientFasterWhisper.SINGLE_MODEL_LOCK.acquire()
+                try:
+                    result, info = self.transcriber.transcribe(
+                        input_sample,
+                        initial_prompt=prompt,
+                        language=self.language,
+                        task=self.task,
+                        vad_filter=self.use_vad,
+                        vad_parameters=self.vad_parameters if self.use_vad else None,
+                        word_timestamps=True)
+                finally:
+                    if ServeClientFasterWhisper.SINGLE_MODEL:
+                        ServeClientFasterWhisper.SINGLE_MODEL_LOCK.release()
+            self.decoded_until = buffer_end
+
+            if self.language is None and info is not None:
+                self.set_language(info)
+            if self.language is None:
+                with self.lock:
+                    self.timestamp_offset = buffer_end
+                return
+            self.handle_incremental_output(result, window_start, buffer_end)
 
-                if result is None or self.language is None:
-                    self.timestamp_offset += duration
-                    time.sleep(0.25)    # wait for voice activity, result is None when no voice activity
-                    continue
-                self.handle_transcription_output(result, duration)
+        except Exception as e:
+            logging.error(f"[ERROR]: Failed to transcribe audio chunk: {e}")
+            time.sleep(0.01)
 
-            except Exception as e:
-                logging.error(f"[ERROR]: Failed to transcribe audio chunk: {e}")
-                time.sleep(0.01)
+    def handle_incremental_output(self, result, window_start, window_end):
+        """
+        Apply the local-agreement policy to one incremental pass and send the updated segments.
+
+        Committed words are grouped into completed segments at sentence boundaries, while the
+        remaining committed-but-unterminated words and the unstable hypothesis form the partial
+        segment. When a pass finds no speech the pending hypothesis is committed, since it can no
+        longer be confirmed by the next pass.
+
+        Args:
+            result (list or None): Segments with word timestamps, or None if VAD found no speech.
+            window_start (float): Absolute start time of the decoded window.
+            window_end (float): Absolute end time of the decoded window.
+        """
+        words = [
+            word
+            for segment in (result or [])
+            if segment.no_speech_prob <= self.no_speech_thresh
+            for word in (segment.words or [])
+        ]
+        if words:
+            self.t_start = None
+            committed = self.agreement.insert(words, window_start)
+        else:
+            committed = self.agreement.flush()
+
+        self.pending_words.extend(committed)
+        if not words:
+            self._flush_pending_words()
+        elif self.pending_words and self.pending_words[-1][2].rstrip().endswith((".", "?", "!")):
+            self._flush_pending_words()
+
+        with self.lock:
+            if words:
+                self.timestamp_offset = max(self.timestamp_offset, self.agreement.committed_end)
+            else:
+                self.timestamp_offset = max(self.timestamp_offset, window_end)
+
+        last_segment = None
+        partial_words = self.pending_words + self.agreement.hypothesis
+        if partial_words:
+            text = self._filter_hallucinations("".join(w[2] for w in partial_words).strip())
+            if text:
+                last_segment = self.format_segment(
+                    partial_words[0][0], partial_words[-1][1], text,
+                    completed=False, language=self.language)
+
+        if last_segment is not None or committed:
+            segments = self.prepare_segments(last_segment)
+        else:
+            segments = self.get_previous_output()
+        if len(segments):
+            self.send_transcription_to_client(segments)
+
+    def _flush_pending_words(self):
+        """Turn committed words that were waiting for a sentence boundary into a completed segment."""
+        if not self.pending_words:
+            return
+        words, self.pending_words = self.pending_words, []
+        raw_text = "".join(w[2] for w in words).strip()
+        text = self._filter_hallucinations(raw_text)
+        if not text:
+            if text is None and WL_LOG_HALLUCINATIONS:
+                logger.info(f'HALLUCINATION_FILTERED: "{raw_text}"')
+            return
+        self.text.append(text)
+        with self.lock:
+            self.transcript.append(self.format_segment(
+                words[0][0], words[-1][1], text, completed=True, language=self.language))
+        try:
+            if self.collector_client and hasattr(self.collector_client, 'server_ref') and self.collector_client.server_ref:
+                self.collector_client.server_ref.server_last_transcription_ts = time.time()
+        except Exception:
+            pass
 
     def format_segment(self, start, end, text, completed=False, language=None):
         """
@@ -67,6 +67,20 @@ VAD_ONSET = 0.5
 # chunk. This is used by the Whisper model's internal VAD.
 VAD_NO_SPEECH_THRESH = 0.9
 
+# Score the streaming VAD windows of all TensorRT sessions together, with one
+# ONNX call per tick, instead of one call per session and window
+# (env: WL_BATCH_VAD).
+BATCH_VAD = os.getenv("WL_BATCH_VAD", "true").strip().lower() in ("1", "true", "yes", "on")
+
+
+# Collector Publishing
+# --------------------
+# Publish only new and changed segments (plus a per-session sequence number)
+# to the collector stream instead of the full last-N window on every decode.
+# Clients connected over the websocket still receive the full window
+# (env: WL_COLLECTOR_DELTA).
+COLLECTOR_DELTA = os.getenv("WL_COLLECTOR_DELTA", "true").strip().lower() in ("1", "true", "yes", "on")
+
 
 # Transcription Output Management
 # -------------------------------
@@ -96,4 +110,55 @@ ADD_PAUSE_THRESH_S = 3
 # processing, while larger values (5) use beam search for potentially better
 # quality but slower processing. For real-time applications, beam_size=1 is
 # recommended for optimal performance.
-BEAM_SIZE = 1 # default 5
\ No newline at end of file
+BEAM_SIZE = 1 # default 5
+
+# Cross-Session Batched Inference
+# -------------------------------
+# When the faster_whisper backend runs in single-model mode, every session
+# normally waits on a shared lock and decodes one after another. With batched
+# inference enabled, a server-wide scheduler collects the pending audio windows
+# of all sessions and decodes them together through BatchedInferencePipeline.
+
+# Enable the cross-session batch scheduler (env: WL_BATCH_INFERENCE).
+BATCH_INFERENCE = os.getenv("WL_BATCH_INFERENCE", "false").strip().lower() in ("1", "true", "yes", "on")
+
+# Maximum number of 30-second chunks decoded in one encoder/decoder call.
+BATCH_MAX_SIZE = int(os.getenv("WL_BATCH_MAX_SIZE", "8"))
+
+# How long (in seconds) the scheduler waits for more sessions to submit audio
+# after the first request of a batch arrives. Larger values build fuller
+# batches at the cost of added latency.
+BATCH_MAX_WAIT_S = float(os.getenv("WL_BATCH_MAX_WAIT_S", "0.05"))
+
+
+# Incremental Decoding
+# --------------------
+# By default every pass re-transcribes all audio since the last completed
+# segment, so a long unfinished utterance is decoded many times. Incremental
+# decoding keeps the committed prefix as the decoder prompt and decodes only
+# the uncommitted tail, committing words once two consecutive passes agree.
+
+# Enable incremental sliding-window decoding (env: WL_INCREMENTAL_DECODING).
+INCREMENTAL_DECODING = os.getenv("WL_INCREMENTAL_DECODING", "false").strip().lower() in ("1", "true", "yes", "on")
+
+# Seconds of already committed audio re-decoded in front of the uncommitted
+# tail, so words cut at the commit point are recognised in full.
+INCREMENTAL_OVERLAP_S = 0.5
+
+# Minimum seconds of newly arrived audio before the next incremental pass.
+INCREMENTAL_STEP_S = 1.0
+
+
+# Asyncio Server Mode
+# -------------------
+# By default every connection gets its own receive thread plus a transcription
+# thread. In async mode all connections are served from one asyncio event loop
+# and model inference runs in a bounded thread pool, so a server holding many
+# mostly-silent meetings does not pay for two OS threads per connection.
+
+# Serve websocket connections from an asyncio event loop (env: WL_ASYNC_SERVER).
+ASYNC_SERVER = os.getenv("WL_ASYNC_SERVER", "false").strip().lower() in ("1", "true", "yes", "on")
+
+# Size of the inference thread pool used in async mode
+# (env: WL_ASYNC_INFERENCE_WORKERS).
+ASYNC_INFERENCE_WORKERS = int(os.getenv("WL_ASYNC_INFERENCE_WORKERS", "4"))
@@ -0,0 +1,68 @@
+"""
+Compact msgpack encoding of entries on the transcription stream.
+
+The default wire format is a single "payload" field holding a JSON document that
+repeats the token, platform and meeting id and formats times as strings on every
+update. The compact format is opt-in (WL_STREAM_FORMAT=msgpack) and is only used
+while the transcription collector advertises support for it in the
+`FORMATS_KEY` set (which holds the formats every live collector replica reads):
+
+- the session_start entry carries the session header (token, platform, meeting id)
+  once; the collector keeps it for the rest of the session,
+- transcription entries carry only the session uid, the sequence number and the
+  segments as `[start, end, text, completed, language]` lists with float times.
+
+Each compact entry is a single "mp" field holding the msgpack document.
+"""
+
+try:
+    import msgpack
+except ImportError:  # optional dependency
+    msgpack = None
+
+COMPACT_FIELD = "mp"
+COMPACT_VERSION = 1
+FORMATS_KEY = "transcription_collector:stream_formats"
+
+
+def compact_available():
+    return msgpack is not None
+
+
+def _pack(document):
+    document["v"] = COMPACT_VERSION
+    return {COMPACT_FIELD: msgpack.packb(document, use_bin_type=True)}
+
+
+def pack_segment(segment):
+    """Turn a formatted segment dict into a `[start, end, text, completed, language]` list."""
+    return [
+        float(segment.get('start', 0.0)),
+        float(segment.get('end', 0.0)),
+        segment.get('text', ''),
+        bool(segment.get('completed', False)),
+        segment.get('language'),
+    ]
+
+
+def encode_session_start(session_uid, token, platform, meeting_id, start_timestamp):
+    return _pack({
+        "t": "start",
+        "uid": session_uid,
+        "token": token,
+        "platform": platform,
+        "meeting_id": meeting_id,
+        "ts": start_timestamp,
+    })
+
+
+def encode_session_end(session_uid, end_timestamp):
+    return _pack({"t": "end", "uid": session_uid, "ts": end_timestamp})
+
+
+def encode_transcription(session_uid, segments, seq=None):
+    document = {"t": "tx", "uid": session_uid, "s": [pack_segment(segment) for segment in segments]}
+    if seq is not None:
+        document["seq"] = seq
+        document["delta"] = True
+    return _pack(document)
@@ -121,7 +121,7 @@ class BatchedInferencePipeline:
         self.model: WhisperModel = model
         self.last_speech_timestamp = 0.0
 
-    def forward(self, features, tokenizer, chunks_metadata, options):
+    def forward(self, features, tokenizer, chunks_metadata, options, owners=None):
         encoder_output, outputs = self.generate_segment_batched(
             features, tokenizer, options
         )
@@ -172,6 +172,7 @@ class BatchedInferencePipeline:
                 options.prepend_punctuations,
                 options.append_punctuations,
                 self.last_speech_timestamp,
+                segment_owners=owners,
             )
 
         return segmented_outputs
@@ -594,6 +595,161 @@ class BatchedInferencePipeline:
         pbar.close()
         self.last_speech_timestamp = 0.0
 
+    def transcribe_batch(
+        self,
+        audios: List[np.ndarray],
+        language: str,
+        task: str = "transcribe",
+        initial_prompt: Optional[str] = None,
+        vad_filter: bool = True,
+        vad_parameters: Optional[Union[dict, VadOptions]] = None,
+        beam_size: int = settings.BEAM_SIZE,
+        no_speech_threshold: Optional[float] = 0.6,
+        batch_size: int = 8,
+        word_timestamps: bool = False,
+    ) -> List[Optional[List[Segment]]]:
+        """Transcribe several independent audio windows in shared batches.
+
+        Unlike `transcribe`, every input is a separate stream (e.g. one live
+        session each), so segment timestamps are relative to the start of the
+        window they came from. All windows must share the same language, task
+        and prompt because those define the decoder prompt of the batch.
+
+        Arguments:
+            audios: List of 16 kHz float32 waveforms.
+            language: Language code used for every window (must not be None).
+            task: Task to execute (transcribe or translate).
+            initial_prompt: Optional text prompt applied to every window.
+            vad_filter: Drop non-speech parts of each window before decoding.
+            vad_parameters: Dictionary of Silero VAD parameters or VadOptions.
+            beam_size: Beam size to use for decoding.
+            no_speech_threshold: Threshold stored in the options, as in `transcribe`.
+            batch_size: Maximum number of 30-second chunks per encoder/decoder call.
+            word_timestamps: Extract word-level timestamps (relative to each window).
+
+        Returns:
+            A list aligned with `audios`; each item is the list of segments for
+            that window, or None when the window contains no speech.
+        """
+        sampling_rate = self.model.feature_extractor.sampling_rate
+        chunk_length = self.model.feature_extractor.chunk_length
+
+        if not self.model.model.is_multilingual and language != "en":
+            language = "en"
+
+        if vad_filter:
+            if vad_parameters is None:
+                vad_parameters = VadOptions(
+                    max_speech_duration_s=chunk_length,
+                    min_silence_duration_ms=160,
+                    onset=float(os.getenv("VAD_FILTER_THRESHOLD", "0.5")),
+                )
+            elif isinstance(vad_parameters, dict):
+                vad_parameters = VadOptions(
+                    **{**vad_parameters, "max_speech_duration_s": chunk_length}
+                )
+
+        # Flatten every window into <=30 s chunks, remembering which window
+        # each chunk belongs to so the batched outputs can be routed back.
+        features = []
+        chunks_metadata = []
+        owners = []
+        for index, audio in enumerate(audios):
+            if vad_filter:
+                clip_timestamps = merge_segments(
+                    get_speech_timestamps(audio, vad_parameters), vad_parameters
+                )
+            else:
+                step = chunk_length * sampling_rate
+                clip_timestamps = [
+                    {"start": start, "end": min(start + step, audio.shape[0])}
+                    for start in range(0, audio.shape[0], step)
+                ]
+            if not clip_timestamps:
+                continue
+            audio_chunks, metadata = collect_chunks(audio, clip_timestamps)
+            for chunk, chunk_metadata in zip(audio_chunks, metadata):
+                features.append(
+                    pad_or_trim(self.model.feature_extractor(chunk)[..., :-1])
+                )
+                chunks_metadata.append(chunk_metadata)
+                owners.append(index)
+
+        results: List[Optional[List[Segment]]] = [None] * len(audios)
+        if not features:
+            return results
+
+        tokenizer = Tokenizer(
+            self.model.hf_tokenizer,
+            self.model.model.is_multilingual,
+            task=task,
+            language=language,
+        )
+        options = TranscriptionOptions(
+            beam_size=beam_size,
+            best_of=5,
+            patience=1,
+            length_penalty=1,
+            repetition_penalty=1,
+            no_repeat_ngram_size=0,
+            log_prob_threshold=-1.0,
+            no_speech_threshold=no_speech_threshold,
+            compression_ratio_threshold=2.4,
+            temperatures=[0.0],
+            initial_prompt=initial_prompt,
+            prefix=None,
+            suppress_blank=True,
+            suppress_tokens=get_suppressed_tokens(tokenizer, [-1]),
+            prepend_punctuations="\"'“¿([{-",
+            append_punctuations="\"'.。,，!！?？:：”)]}、",
+            max_new_tokens=None,
+            hotwords=None,
+            word_timestamps=word_timestamps,
+            hallucination_silence_threshold=None,
+            condition_on_previous_text=False,
+            clip_timestamps=[],
+            prompt_reset_on_temperature=0.5,
+            multilingual=False,
+            without_timestamps=False,
+            max_initial_timestamp=1.0,
+        )
+
+        features = np.stack(features)
+        for i in range(0, len(features), batch_size):
+            outputs = self.forward(
+                features[i : i + batch_size],
+                tokenizer,
+                chunks_metadata[i : i + batch_size],
+                options,
+                owners=owners[i : i + batch_size],
+            )
+            for owner, output in zip(owners[i : i + batch_size], outputs):
+                segments = results[owner]
+                if segments is None:
+                    segments = results[owner] = []
+                for segment in output:
+                    segments.append(
+                        Segment(
+                            seek=segment["seek"],
+                            id=len(segments) + 1,
+                            text=segment["text"],
+                            start=round(segment["start"], 3),
+                            end=round(segment["end"], 3),
+                            words=(
+                                [Word(**word) for word in segment["words"]]
+                                if word_timestamps
+                                else None
+                            ),
+                            tokens=segment["tokens"],
+                            avg_logprob=segment["avg_logprob"],
+                            no_speech_prob=segment["no_speech_prob"],
+                            compression_ratio=segment["compression_ratio"],
+                            temperature=options.temperatures[0],
+                        )
+                    )
+
+        return results
+
 
 class WhisperModel:
     def __init__(
@@ -1545,7 +1701,14 @@ class WhisperModel:
         prepend_punctuations: str,
         append_punctuations: str,
         last_speech_timestamp: float,
+        segment_owners: Optional[List[int]] = None,
     ) -> float:
+        """Add word timings to the subsegments of each segment (in place).
+
+        `segment_owners` marks segments that come from independent audio streams (one
+        owner per segment): the last speech timestamp restarts at 0 whenever the owner
+        changes, since the streams do not share a timeline.
+        """
         if len(segments) == 0:
             return
 
@@ -1591,6 +1754,11 @@ class WhisperModel:
             median_max_durations.append((median_duration, max_duration))
 
         for segment_idx, segment in enumerate(segments):
+            if segment_owners is not None and (
+                segment_idx == 0
+                or segment_owners[segment_idx] != segment_owners[segment_idx - 1]
+            ):
+                last_speech_timestamp = 0.0
             word_index = 0
             time_offset = segment[0]["seek"] / self.frames_per_second
             median_duration, max_duration = median_max_durations[segment_idx]
@@ -1,5 +1,8 @@
 import os
+import logging
 import subprocess
+import threading
+from collections import deque
 import torch
 import numpy as np
 import onnxruntime
@@ -90,6 +93,28 @@ class VoiceActivityDetection():
         out = torch.from_numpy(out)
         return out
 
+    def run_numpy(self, x, state, sr: int = 16000):
+        """
+        Run one Silero step on NumPy inputs, without touching the instance's torch state.
+
+        The caller owns the recurrent state, which lets several independent streams share
+        one ONNX session.
+
+        Args:
+            x (np.ndarray): float32 array of shape (batch, context + window) samples.
+            state (np.ndarray): float32 recurrent state of shape (2, batch, 128).
+            sr (int): Sampling rate of the audio.
+
+        Returns:
+            tuple: (speech probabilities of shape (batch,), new state of shape (2, batch, 128)).
+        """
+        out, state = self.session.run(None, {
+            'input': x,
+            'state': state,
+            'sr': np.array(sr, dtype='int64'),
+        })
+        return out[:, 0], state
+
     def audio_forward(self, x, sr: int):
         outs = []
         x, sr = self._validate_input(x, sr)
@@ -155,3 +180,197 @@ class VoiceActivityDetector:
         """
         speech_probs = self.model.audio_forward(torch.from_numpy(audio_frame.copy()), self.frame_rate)[0]
         return torch.any(speech_probs > self.threshold).item()
+
+
+class StreamingVoiceActivityDetector:
+    """
+    Per-session streaming voice activity detector.
+
+    Unlike VoiceActivityDetector, which resets the Silero state and re-runs the model over
+    every packet from scratch, this keeps the recurrent state, the 64-sample context and any
+    leftover samples between calls, so each call only evaluates the 512-sample windows that
+    became complete with the new packet. All streams share one ONNX session.
+    """
+
+    WINDOW_SAMPLES = 512
+    CONTEXT_SAMPLES = 64
+
+    _shared_model = None
+    _shared_model_lock = threading.Lock()
+
+    def __init__(self, threshold=0.5, frame_rate=16000, model=None, service=None):
+        """
+        Args:
+            threshold (float, optional): Speech probability threshold. Defaults to 0.5.
+            frame_rate (int, optional): Sampling rate of the audio; must be 16000.
+            model (VoiceActivityDetection, optional): Model to run; defaults to a process-wide instance.
+            service (BatchedVADService, optional): If given, windows are evaluated by the service
+                together with the windows of all other streams instead of one by one.
+        """
+        if frame_rate != 16000:
+            raise ValueError("StreamingVoiceActivityDetector supports only 16000 sampling rate")
+        self.service = service
+        self.model = model or (service.model if service is not None else self.get_shared_model())
+        self.threshold = threshold
+        self.frame_rate = frame_rate
+        self.queue = deque()
+        self.queue_speech = False
+        self.reset()
+
+    @classmethod
+    def get_shared_model(cls):
+        with cls._shared_model_lock:
+            if cls._shared_model is None:
+                cls._shared_model = VoiceActivityDetection()
+            return cls._shared_model
+
+    def reset(self):
+        """Forget all stream history."""
+        self.state = np.zeros((2, 1, 128), dtype=np.float32)
+        self.context = np.zeros(self.CONTEXT_SAMPLES, dtype=np.float32)
+        self.pending = np.zeros(0, dtype=np.float32)
+        self.last_prob = 0.0
+
+    def push(self, audio_frame):
+        """
+        Append new samples and return the complete windows that are ready to evaluate.
+
+        The context is not included; `step` prepends it when a window is evaluated.
+
+        Returns:
+            list[np.ndarray]: float32 windows of WINDOW_SAMPLES samples each, oldest first.
+        """
+        samples = np.concatenate((self.pending, np.asarray(audio_frame, dtype=np.float32)))
+        n_windows = samples.shape[0] // self.WINDOW_SAMPLES
+        self.pending = samples[n_windows * self.WINDOW_SAMPLES:]
+        return [
+            samples[i * self.WINDOW_SAMPLES:(i + 1) * self.WINDOW_SAMPLES]
+            for i in range(n_windows)
+        ]
+
+    def step(self, window):
+        """Build the model input for the next window of this stream and advance its context."""
+        x = np.concatenate((self.context, window))
+        self.context = x[-self.CONTEXT_SAMPLES:]
+        return x
+
+    def __call__(self, audio_frame):
+        """
+        Determines if the newly received samples contain speech.
+
+        Args:
+            audio_frame (np.ndarray): The next audio samples of this stream.
+
+        Returns:
+            bool: True if any window completed by these samples exceeds the threshold. When the
+                  samples do not complete a window, the decision for the previous window is returned.
+        """
+        windows = self.push(audio_frame)
+        if not windows:
+            return self.last_prob > self.threshold
+        if self.service is not None:
+            return self.service.evaluate(self, windows)
+        speech = False
+        for window in windows:
+            probs, self.state = self.model.run_numpy(self.step(window)[None, :], self.state, self.frame_rate)
+            self.last_prob = float(probs[0])
+            speech = speech or self.last_prob > self.threshold
+        return speech
+
+
+class BatchedVADService:
+    """
+    Evaluates the VAD windows of all active streams together.
+
+    Streams hand their newly completed windows to `evaluate` and block until they are scored.
+    A single worker thread takes the next pending window of every stream, stacks them with
+    their recurrent states into one (batch, 576) input and one (2, batch, 128) state, runs
+    one ONNX `session.run` per tick and scatters probabilities and states back. Everything
+    stays in NumPy, and the number of session.run calls per tick does not grow with the
+    number of clients.
+    """
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, model=None, timeout=1.0):
+        """
+        Args:
+            model (VoiceActivityDetection, optional): Model to run; defaults to the process-wide instance.
+            timeout (float): Maximum seconds a stream waits for its windows to be scored.
+        """
+        self.model = model or StreamingVoiceActivityDetector.get_shared_model()
+        self.timeout = timeout
+        self.condition = threading.Condition()
+        self.active = []
+
+        # Counters exposed through /metrics
+        self.ticks = 0
+        self.windows = 0
+
+        self.thread = threading.Thread(target=self._run, name="batched-vad", daemon=True)
+        self.thread.start()
+
+    @classmethod
+    def get_shared(cls):
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    def get_metrics(self):
+        return {
+            "vad_ticks": self.ticks,
+            "vad_windows": self.windows,
+            "vad_avg_batch_size": (self.windows / self.ticks) if self.ticks else 0,
+        }
+
+    def evaluate(self, stream, windows):
+        """
+        Score `windows` of `stream` in the shared batches and return whether any contains speech.
+
+        Called from the stream's receiving thread; blocks until all windows are scored, or
+        for at most `timeout` seconds. Windows still queued after a timeout are scored
+        later and their result is included in the next call's answer.
+        """
+        with self.condition:
+            stream.queue.extend(windows)
+            if stream not in self.active:
+                self.active.append(stream)
+            self.condition.notify_all()
+            if not self.condition.wait_for(lambda: not stream.queue, timeout=self.timeout):
+                logging.warning(
+                    f"[BatchedVAD] Timed out after {self.timeout}s with {len(stream.queue)} window(s) "
+                    f"of a stream still queued; reporting them with its next audio"
+                )
+                return stream.queue_speech
+            speech, stream.queue_speech = stream.queue_speech, False
+            return speech
+
+    def _run(self):
+        while True:
+            with self.condition:
+                self.condition.wait_for(lambda: self.active)
+                batch = list(self.active)
+                windows = [stream.queue[0] for stream in batch]
+
+            x = np.stack([stream.step(window) for stream, window in zip(batch, windows)])
+            state = np.concatenate([stream.state for stream in batch], axis=1)
+            try:
+                probs, state = self.model.run_numpy(x, state)
+            except Exception as e:
+                logging.error(f"[BatchedVAD] VAD inference failed for {len(batch)} stream(s): {e}")
+                probs = np.zeros(len(batch), dtype=np.float32)
+                state = np.concatenate([stream.state for stream in batch], axis=1)
+
+            with self.condition:
+                for i, stream in enumerate(batch):
+                    stream.state = state[:, i:i + 1, :]
+                    stream.last_prob = float(probs[i])
+                    stream.queue_speech = stream.queue_speech or stream.last_prob > stream.threshold
+                    stream.queue.popleft()
+                    if not stream.queue:
+                        self.active.remove(stream)
+                self.ticks += 1
+                self.windows += len(batch)
+                self.condition.notify_all()
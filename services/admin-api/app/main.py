@@ -7,13 +7,13 @@ from fastapi.security import APIKeyHeader
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload, attributes
-from typing import List # Import List for response model
+from typing import List, Optional # Import List for response model
 from datetime import datetime # Import datetime
-from sqlalchemy import func
+from sqlalchemy import func, distinct, and_
 from pydantic import BaseModel, HttpUrl
 
 # Import shared models and schemas
-from shared_models.models import User, APIToken, Base, Meeting, Transcription, MeetingSession # Import Base for init_db and Meeting
+from shared_models.models import User, APIToken, Base, Meeting, Transcription, MeetingSession, MeetingTranscriptStats # Import Base for init_db and Meeting
 from shared_models.schemas import (UserCreate, UserResponse, TokenResponse, UserDetailResponse, UserBase, UserUpdate, MeetingResponse,
                                  UserTableResponse, MeetingTableResponse, MeetingSessionResponse, TranscriptionStats, 
                                  MeetingPerformanceMetrics, MeetingTelematicsResponse, UserMeetingStats, 
@@ -399,6 +399,41 @@ async def get_meetings_table(
     meetings = result.scalars().all()
     return [MeetingTableResponse.from_orm(m) for m in meetings]
 
+async def get_transcription_stats(meeting_id: int, db: AsyncSession) -> Optional[TranscriptionStats]:
+    """Transcription statistics of a meeting, or None if it has no stored segments.
+
+    Read from the meeting_transcript_stats rollup the transcription collector maintains; meetings
+    without a rollup row are aggregated from the transcriptions table in SQL.
+    """
+    rollup = await db.get(MeetingTranscriptStats, meeting_id)
+    if rollup is not None:
+        if not rollup.segment_count:
+            return None
+        return TranscriptionStats(
+            total_transcriptions=rollup.segment_count,
+            total_duration=rollup.speech_seconds,
+            unique_speakers=len(rollup.speakers),
+            languages_detected=list(rollup.languages)
+        )
+
+    result = await db.execute(
+        select(
+            func.count(Transcription.id),
+            func.coalesce(func.sum(Transcription.end_time - Transcription.start_time), 0.0),
+            func.count(distinct(Transcription.speaker)).filter(Transcription.speaker != ''),
+            func.array_agg(distinct(Transcription.language)).filter(Transcription.language != ''),
+        ).where(Transcription.meeting_id == meeting_id)
+    )
+    total_transcriptions, total_duration, unique_speakers, languages = result.one()
+    if not total_transcriptions:
+        return None
+    return TranscriptionStats(
+        total_transcriptions=total_transcriptions,
+        total_duration=total_duration,
+        unique_speakers=unique_speakers,
+        languages_detected=languages or []
+    )
+
 @admin_router.get("/analytics/meetings/{meeting_id}/telematics",
                   response_model=MeetingTelematicsResponse,
                   summary="Get detailed telematics data for a specific meeting")
@@ -431,24 +466,7 @@ async def get_meeting_telematics(
         sessions = sessions_result.scalars().all()
     
     # Calculate transcription stats if requested
-    transcription_stats = None
-    if include_transcriptions:
-        transcriptions_result = await db.execute(
-            select(Transcription).where(Transcription.meeting_id == meeting_id)
-        )
-        transcriptions = transcriptions_result.scalars().all()
-        
-        if transcriptions:
-            total_duration = sum(t.end_time - t.start_time for t in transcriptions)
-            unique_speakers = len(set(t.speaker for t in transcriptions if t.speaker))
-            languages_detected = list(set(t.language for t in transcriptions if t.language))
-            
-            transcription_stats = TranscriptionStats(
-                total_transcriptions=len(transcriptions),
-                total_duration=total_duration,
-                unique_speakers=unique_speakers,
-                languages_detected=languages_detected
-            )
+    transcription_stats = await get_transcription_stats(meeting_id, db) if include_transcriptions else None
     
     # Calculate performance metrics
     performance_metrics = None
@@ -469,6 +487,8 @@ async def get_meeting_telematics(
         performance_metrics=performance_metrics
     )
 
+ACTIVE_MEETING_STATUSES = ['requested', 'joining', 'awaiting_admission', 'active']
+
 @admin_router.get("/analytics/users/{user_id}/details",
                   response_model=UserAnalyticsResponse,
                   summary="Get comprehensive user analytics data including full user record")
@@ -496,19 +516,26 @@ async def get_user_details(
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
     
-    # Calculate meeting stats
-    meetings_result = await db.execute(select(Meeting).where(Meeting.user_id == user_id))
-    meetings = meetings_result.scalars().all()
-    
-    total_meetings = len(meetings)
-    completed_meetings = len([m for m in meetings if m.status == 'completed'])
-    failed_meetings = len([m for m in meetings if m.status == 'failed'])
-    active_meetings = len([m for m in meetings if m.status in ['requested', 'joining', 'awaiting_admission', 'active']])
+    # Calculate meeting stats (aggregated in the database)
+    completed_with_duration = and_(Meeting.status == 'completed', Meeting.start_time.isnot(None), Meeting.end_time.isnot(None))
+    stats_result = await db.execute(
+        select(
+            func.count(Meeting.id),
+            func.count(Meeting.id).filter(Meeting.status == 'completed'),
+            func.count(Meeting.id).filter(Meeting.status == 'failed'),
+            func.count(Meeting.id).filter(Meeting.status.in_(ACTIVE_MEETING_STATUSES)),
+            func.count(Meeting.id).filter(completed_with_duration),
+            func.sum(func.extract('epoch', Meeting.end_time - Meeting.start_time)).filter(completed_with_duration),
+            func.min(Meeting.created_at),
+            func.max(Meeting.created_at),
+        ).where(Meeting.user_id == user_id)
+    )
+    (total_meetings, completed_meetings, failed_meetings, active_meetings,
+     completed_with_duration_count, total_duration, first_created_at, last_activity) = stats_result.one()
     
     # Calculate duration stats
-    completed_with_duration = [m for m in meetings if m.status == 'completed' and m.start_time and m.end_time]
-    total_duration = sum((m.end_time - m.start_time).total_seconds() for m in completed_with_duration) if completed_with_duration else None
-    average_duration = total_duration / len(completed_with_duration) if completed_with_duration else None
+    total_duration = float(total_duration) if completed_with_duration_count else None
+    average_duration = total_duration / completed_with_duration_count if completed_with_duration_count else None
     
     meeting_stats = UserMeetingStats(
         total_meetings=total_meetings,
@@ -520,26 +547,26 @@ async def get_user_details(
     )
     
     # Calculate usage patterns
-    if meetings:
+    if total_meetings:
         # Most used platform
-        platform_counts = {}
-        for meeting in meetings:
-            platform_counts[meeting.platform] = platform_counts.get(meeting.platform, 0) + 1
-        most_used_platform = max(platform_counts, key=platform_counts.get) if platform_counts else None
+        meeting_count = func.count(Meeting.id)
+        platform_result = await db.execute(
+            select(Meeting.platform).where(Meeting.user_id == user_id)
+            .group_by(Meeting.platform).order_by(meeting_count.desc(), Meeting.platform).limit(1)
+        )
+        most_used_platform = platform_result.scalar()
         
         # Meetings per day (based on creation date)
-        days_since_first = (datetime.utcnow() - min(m.created_at for m in meetings)).days + 1
+        days_since_first = (datetime.utcnow() - first_created_at).days + 1
         meetings_per_day = total_meetings / days_since_first if days_since_first > 0 else 0
         
         # Peak usage hours
-        hour_counts = {}
-        for meeting in meetings:
-            hour = meeting.created_at.hour
-            hour_counts[hour] = hour_counts.get(hour, 0) + 1
-        peak_usage_hours = sorted(hour_counts.keys(), key=lambda h: hour_counts[h], reverse=True)[:3]
-        
-        # Last activity
-        last_activity = max(m.created_at for m in meetings)
+        hour = func.extract('hour', Meeting.created_at)
+        hours_result = await db.execute(
+            select(hour).where(Meeting.user_id == user_id)
+            .group_by(hour).order_by(meeting_count.desc(), hour).limit(3)
+        )
+        peak_usage_hours = [int(h) for h in hours_result.scalars().all()]
     else:
         most_used_platform = None
         meetings_per_day = 0.0
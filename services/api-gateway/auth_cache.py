@@ -0,0 +1,104 @@
+"""Cache of websocket subscribe authorizations.
+
+Maps (sha256(api key), platform, native meeting id) to the collector's answer from
+/ws/authorize-subscribe: either the (user_id, meeting_id) the meeting resolves to, or the
+reason it was refused. Positive answers are kept WS_AUTH_CACHE_TTL seconds, refusals
+WS_AUTH_NEGATIVE_TTL seconds. All entries of a meeting are dropped when the bot manager
+publishes a status change for it (a bot request creates a new meeting record) and when
+the meeting's data is deleted through the gateway. A revoked API key keeps its cached
+authorizations until they expire.
+"""
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Set, Tuple
+
+WS_AUTH_CACHE_TTL = float(os.getenv("WS_AUTH_CACHE_TTL", "60"))
+WS_AUTH_NEGATIVE_TTL = float(os.getenv("WS_AUTH_NEGATIVE_TTL", "10"))
+WS_AUTH_CACHE_MAX_ENTRIES = int(os.getenv("WS_AUTH_CACHE_MAX_ENTRIES", "10000"))
+
+STATUS_CHANNEL_PREFIX = "bm:meeting:"
+STATUS_CHANNEL_SUFFIX = ":status"
+
+CacheKey = Tuple[str, str, str]  # (api key hash, platform, native meeting id)
+
+
+def hash_api_key(api_key: str) -> str:
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()
+
+
+class AuthorizationCache:
+    def __init__(self, ttl_s: float = WS_AUTH_CACHE_TTL, negative_ttl_s: float = WS_AUTH_NEGATIVE_TTL,
+                 max_entries: int = WS_AUTH_CACHE_MAX_ENTRIES):
+        self.ttl_s = ttl_s
+        self.negative_ttl_s = negative_ttl_s
+        self.max_entries = max_entries
+        # key -> (expires_at, authorized item dict or None, refusal reason or None)
+        self._entries: "OrderedDict[CacheKey, Tuple[float, Optional[Dict[str, str]], Optional[str]]]" = OrderedDict()
+        self._by_meeting: Dict[Tuple[str, str], Set[CacheKey]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        # Bumped on every invalidation; answers fetched across a bump are not cached
+        self.generation = 0
+
+    def get(self, key: CacheKey) -> Optional[Tuple[Optional[Dict[str, str]], Optional[str]]]:
+        """Return (authorized item, None) or (None, refusal reason) for a fresh entry, else None."""
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1], entry[2]
+        if entry is not None:
+            self._remove(key)
+        self.misses += 1
+        return None
+
+    def put_authorized(self, key: CacheKey, item: Dict[str, str], generation: int) -> None:
+        self._put(key, (time.monotonic() + self.ttl_s, item, None), generation)
+
+    def put_refused(self, key: CacheKey, reason: str, generation: int) -> None:
+        self._put(key, (time.monotonic() + self.negative_ttl_s, None, reason), generation)
+
+    def _put(self, key: CacheKey, entry, generation: int) -> None:
+        if generation != self.generation:
+            return  # A meeting was invalidated while this answer was being fetched
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        self._by_meeting.setdefault((key[1], key[2]), set()).add(key)
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+
+    def _remove(self, key: CacheKey) -> None:
+        self._entries.pop(key, None)
+        keys = self._by_meeting.get((key[1], key[2]))
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_meeting[(key[1], key[2])]
+
+    def invalidate_meeting(self, platform: str, native_id: str) -> None:
+        self.generation += 1
+        for key in list(self._by_meeting.get((platform, native_id), ())):
+            self._remove(key)
+            self.invalidations += 1
+
+    def on_pubsub_message(self, channel: str, data: str) -> None:
+        """PubSubHub observer: drop a meeting's entries on its bot-manager status events."""
+        if not (channel.startswith(STATUS_CHANNEL_PREFIX) and channel.endswith(STATUS_CHANNEL_SUFFIX)):
+            return
+        # bm:meeting:{user_id}:{platform}:{native_id}:status; native ids may contain ':'
+        parts = channel[len(STATUS_CHANNEL_PREFIX):-len(STATUS_CHANNEL_SUFFIX)].split(":", 2)
+        if len(parts) == 3:
+            self.invalidate_meeting(parts[1], parts[2])
+
+    def get_metrics(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "ws_auth_cache_entries": len(self._entries),
+            "ws_auth_cache_hits": self.hits,
+            "ws_auth_cache_misses": self.misses,
+            "ws_auth_cache_invalidations": self.invalidations,
+            "ws_auth_cache_hit_rate": (self.hits / lookups) if lookups else 0.0,
+        }
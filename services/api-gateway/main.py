@@ -1,22 +1,30 @@
 import uvicorn
 from fastapi import FastAPI, Request, Response, HTTPException, status, Depends, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from fastapi.openapi.utils import get_openapi
 from fastapi.security import APIKeyHeader
 import httpx
 import os
+import secrets
 from dotenv import load_dotenv
 import json # For request body processing
+import re
 from pydantic import BaseModel, Field
 from typing import Dict, Any, List, Optional, Set, Tuple
 import asyncio
+import logging
+import time
 import redis.asyncio as aioredis
 from datetime import datetime
 
+from pubsub_hub import PubSubHub
+from auth_cache import AuthorizationCache, hash_api_key
+
 # Import schemas for documentation
 from shared_models.schemas import (
     MeetingCreate, MeetingResponse, MeetingListResponse, MeetingDataUpdate, # Updated/Added Schemas
-    TranscriptionResponse, TranscriptionSegment,
+    TranscriptionResponse, TranscriptionSegment, TranscriptSearchResponse,
     UserCreate, UserResponse, TokenResponse, UserDetailResponse, # Admin Schemas
     ErrorResponse,
     Platform, # Import Platform enum for path parameters
@@ -29,6 +37,23 @@ load_dotenv()
 ADMIN_API_URL = os.getenv("ADMIN_API_URL")
 BOT_MANAGER_URL = os.getenv("BOT_MANAGER_URL")
 TRANSCRIPTION_COLLECTOR_URL = os.getenv("TRANSCRIPTION_COLLECTOR_URL")
+# Admin token (same as the Admin API's), required for the gateway's own /internal endpoints
+ADMIN_API_TOKEN = os.getenv("ADMIN_API_TOKEN")
+
+# Upstream connection pools (per-service pool sizes are set in create_upstream_client)
+UPSTREAM_CONNECT_TIMEOUT_S = float(os.getenv("UPSTREAM_CONNECT_TIMEOUT_S", "5"))
+UPSTREAM_READ_TIMEOUT_S = float(os.getenv("UPSTREAM_READ_TIMEOUT_S", "60"))
+UPSTREAM_POOL_TIMEOUT_S = float(os.getenv("UPSTREAM_POOL_TIMEOUT_S", "10"))
+UPSTREAM_KEEPALIVE_EXPIRY_S = float(os.getenv("UPSTREAM_KEEPALIVE_EXPIRY_S", "30"))
+
+# Configure logging
+logging.basicConfig(
+    level=os.environ.get("LOG_LEVEL", "INFO").upper(),
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger("api_gateway")
+# forward_request logs one line per proxied request; httpx's own request log would duplicate it
+logging.getLogger("httpx").setLevel(logging.WARNING)
 
 # --- Validation at startup ---
 if not all([ADMIN_API_URL, BOT_MANAGER_URL, TRANSCRIPTION_COLLECTOR_URL]):
@@ -140,74 +165,96 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# --- HTTP Client --- 
-# Use a single client instance for connection pooling
+# --- HTTP Clients --- 
+# One pooled client per upstream service, so a burst against one service (e.g. large
+# transcript downloads) cannot take every connection from the others
+def create_upstream_client(env_prefix: str, max_connections: int, max_keepalive: int) -> httpx.AsyncClient:
+    limits = httpx.Limits(
+        max_connections=int(os.getenv(f"{env_prefix}_MAX_CONNECTIONS", str(max_connections))),
+        max_keepalive_connections=int(os.getenv(f"{env_prefix}_MAX_KEEPALIVE_CONNECTIONS", str(max_keepalive))),
+        keepalive_expiry=UPSTREAM_KEEPALIVE_EXPIRY_S,
+    )
+    timeout = httpx.Timeout(UPSTREAM_READ_TIMEOUT_S, connect=UPSTREAM_CONNECT_TIMEOUT_S, pool=UPSTREAM_POOL_TIMEOUT_S)
+    return httpx.AsyncClient(limits=limits, timeout=timeout)
+
 @app.on_event("startup")
 async def startup_event():
-    app.state.http_client = httpx.AsyncClient()
+    app.state.bot_manager_client = create_upstream_client("BOT_MANAGER", max_connections=50, max_keepalive=20)
+    app.state.collector_client = create_upstream_client("TRANSCRIPTION_COLLECTOR", max_connections=100, max_keepalive=50)
+    app.state.admin_client = create_upstream_client("ADMIN_API", max_connections=20, max_keepalive=5)
     # Initialize Redis for Pub/Sub used by WS
     redis_url = os.getenv("REDIS_URL", "redis://redis:6379/0")
     app.state.redis = await aioredis.from_url(redis_url, encoding="utf-8", decode_responses=True)
+    # One shared pub/sub connection fans meeting events out to all websockets
+    app.state.pubsub_hub = PubSubHub(app.state.redis)
+    # Cached /ws subscribe authorizations, invalidated by bot-manager status events
+    app.state.ws_auth_cache = AuthorizationCache()
+    app.state.pubsub_hub.add_observer(app.state.ws_auth_cache.on_pubsub_message)
+    app.state.pubsub_hub.start()
 
 @app.on_event("shutdown")
 async def shutdown_event():
-    await app.state.http_client.aclose()
+    for client in (app.state.bot_manager_client, app.state.collector_client, app.state.admin_client):
+        await client.aclose()
+    await app.state.pubsub_hub.stop()
     try:
         await app.state.redis.close()
     except Exception:
         pass
 
 # --- Helper for Forwarding --- 
+# Connection-level headers are not passed through in either direction
+HOP_BY_HOP_HEADERS = {
+    "host", "connection", "keep-alive", "proxy-authenticate", "proxy-authorization",
+    "te", "trailer", "transfer-encoding", "upgrade",
+}
+
+async def _stream_upstream_body(resp: httpx.Response, method: str, url: str, started: float):
+    """Relay the upstream body chunk by chunk, releasing the connection even if the client goes away."""
+    size = 0
+    try:
+        async for chunk in resp.aiter_raw():
+            size += len(chunk)
+            yield chunk
+    finally:
+        await resp.aclose()
+        logger.info(
+            f"proxy method={method} url={url} status={resp.status_code} bytes={size} "
+            f"duration_ms={(time.perf_counter() - started) * 1000:.1f}"
+        )
+
 async def forward_request(client: httpx.AsyncClient, method: str, url: str, request: Request) -> Response:
-    # Copy original headers, converting to a standard dict
-    # Exclude host, content-length, transfer-encoding as they are handled by httpx/server
-    excluded_headers = {"host", "content-length", "transfer-encoding"}
-    headers = {k.lower(): v for k, v in request.headers.items() if k.lower() not in excluded_headers}
-    
-    # Debug logging for original request headers
-    print(f"DEBUG: Original request headers: {dict(request.headers)}")
-    print(f"DEBUG: Original query params: {dict(request.query_params)}")
-    
-    # Determine target service based on URL path prefix
-    is_admin_request = url.startswith(f"{ADMIN_API_URL}/admin")
-    
-    # Forward appropriate auth header if present
-    if is_admin_request:
-        admin_key = request.headers.get("x-admin-api-key")
-        if admin_key:
-            headers["x-admin-api-key"] = admin_key
-            print(f"DEBUG: Forwarding x-admin-api-key header")
-        else:
-            print(f"DEBUG: No x-admin-api-key header found in request")
-    else:
-        # Forward client API key for bot-manager and transcription-collector
-        client_key = request.headers.get("x-api-key")
-        if client_key:
-            headers["x-api-key"] = client_key
-            print(f"DEBUG: Forwarding x-api-key header: {client_key[:5]}...")
-        else:
-            print(f"DEBUG: No x-api-key header found in request. Headers: {dict(request.headers)}")
-    
-    # Debug logging for forwarded headers
-    print(f"DEBUG: Forwarded headers: {headers}")
-    
-    # Forward query parameters
+    """Proxy the request to url, streaming the request and response bodies instead of buffering them."""
+    started = time.perf_counter()
+    # Headers (including X-API-Key / X-Admin-API-Key) are forwarded as-is, minus hop-by-hop ones.
+    # Content-Length is kept so a streamed body of known size is not re-sent chunked.
+    headers = {k.lower(): v for k, v in request.headers.items() if k.lower() not in HOP_BY_HOP_HEADERS}
+    auth_header = "x-admin-api-key" if url.startswith(f"{ADMIN_API_URL}/admin") else "x-api-key"
+    if auth_header not in headers:
+        logger.debug(f"No {auth_header} header on {method} {request.url.path}")
+
+    has_body = "content-length" in headers or "transfer-encoding" in request.headers
     forwarded_params = dict(request.query_params)
-    if forwarded_params:
-        print(f"DEBUG: Forwarding query params: {forwarded_params}")
-    
-    content = await request.body()
-    
+    logger.debug(f"Forwarding {method} {request.url.path} to {url} params={forwarded_params} has_body={has_body}")
+
     try:
-        print(f"DEBUG: Forwarding {method} request to {url}")
-        resp = await client.request(method, url, headers=headers, params=forwarded_params or None, content=content)
-        print(f"DEBUG: Response from {url}: status={resp.status_code}")
-        # Return downstream response directly (including headers, status code)
-        return Response(content=resp.content, status_code=resp.status_code, headers=dict(resp.headers))
+        upstream_request = client.build_request(
+            method, url, headers=headers, params=forwarded_params or None,
+            content=request.stream() if has_body else None,
+        )
+        resp = await client.send(upstream_request, stream=True)
     except httpx.RequestError as exc:
-        print(f"DEBUG: Request error: {exc}")
+        logger.error(f"proxy method={method} url={url} error={exc!r}")
         raise HTTPException(status_code=503, detail=f"Service unavailable: {exc}")
 
+    # Raw (still encoded) bytes are relayed, so Content-Length/Content-Encoding stay valid
+    response_headers = {k: v for k, v in resp.headers.items() if k.lower() not in HOP_BY_HOP_HEADERS}
+    return StreamingResponse(
+        _stream_upstream_body(resp, method, url, started),
+        status_code=resp.status_code,
+        headers=response_headers,
+    )
+
 # --- Root Endpoint --- 
 @app.get("/", tags=["General"], summary="API Gateway Root")
 async def root():
@@ -239,7 +286,7 @@ async def request_bot_proxy(request: Request):
     """Forward request to Bot Manager to start a bot."""
     url = f"{BOT_MANAGER_URL}/bots"
     # forward_request handles reading and passing the body from the original request
-    return await forward_request(app.state.http_client, "POST", url, request)
+    return await forward_request(app.state.bot_manager_client, "POST", url, request)
 
 @app.delete("/bots/{platform}/{native_meeting_id}",
            tags=["Bot Management"],
@@ -250,7 +297,7 @@ async def request_bot_proxy(request: Request):
 async def stop_bot_proxy(platform: Platform, native_meeting_id: str, request: Request):
     """Forward request to Bot Manager to stop a bot."""
     url = f"{BOT_MANAGER_URL}/bots/{platform.value}/{native_meeting_id}"
-    return await forward_request(app.state.http_client, "DELETE", url, request)
+    return await forward_request(app.state.bot_manager_client, "DELETE", url, request)
 
 # --- ADD Route for PUT /bots/.../config ---
 @app.put("/bots/{platform}/{native_meeting_id}/config",
@@ -264,7 +311,7 @@ async def update_bot_config_proxy(platform: Platform, native_meeting_id: str, re
     """Forward request to Bot Manager to update bot config."""
     url = f"{BOT_MANAGER_URL}/bots/{platform.value}/{native_meeting_id}/config"
     # forward_request handles reading and passing the body from the original request
-    return await forward_request(app.state.http_client, "PUT", url, request)
+    return await forward_request(app.state.bot_manager_client, "PUT", url, request)
 # -------------------------------------------
 
 # --- ADD Route for GET /bots/status ---
@@ -277,7 +324,7 @@ async def update_bot_config_proxy(platform: Platform, native_meeting_id: str, re
 async def get_bots_status_proxy(request: Request):
     """Forward request to Bot Manager to get running bot status."""
     url = f"{BOT_MANAGER_URL}/bots/status"
-    return await forward_request(app.state.http_client, "GET", url, request)
+    return await forward_request(app.state.bot_manager_client, "GET", url, request)
 # --- END Route for GET /bots/status ---
 
 # --- Transcription Collector Routes --- 
@@ -290,18 +337,44 @@ async def get_bots_status_proxy(request: Request):
 async def get_meetings_proxy(request: Request):
     """Forward request to Transcription Collector to get meetings."""
     url = f"{TRANSCRIPTION_COLLECTOR_URL}/meetings"
-    return await forward_request(app.state.http_client, "GET", url, request)
+    return await forward_request(app.state.collector_client, "GET", url, request)
+
+@app.get("/transcripts/search",
+        tags=["Transcriptions"],
+        summary="Search your transcripts",
+        description="Full-text search over your stored transcript segments, most relevant first, with highlighted snippets. "
+                    "Query parameters: q (required), optional platform + native_meeting_id and/or meeting_id, speaker, "
+                    "since/until (ISO 8601 timestamps), limit and offset.",
+        response_model=TranscriptSearchResponse,
+        dependencies=[Depends(api_key_scheme)])
+async def search_transcripts_proxy(request: Request):
+    """Forward request to Transcription Collector to search transcripts."""
+    url = f"{TRANSCRIPTION_COLLECTOR_URL}/transcripts/search"
+    return await forward_request(app.state.collector_client, "GET", url, request)
 
 @app.get("/transcripts/{platform}/{native_meeting_id}",
         tags=["Transcriptions"],
         summary="Get transcript for a specific meeting",
-        description="Retrieves the transcript segments for a meeting specified by its platform and native ID.",
+        description="Retrieves the transcript segments for a meeting specified by its platform and native ID. "
+                    "Optional query parameters: since/until (seconds or ISO 8601 timestamp), after_segment "
+                    "and after_segment_start (absolute_start_time and start of the last segment already received) and limit.",
         response_model=TranscriptionResponse,
         dependencies=[Depends(api_key_scheme)])
 async def get_transcript_proxy(platform: Platform, native_meeting_id: str, request: Request):
     """Forward request to Transcription Collector to get a transcript."""
     url = f"{TRANSCRIPTION_COLLECTOR_URL}/transcripts/{platform.value}/{native_meeting_id}"
-    return await forward_request(app.state.http_client, "GET", url, request)
+    return await forward_request(app.state.collector_client, "GET", url, request)
+
+@app.get("/transcripts/{platform}/{native_meeting_id}/export",
+        tags=["Transcriptions"],
+        summary="Download the full transcript of a meeting",
+        description="Streams the whole transcript as a file. Query parameters: format (ndjson, srt or vtt; "
+                    "default ndjson) and optional meeting_id.",
+        dependencies=[Depends(api_key_scheme)])
+async def export_transcript_proxy(platform: Platform, native_meeting_id: str, request: Request):
+    """Forward request to Transcription Collector to stream a transcript export."""
+    url = f"{TRANSCRIPTION_COLLECTOR_URL}/transcripts/{platform.value}/{native_meeting_id}/export"
+    return await forward_request(app.state.collector_client, "GET", url, request)
 
 @app.patch("/meetings/{platform}/{native_meeting_id}",
            tags=["Transcriptions"],
@@ -329,7 +402,7 @@ async def get_transcript_proxy(platform: Platform, native_meeting_id: str, reque
 async def update_meeting_data_proxy(platform: Platform, native_meeting_id: str, request: Request):
     """Forward request to Transcription Collector to update meeting data."""
     url = f"{TRANSCRIPTION_COLLECTOR_URL}/meetings/{platform.value}/{native_meeting_id}"
-    return await forward_request(app.state.http_client, "PATCH", url, request)
+    return await forward_request(app.state.collector_client, "PATCH", url, request)
 
 @app.delete("/meetings/{platform}/{native_meeting_id}",
             tags=["Transcriptions"],
@@ -339,7 +412,10 @@ async def update_meeting_data_proxy(platform: Platform, native_meeting_id: str,
 async def delete_meeting_proxy(platform: Platform, native_meeting_id: str, request: Request):
     """Forward request to Transcription Collector to purge transcripts and anonymize meeting data."""
     url = f"{TRANSCRIPTION_COLLECTOR_URL}/meetings/{platform.value}/{native_meeting_id}"
-    return await forward_request(app.state.http_client, "DELETE", url, request)
+    response = await forward_request(app.state.collector_client, "DELETE", url, request)
+    if response.status_code < 400:
+        app.state.ws_auth_cache.invalidate_meeting(platform.value, native_meeting_id)
+    return response
 
 # --- User Profile Routes ---
 @app.put("/user/webhook",
@@ -351,7 +427,7 @@ async def delete_meeting_proxy(platform: Platform, native_meeting_id: str, reque
 async def set_user_webhook_proxy(request: Request):
     """Forward request to Admin API to set user webhook."""
     url = f"{ADMIN_API_URL}/user/webhook"
-    return await forward_request(app.state.http_client, "PUT", url, request)
+    return await forward_request(app.state.admin_client, "PUT", url, request)
 
 # --- Admin API Routes --- 
 @app.api_route("/admin/{path:path}", methods=["GET", "POST", "PUT", "DELETE", "PATCH"], 
@@ -363,7 +439,7 @@ async def forward_admin_request(request: Request, path: str):
     """Generic forwarder for all admin endpoints."""
     admin_path = f"/admin/{path}" 
     url = f"{ADMIN_API_URL}{admin_path}"
-    return await forward_request(app.state.http_client, request.method, url, request)
+    return await forward_request(app.state.admin_client, request.method, url, request)
 
 # --- Removed internal ID resolution and full transcript fetching from Gateway ---
 
@@ -383,47 +459,28 @@ async def websocket_multiplex(ws: WebSocket):
 
     # Do not resolve API key to user here; leave authorization to downstream service
 
-    redis = app.state.redis
-    sub_tasks: Dict[Tuple[str, str], asyncio.Task] = {}
-    subscribed_meetings: Set[Tuple[str, str]] = set()
+    api_key_hash = hash_api_key(api_key)
+    hub: PubSubHub = app.state.pubsub_hub
+    subscriber = hub.register(ws)
+    subscribed_meetings: Set[Tuple[str, str, str]] = set()
 
-    async def subscribe_meeting(platform: str, native_id: str, user_id: str, meeting_id: str):
-        key = (platform, native_id, user_id)
-        if key in subscribed_meetings:
-            return
-        subscribed_meetings.add(key)
-        channels = [
+    def meeting_channels(platform: str, native_id: str, user_id: str) -> List[str]:
+        return [
             f"tc:meeting:{user_id}:{platform}:{native_id}:mutable",
             f"tc:meeting:{user_id}:{platform}:{native_id}:finalized",
             f"bm:meeting:{user_id}:{platform}:{native_id}:status",
         ]
 
-        async def fan_in(channel_names: List[str]):
-            pubsub = redis.pubsub()
-            await pubsub.subscribe(*channel_names)
-            try:
-                async for message in pubsub.listen():
-                    if message.get("type") != "message":
-                        continue
-                    data = message.get("data")
-                    try:
-                        await ws.send_text(data)
-                    except Exception:
-                        break
-            finally:
-                try:
-                    await pubsub.unsubscribe(*channel_names)
-                    await pubsub.close()
-                except Exception:
-                    pass
-
-        sub_tasks[key] = asyncio.create_task(fan_in(channels))
+    async def subscribe_meeting(platform: str, native_id: str, user_id: str, meeting_id: str):
+        key = (platform, native_id, user_id)
+        if key in subscribed_meetings:
+            return
+        subscribed_meetings.add(key)
+        hub.subscribe(subscriber, meeting_channels(platform, native_id, user_id))
 
     async def unsubscribe_meeting(platform: str, native_id: str, user_id: str):
         key = (platform, native_id, user_id)
-        task = sub_tasks.pop(key, None)
-        if task:
-            task.cancel()
+        hub.unsubscribe(subscriber, meeting_channels(platform, native_id, user_id))
         subscribed_meetings.discard(key)
 
     try:
@@ -460,15 +517,43 @@ async def websocket_multiplex(ws: WebSocket):
                         await ws.send_text(json.dumps({"type": "error", "error": "invalid_subscribe_payload", "details": "no valid meeting objects"}))
                         continue
 
-                    url = f"{TRANSCRIPTION_COLLECTOR_URL}/ws/authorize-subscribe"
-                    headers = {"X-API-Key": api_key}
-                    resp = await app.state.http_client.post(url, headers=headers, json={"meetings": payload_meetings})
-                    if resp.status_code != 200:
-                        await ws.send_text(json.dumps({"type": "error", "error": "authorization_service_error", "status": resp.status_code, "detail": resp.text}))
-                        continue
-                    data = resp.json()
-                    authorized = data.get("authorized") or []
-                    errors = data.get("errors") or []
+                    # Serve what we can from the authorization cache; only misses go to the collector
+                    auth_cache: AuthorizationCache = app.state.ws_auth_cache
+                    authorized: List[Dict[str, str]] = []
+                    indexed_errors: List[Tuple[int, str]] = []
+                    misses: List[int] = []
+                    for idx, pm in enumerate(payload_meetings):
+                        cached = auth_cache.get((api_key_hash, pm["platform"], pm["native_meeting_id"]))
+                        if cached is None:
+                            misses.append(idx)
+                        elif cached[0] is not None:
+                            authorized.append(cached[0])
+                        else:
+                            indexed_errors.append((idx, f"meetings[{idx}] {cached[1]}"))
+
+                    if misses:
+                        generation = auth_cache.generation
+                        url = f"{TRANSCRIPTION_COLLECTOR_URL}/ws/authorize-subscribe"
+                        headers = {"X-API-Key": api_key}
+                        resp = await app.state.collector_client.post(url, headers=headers, json={"meetings": [payload_meetings[i] for i in misses]})
+                        if resp.status_code != 200:
+                            await ws.send_text(json.dumps({"type": "error", "error": "authorization_service_error", "status": resp.status_code, "detail": resp.text}))
+                            continue
+                        data = resp.json()
+                        for item in data.get("authorized") or []:
+                            authorized.append(item)
+                            auth_cache.put_authorized((api_key_hash, item.get("platform"), item.get("native_id")), item, generation)
+                        for error in data.get("errors") or []:
+                            # Errors are "meetings[<index into the request>] <reason>"; re-index to this payload
+                            match = re.match(r"meetings\[(\d+)\] (.*)", str(error), re.S)
+                            if match and int(match.group(1)) < len(misses):
+                                idx = misses[int(match.group(1))]
+                                pm = payload_meetings[idx]
+                                auth_cache.put_refused((api_key_hash, pm["platform"], pm["native_meeting_id"]), match.group(2), generation)
+                                indexed_errors.append((idx, f"meetings[{idx}] {match.group(2)}"))
+                            else:
+                                indexed_errors.append((len(payload_meetings), str(error)))
+                    errors = [error for _, error in sorted(indexed_errors, key=lambda e: e[0])]
                     if errors:
                         await ws.send_text(json.dumps({"type": "error", "error": "invalid_subscribe_payload", "details": errors}))
                         # Continue to subscribe to any meetings that were authorized
@@ -536,8 +621,20 @@ async def websocket_multiplex(ws: WebSocket):
         except Exception:
             pass
     finally:
-        for task in sub_tasks.values():
-            task.cancel()
+        hub.unregister(subscriber)
+
+async def verify_admin_token(admin_api_key: Optional[str] = Depends(admin_api_key_scheme)):
+    """Dependency guarding the gateway's internal endpoints with the admin token."""
+    if not ADMIN_API_TOKEN:
+        logger.error("ADMIN_API_TOKEN is not set; internal endpoints are disabled")
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Admin authentication is not configured on the gateway.")
+    if not admin_api_key or not secrets.compare_digest(admin_api_key, ADMIN_API_TOKEN):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid or missing admin token.")
+
+@app.get("/internal/metrics", include_in_schema=False, dependencies=[Depends(verify_admin_token)])
+async def get_gateway_metrics():
+    """Websocket fan-out and authorization cache counters of this gateway instance"""
+    return {**app.state.pubsub_hub.get_metrics(), **app.state.ws_auth_cache.get_metrics()}
 
 # --- Main Execution --- 
 if __name__ == "__main__":
@@ -0,0 +1,176 @@
+"""Gateway-wide Redis pub/sub hub for the /ws endpoint.
+
+A single pub/sub connection PSUBSCRIBEs to the meeting channels published by the
+transcription collector (tc:meeting:*) and the bot manager (bm:meeting:*). Websockets
+register interest in individual channels (refcounted per channel), and each message is
+fanned out to the bounded queues of the interested websockets. Every websocket has one
+sender task draining its queue; a websocket whose queue is full is a slow consumer and is
+disconnected instead of holding up the others or growing memory without bound.
+"""
+import asyncio
+import logging
+import os
+from typing import Callable, Dict, List, Optional, Set
+
+import redis.asyncio as aioredis
+from fastapi import WebSocket
+
+logger = logging.getLogger("api_gateway.pubsub_hub")
+
+HUB_PATTERNS = ("tc:meeting:*", "bm:meeting:*")
+WS_QUEUE_MAX_MESSAGES = int(os.getenv("WS_QUEUE_MAX_MESSAGES", "256"))
+WS_SLOW_CONSUMER_CLOSE_CODE = 1013  # Try again later
+
+
+class HubSubscriber:
+    """One websocket's view of the hub: its channels, outbound queue and sender task."""
+
+    def __init__(self, ws: WebSocket, max_queue: int):
+        self.ws = ws
+        self.channels: Set[str] = set()
+        self.queue: "asyncio.Queue[str]" = asyncio.Queue(maxsize=max_queue)
+        self.evicted = False
+        self.sender_task: Optional[asyncio.Task] = None
+
+    async def send_loop(self):
+        try:
+            while True:
+                data = await self.queue.get()
+                await self.ws.send_text(data)
+        except asyncio.CancelledError:
+            pass
+        except Exception:
+            pass  # Disconnected; the websocket handler unregisters us
+
+
+class PubSubHub:
+    def __init__(self, redis_client: aioredis.Redis, max_queue: int = WS_QUEUE_MAX_MESSAGES):
+        self.redis = redis_client
+        self.max_queue = max_queue
+        self.channel_subscribers: Dict[str, Set[HubSubscriber]] = {}
+        self.subscribers: Set[HubSubscriber] = set()
+        self.listener_task: Optional[asyncio.Task] = None
+        # Pending closes of evicted websockets (the event loop only keeps weak references to tasks)
+        self.close_tasks: Set[asyncio.Task] = set()
+        self.observers: List[Callable[[str, str], None]] = []
+        self.messages_received = 0
+        self.messages_delivered = 0
+        self.messages_dropped = 0
+        self.messages_unrouted = 0
+        self.slow_consumers_evicted = 0
+
+    def start(self):
+        self.listener_task = asyncio.create_task(self._listen())
+
+    async def stop(self):
+        if self.listener_task:
+            self.listener_task.cancel()
+            try:
+                await self.listener_task
+            except asyncio.CancelledError:
+                pass
+        for subscriber in list(self.subscribers):
+            self.unregister(subscriber)
+
+    async def _listen(self):
+        while True:
+            pubsub = self.redis.pubsub()
+            try:
+                await pubsub.psubscribe(*HUB_PATTERNS)
+                logger.info(f"Pub/sub hub subscribed to {HUB_PATTERNS}")
+                async for message in pubsub.listen():
+                    if message.get("type") == "pmessage":
+                        self.dispatch(message["channel"], message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Pub/sub hub connection error: {e}. Reconnecting...")
+                await asyncio.sleep(1)
+            finally:
+                try:
+                    await pubsub.close()
+                except Exception:
+                    pass
+
+    def add_observer(self, callback: Callable[[str, str], None]):
+        """Call callback(channel, data) for every message the hub receives, routed or not."""
+        self.observers.append(callback)
+
+    def dispatch(self, channel: str, data: str):
+        """Fan a message out to the queues of the websockets subscribed to its channel."""
+        self.messages_received += 1
+        for observer in self.observers:
+            try:
+                observer(channel, data)
+            except Exception as e:
+                logger.error(f"Pub/sub hub observer failed for {channel}: {e}")
+        subscribers = self.channel_subscribers.get(channel)
+        if not subscribers:
+            self.messages_unrouted += 1
+            return
+        for subscriber in list(subscribers):
+            try:
+                subscriber.queue.put_nowait(data)
+                self.messages_delivered += 1
+            except asyncio.QueueFull:
+                self.messages_dropped += 1
+                self._evict(subscriber)
+
+    def _evict(self, subscriber: HubSubscriber):
+        if subscriber.evicted:
+            return
+        subscriber.evicted = True
+        self.slow_consumers_evicted += 1
+        logger.warning(f"Evicting slow websocket consumer ({len(subscriber.channels)} channels, queue full at {self.max_queue})")
+        self.unregister(subscriber)
+        close_task = asyncio.create_task(self._close(subscriber.ws))
+        self.close_tasks.add(close_task)
+        close_task.add_done_callback(self.close_tasks.discard)
+
+    @staticmethod
+    async def _close(ws: WebSocket):
+        try:
+            await ws.close(code=WS_SLOW_CONSUMER_CLOSE_CODE)
+        except Exception:
+            pass
+
+    def register(self, ws: WebSocket) -> HubSubscriber:
+        subscriber = HubSubscriber(ws, self.max_queue)
+        subscriber.sender_task = asyncio.create_task(subscriber.send_loop())
+        self.subscribers.add(subscriber)
+        return subscriber
+
+    def unregister(self, subscriber: HubSubscriber):
+        self.unsubscribe(subscriber, list(subscriber.channels))
+        self.subscribers.discard(subscriber)
+        if subscriber.sender_task:
+            subscriber.sender_task.cancel()
+
+    def subscribe(self, subscriber: HubSubscriber, channels):
+        if subscriber.evicted:
+            return
+        for channel in channels:
+            self.channel_subscribers.setdefault(channel, set()).add(subscriber)
+            subscriber.channels.add(channel)
+
+    def unsubscribe(self, subscriber: HubSubscriber, channels):
+        for channel in channels:
+            subscriber.channels.discard(channel)
+            subscribers = self.channel_subscribers.get(channel)
+            if subscribers is not None:
+                subscribers.discard(subscriber)
+                if not subscribers:
+                    del self.channel_subscribers[channel]
+
+    def get_metrics(self) -> Dict[str, int]:
+        return {
+            "ws_subscribers": len(self.subscribers),
+            "ws_channels": len(self.channel_subscribers),
+            "ws_channel_subscriptions": sum(len(s) for s in self.channel_subscribers.values()),
+            "ws_queued_messages": sum(s.queue.qsize() for s in self.subscribers),
+            "pubsub_messages_received": self.messages_received,
+            "pubsub_messages_delivered": self.messages_delivered,
+            "pubsub_messages_dropped": self.messages_dropped,
+            "pubsub_messages_unrouted": self.messages_unrouted,
+            "ws_slow_consumers_evicted": self.slow_consumers_evicted,
+        }
@@ -0,0 +1,161 @@
+"""
+Benchmark: gateway proxy latency and memory for a large transcript download.
+
+Serves a synthetic transcript (10k segments by default, shaped like the collector's
+TranscriptionResponse) from a stand-in upstream, starts the gateway with uvicorn pointed
+at it, fetches /transcripts/{platform}/{id} through the gateway and reports p50/p99
+latency, throughput and the gateway's peak RSS (VmHWM, Linux only). No Redis is needed;
+the pub/sub hub just keeps retrying in the background.
+
+Usage:
+    python scripts/bench_proxy.py [--segments 10000] [--requests 200] [--concurrency 8]
+                                  [--gateway-dir .]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+
+GATEWAY_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+
+def make_transcript(segments):
+    return json.dumps({
+        "id": 1,
+        "platform": "google_meet",
+        "native_meeting_id": "abc-defg-hij",
+        "status": "completed",
+        "segments": [
+            {
+                "start": i * 4.0,
+                "end": i * 4.0 + 3.5,
+                "text": f"segment {i} the quarterly rollout review covered latency budgets and the migration plan",
+                "language": "en",
+                "speaker": f"Speaker {i % 5}",
+                "created_at": "2025-01-01T00:00:00+00:00",
+                "absolute_start_time": "2025-01-01T00:00:00+00:00",
+                "absolute_end_time": "2025-01-01T00:00:03+00:00",
+            }
+            for i in range(segments)
+        ],
+    }).encode("utf-8")
+
+
+def start_upstream(body):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def peak_rss_mb(pid):
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    return float("nan")
+
+
+async def run_load(url, requests, concurrency, expected_size):
+    latencies = []
+    queue = asyncio.Queue()
+    for _ in range(requests):
+        queue.put_nowait(None)
+
+    async def worker(client):
+        while not queue.empty():
+            queue.get_nowait()
+            t0 = time.perf_counter()
+            resp = await client.get(url, headers={"X-API-Key": "bench"})
+            latencies.append(time.perf_counter() - t0)
+            if resp.status_code != 200 or len(resp.content) != expected_size:
+                raise RuntimeError(f"Unexpected response: {resp.status_code}, {len(resp.content)} bytes")
+
+    async with httpx.AsyncClient(timeout=60) as client:
+        t0 = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        return latencies, time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--segments", type=int, default=10000)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--gateway-dir", default=GATEWAY_DIR, help="Directory containing the gateway's main.py")
+    args = parser.parse_args()
+
+    body = make_transcript(args.segments)
+    upstream = start_upstream(body)
+    upstream_url = f"http://127.0.0.1:{upstream.server_address[1]}"
+    port = free_port()
+    env = dict(
+        os.environ,
+        ADMIN_API_URL=upstream_url,
+        BOT_MANAGER_URL=upstream_url,
+        TRANSCRIPTION_COLLECTOR_URL=upstream_url,
+        REDIS_URL="redis://127.0.0.1:1/0",
+        LOG_LEVEL="CRITICAL",
+    )
+    gateway = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "critical"],
+        cwd=args.gateway_dir, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        url = f"http://127.0.0.1:{port}/transcripts/google_meet/abc-defg-hij"
+        deadline = time.time() + 30
+        while True:
+            try:
+                httpx.get(f"http://127.0.0.1:{port}/", timeout=1)
+                break
+            except httpx.HTTPError:
+                if time.time() > deadline or gateway.poll() is not None:
+                    raise SystemExit("Gateway did not start")
+                time.sleep(0.2)
+
+        idle_rss = peak_rss_mb(gateway.pid)
+        latencies, elapsed = asyncio.run(run_load(url, args.requests, args.concurrency, len(body)))
+        latencies.sort()
+        p50 = statistics.median(latencies) * 1000
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+        print(
+            f"{args.segments} segments ({len(body) / 1e6:.1f} MB), {args.requests} requests x{args.concurrency}: "
+            f"p50 {p50:.1f} ms, p99 {p99:.1f} ms, {args.requests / elapsed:.1f} req/s, "
+            f"gateway peak RSS {peak_rss_mb(gateway.pid):.1f} MB (idle {idle_rss:.1f} MB)"
+        )
+    finally:
+        gateway.terminate()
+        gateway.wait()
+        upstream.shutdown()
+
+
+if __name__ == "__main__":
+    main()
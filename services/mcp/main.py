@@ -53,14 +53,15 @@ class UpdateMeetingData(BaseModel):
 # ---------------------------
 # Helper for async requests
 # ---------------------------
-async def make_request(method: str, url: str, api_key: str, payload: Optional[dict] = None):
+async def make_request(method: str, url: str, api_key: str, payload: Optional[dict] = None, params: Optional[dict] = None):
     try:
         async with httpx.AsyncClient(timeout=10) as client:
             response = await client.request(
                 method,
                 url,
                 headers=get_headers(api_key),
-                json=payload
+                json=payload,
+                params=params
             )
             response.raise_for_status()
             return response.json()
@@ -109,22 +110,45 @@ async def request_meeting_bot(
 async def get_meeting_transcript(
     meeting_id: str,
     meeting_platform: str = "google_meet",
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    after_segment: Optional[str] = None,
+    after_segment_start: Optional[float] = None,
+    limit: Optional[int] = None,
     api_key: str = Depends(get_api_key)
 ) -> Dict[str, Any]:
     """
-    Get the real-time transcript for a meeting.
+    Get the real-time transcript for a meeting, or part of it.
     
     Args:
         meeting_id: The unique identifier for the meeting
         meeting_platform: The meeting platform (e.g., 'google_meet', 'zoom'). Default is 'google_meet'.
+        since: Optional. Only segments starting at or after this time: seconds (same timeline as the segments' 'start') or an ISO 8601 timestamp
+        until: Optional. Only segments starting before this time: seconds or an ISO 8601 timestamp
+        after_segment: Optional. The 'absolute_start_time' of the last segment already received; only later segments are returned
+        after_segment_start: Optional. The 'start' of that segment, so later segments with the same 'absolute_start_time' are kept
+        limit: Optional. Maximum number of segments to return
     
     Returns:
         JSON with the meeting transcript data including segments with speaker, timestamp, and text
     
     Note: This provides real-time transcription data and can be called during or after the meeting.
+    To follow a live meeting, pass the last segment's 'absolute_start_time' and 'start' as after_segment and
+    after_segment_start to get only new segments.
     """
     url = f"{BASE_URL}/transcripts/{meeting_platform}/{meeting_id}"
-    return await make_request("GET", url, api_key)
+    params = {
+        key: value
+        for key, value in {
+            "since": since,
+            "until": until,
+            "after_segment": after_segment,
+            "after_segment_start": after_segment_start,
+            "limit": limit,
+        }.items()
+        if value is not None
+    }
+    return await make_request("GET", url, api_key, params=params or None)
 
 
 @app.get("/bot-status", operation_id="get_bot_status")
@@ -1,16 +1,18 @@
 import logging
 import json
+import re
 from datetime import datetime, timedelta, timezone
-from typing import List, Optional, Dict, Tuple
+from typing import List, Optional, Dict, Tuple, Union
 
-from fastapi import APIRouter, Depends, HTTPException, status, Request, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Query, Response, Security
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from sqlalchemy import select, and_, func, distinct, text
+from sqlalchemy import select, and_, func, distinct, text, delete
 from sqlalchemy.ext.asyncio import AsyncSession
 import redis.asyncio as aioredis
 
 from shared_models.database import get_db
-from shared_models.models import User, Meeting, Transcription, MeetingSession
+from shared_models.models import User, Meeting, Transcription, MeetingSession, MeetingTranscriptStats
 from shared_models.schemas import (
     HealthResponse,
     MeetingResponse,
@@ -18,14 +20,21 @@ from shared_models.schemas import (
     TranscriptionResponse,
     Platform,
     TranscriptionSegment,
+    TranscriptSearchHit,
+    TranscriptSearchResponse,
     MeetingUpdate,
     MeetingCreate,
     MeetingStatus
 )
 
-from config import IMMUTABILITY_THRESHOLD
+from config import IMMUTABILITY_THRESHOLD, TRANSCRIPT_SEARCH_MAX_LIMIT, TRANSCRIPT_SEARCH_MAX_QUERY_LENGTH
 from filters import TranscriptionFilter
-from api.auth import get_current_user
+from api.auth import api_key_header, get_current_user
+from api.transcript_cache import TRANSCRIPT_CACHE, TranscriptWindow, build_meeting_meta, make_meta_key
+from api.transcript_export import EXPORT_MEDIA_TYPES, stream_transcript_export
+from api.transcript_search import search_transcripts
+from streaming.session_cache import SESSION_CONTEXT_CACHE
+from background.ownership import MEETING_OWNERSHIP
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -46,6 +55,43 @@ class WsAuthorizeSubscribeResponse(BaseModel):
     user_id: Optional[int] = None  # Include user_id for channel isolation
 
 
+def _parse_time_bound(name: str, value: Optional[str], allow_relative: bool = True) -> Optional[Union[datetime, float]]:
+    """Seconds (segment start timeline) or an ISO 8601 timestamp (naive means UTC)."""
+    if value is None or value.strip() == "":
+        return None
+    value = value.strip()
+    if allow_relative:
+        try:
+            return float(value)
+        except ValueError:
+            pass
+    # A '+' of an unencoded UTC offset arrives as a space
+    value = re.sub(r" (\d{2}:?\d{2})$", r"+\1", value).replace("Z", "+00:00")
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        expected = "seconds or an ISO 8601 timestamp" if allow_relative else "an ISO 8601 timestamp"
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=f"'{name}' must be {expected}")
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+async def get_transcript_window(
+    since: Optional[str] = Query(None, description="Only segments starting at or after this time: seconds on the segments' start timeline, or an absolute ISO 8601 timestamp"),
+    until: Optional[str] = Query(None, description="Only segments starting before this time: seconds on the segments' start timeline, or an absolute ISO 8601 timestamp"),
+    after_segment: Optional[str] = Query(None, description="Cursor: absolute_start_time of the last segment already received; only later segments are returned"),
+    after_segment_start: Optional[float] = Query(None, description="Cursor: start of the last segment already received; with after_segment, keeps later segments that share its absolute_start_time"),
+    limit: Optional[int] = Query(None, ge=1, description="Maximum number of segments to return"),
+) -> TranscriptWindow:
+    """Dependency: the part of the transcript a request asks for (the whole transcript by default)."""
+    return TranscriptWindow(
+        since=_parse_time_bound("since", since),
+        until=_parse_time_bound("until", until),
+        after_segment=_parse_time_bound("after_segment", after_segment, allow_relative=False),
+        limit=limit,
+        after_segment_start=after_segment_start,
+    )
+
+
 async def _get_full_transcript_segments(
     internal_meeting_id: int,
     db: AsyncSession,
@@ -141,7 +187,7 @@ async def _get_full_transcript_segments(
             logger.error(f"[_get_full_transcript_segments] Error parsing Redis segment {start_time_str} for meeting {internal_meeting_id}: {e}")
 
     # 5. Sort based on calculated absolute time and return
-    sorted_segment_tuples = sorted(merged_segments_with_abs_time.values(), key=lambda item: item[0])
+    sorted_segment_tuples = sorted(merged_segments_with_abs_time.values(), key=lambda item: (item[0], item[1].start_time))
     segments = [segment_obj for abs_time, segment_obj in sorted_segment_tuples]
     
     # 6. Deduplicate overlapping segments with identical text
@@ -193,6 +239,11 @@ async def health_check(request: Request, db: AsyncSession = Depends(get_db)):
         timestamp=datetime.now().isoformat()
     )
 
+@router.get("/internal/metrics", include_in_schema=False)
+async def get_collector_metrics():
+    """Stream processing counters of this collector instance"""
+    return {**SESSION_CONTEXT_CACHE.get_metrics(), **MEETING_OWNERSHIP.get_metrics(), **TRANSCRIPT_CACHE.get_metrics()}
+
 @router.get("/meetings", 
             response_model=MeetingListResponse,
             summary="Get list of all meetings for the current user",
@@ -210,13 +261,14 @@ async def get_meetings(
 @router.get("/transcripts/{platform}/{native_meeting_id}",
             response_model=TranscriptionResponse,
             summary="Get transcript for a specific meeting by platform and native ID",
-            dependencies=[Depends(get_current_user)])
+            responses={304: {"description": "Transcript unchanged since the ETag given in If-None-Match"}})
 async def get_transcript_by_native_id(
     platform: Platform,
     native_meeting_id: str,
     request: Request, # Added for redis_client access
     meeting_id: Optional[int] = Query(None, description="Optional specific database meeting ID. If provided, returns that exact meeting. If not provided, returns the latest meeting for the platform/native_meeting_id combination."),
-    current_user: User = Depends(get_current_user),
+    window: TranscriptWindow = Depends(get_transcript_window),
+    api_key: str = Security(api_key_header),
     db: AsyncSession = Depends(get_db)
 ):
     """Retrieves the meeting details and transcript segments for a meeting specified by its platform and native ID.
@@ -226,10 +278,53 @@ async def get_transcript_by_native_id(
     - If meeting_id is not provided: Returns the latest matching meeting record for the user (backward compatible behavior)
     
     Combines data from both PostgreSQL (immutable segments) and Redis Hashes (mutable segments).
+    since/until/after_segment/limit return only part of the transcript; a client following a
+    live meeting passes the absolute_start_time and start of the last segment it has as
+    after_segment and after_segment_start.
+    Responses carry an ETag; polls sending it back in If-None-Match get 304 Not Modified
+    while the transcript and meeting details are unchanged.
     """
-    logger.debug(f"[API] User {current_user.id} requested transcript for {platform.value} / {native_meeting_id}, meeting_id={meeting_id}")
     redis_c = getattr(request.app.state, 'redis_client', None)
-    
+
+    # Authenticated meeting lookups are reused briefly, so unchanged polls need no database access
+    meta_key = make_meta_key(api_key or "", platform.value, native_meeting_id, meeting_id)
+    meta = TRANSCRIPT_CACHE.get_meta(meta_key) if api_key else None
+    if meta is None:
+        current_user = await get_current_user(api_key, db)
+        meeting = await _find_user_meeting(current_user, platform, native_meeting_id, meeting_id, db)
+        meta = build_meeting_meta(meeting)
+        TRANSCRIPT_CACHE.put_meta(meta_key, meta)
+    internal_meeting_id = meta.meeting_id
+
+    if not redis_c:
+        segments = await _get_full_transcript_segments(internal_meeting_id, db, redis_c)
+        segments = window.select([seg.absolute_start_time for seg in segments], segments, lambda seg: seg.start_time)
+        return TranscriptionResponse(**meta.header, segments=segments)
+
+    state = await TRANSCRIPT_CACHE.read_state(redis_c, internal_meeting_id)
+    etag = TRANSCRIPT_CACHE.make_etag(meta, state, window)
+    if etag in [tag.strip() for tag in request.headers.get("if-none-match", "").split(",")]:
+        TRANSCRIPT_CACHE.not_modified += 1
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+    transcript = await TRANSCRIPT_CACHE.get_transcript(internal_meeting_id, state, redis_c, db)
+    logger.debug(f"[API Meet {internal_meeting_id}] Serving {len(transcript.segments)} segments (version {state[1]}/{state[2]}).")
+    return Response(
+        content=transcript.render(meta, etag, window),
+        media_type="application/json",
+        headers={"ETag": etag, "Cache-Control": "no-cache"},
+    )
+
+
+async def _find_user_meeting(
+    current_user: User,
+    platform: Platform,
+    native_meeting_id: str,
+    meeting_id: Optional[int],
+    db: AsyncSession
+) -> Meeting:
+    """The user's meeting with meeting_id, or their latest one for the platform/native ID; 404 if none."""
+    logger.debug(f"[API] User {current_user.id} requested transcript for {platform.value} / {native_meeting_id}, meeting_id={meeting_id}")
     if meeting_id is not None:
         # Get specific meeting by database ID
         # Validate it belongs to user and matches platform/native_meeting_id for consistency
@@ -265,18 +360,87 @@ async def get_transcript_by_native_id(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Meeting not found for platform {platform.value} and ID {native_meeting_id}"
             )
+    return meeting
 
-    internal_meeting_id = meeting.id
-    logger.debug(f"[API] Found meeting record ID {internal_meeting_id}, fetching segments...")
 
-    sorted_segments = await _get_full_transcript_segments(internal_meeting_id, db, redis_c)
-    
-    logger.info(f"[API Meet {internal_meeting_id}] Merged and sorted into {len(sorted_segments)} total segments.")
-    
-    meeting_details = MeetingResponse.from_orm(meeting)
-    response_data = meeting_details.dict()
-    response_data["segments"] = sorted_segments
-    return TranscriptionResponse(**response_data)
+@router.get("/transcripts/{platform}/{native_meeting_id}/export",
+            summary="Download the full transcript of a meeting as NDJSON, SRT or WebVTT")
+async def export_transcript(
+    platform: Platform,
+    native_meeting_id: str,
+    request: Request,
+    export_format: str = Query("ndjson", alias="format", regex="^(ndjson|srt|vtt)$", description="ndjson (one segment per line), srt or vtt"),
+    meeting_id: Optional[int] = Query(None, description="Optional specific database meeting ID; defaults to the latest meeting for the platform/native_meeting_id combination."),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Streams the whole transcript of a meeting, however long, without assembling it in memory.
+
+    Segments are the same as those of GET /transcripts/{platform}/{native_meeting_id}, in the
+    same order. The body is written while the segments are read from the database, so a
+    failure part way through ends the download early rather than with an error status.
+    """
+    meeting = await _find_user_meeting(current_user, platform, native_meeting_id, meeting_id, db)
+    redis_c = getattr(request.app.state, 'redis_client', None)
+    safe_native_id = re.sub(r"[^A-Za-z0-9._-]", "_", native_meeting_id)
+    filename = f"{platform.value}_{safe_native_id}_{meeting.id}.{export_format}"
+    # The export reads through its own database session: the request's one is closed once this returns
+    return StreamingResponse(
+        stream_transcript_export(meeting.id, redis_c, export_format),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get("/transcripts/search",
+            response_model=TranscriptSearchResponse,
+            summary="Search the user's stored transcripts")
+async def search_user_transcripts(
+    q: str = Query(..., min_length=1, max_length=TRANSCRIPT_SEARCH_MAX_QUERY_LENGTH, description='Words to find; "quoted phrases", or and -word are supported'),
+    platform: Optional[Platform] = Query(None, description="With native_meeting_id: search only that meeting"),
+    native_meeting_id: Optional[str] = Query(None, description="With platform: search only that meeting"),
+    meeting_id: Optional[int] = Query(None, description="Optional specific database meeting ID to search"),
+    speaker: Optional[str] = Query(None, description="Only segments of this speaker"),
+    since: Optional[str] = Query(None, description="Only segments starting at or after this ISO 8601 timestamp (or seconds on the segments' start timeline, when searching one meeting)"),
+    until: Optional[str] = Query(None, description="Only segments starting before this ISO 8601 timestamp (or seconds on the segments' start timeline, when searching one meeting)"),
+    limit: int = Query(20, ge=1, le=TRANSCRIPT_SEARCH_MAX_LIMIT),
+    offset: int = Query(0, ge=0),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Finds the user's stored transcript segments matching a full-text query, most relevant first.
+
+    Each hit carries its meeting, times, speaker and a snippet with the matches highlighted.
+    Segments of a live meeting become searchable once they are stored in PostgreSQL.
+    """
+    if (platform is None) != (native_meeting_id is None):
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="'platform' and 'native_meeting_id' must be given together")
+    if platform is not None:
+        meeting_id = (await _find_user_meeting(current_user, platform, native_meeting_id, meeting_id, db)).id
+    elif meeting_id is not None:
+        owned = await db.scalar(select(Meeting.id).where(Meeting.id == meeting_id, Meeting.user_id == current_user.id))
+        if owned is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Meeting {meeting_id} not found")
+
+    # Seconds on the segment start timeline only mean something within one meeting
+    single_meeting = meeting_id is not None
+    hits, has_more = await search_transcripts(
+        db, current_user.id, q,
+        meeting_id=meeting_id,
+        speaker=speaker,
+        since=_parse_time_bound("since", since, allow_relative=single_meeting),
+        until=_parse_time_bound("until", until, allow_relative=single_meeting),
+        limit=limit,
+        offset=offset,
+    )
+    logger.debug(f"[API] User {current_user.id} searched transcripts (meeting {meeting_id}): {len(hits)} hits at offset {offset}")
+    return TranscriptSearchResponse(
+        query=q,
+        results=[TranscriptSearchHit(**hit) for hit in hits],
+        limit=limit,
+        offset=offset,
+        has_more=has_more,
+    )
 
 
 @router.post("/ws/authorize-subscribe",
@@ -338,9 +502,10 @@ async def ws_authorize_subscribe(
 async def get_transcript_internal(
     meeting_id: int,
     request: Request,
+    window: TranscriptWindow = Depends(get_transcript_window),
     db: AsyncSession = Depends(get_db)
 ):
-    """Internal endpoint for services to fetch all transcript segments for a given meeting ID."""
+    """Internal endpoint for services to fetch the transcript segments (all, or a since/until/after_segment/limit window) of a meeting."""
     logger.debug(f"[Internal API] Transcript segments requested for meeting {meeting_id}")
     redis_c = getattr(request.app.state, 'redis_client', None)
     
@@ -351,8 +516,15 @@ async def get_transcript_internal(
             detail=f"Meeting with ID {meeting_id} not found."
         )
         
-    segments = await _get_full_transcript_segments(meeting_id, db, redis_c)
-    return segments
+    if not redis_c:
+        segments = await _get_full_transcript_segments(meeting_id, db, redis_c)
+        return window.select([seg.absolute_start_time for seg in segments], segments, lambda seg: seg.start_time)
+    state = await TRANSCRIPT_CACHE.read_state(redis_c, meeting_id)
+    transcript = await TRANSCRIPT_CACHE.get_transcript(meeting_id, state, redis_c, db)
+    return Response(
+        content=json.dumps(transcript.select(window), ensure_ascii=False, separators=(",", ":")),
+        media_type="application/json",
+    )
 
 @router.patch("/meetings/{platform}/{native_meeting_id}",
              response_model=MeetingResponse,
@@ -508,6 +680,8 @@ async def delete_meeting(
     
     for transcript in transcripts:
         await db.delete(transcript)
+    # The rollup lists speaker names, so it goes with the transcripts
+    await db.execute(delete(MeetingTranscriptStats).where(MeetingTranscriptStats.meeting_id == internal_meeting_id))
     
     # Delete transcript segments from Redis and remove from active meetings
     redis_c = getattr(request.app.state, 'redis_client', None)
@@ -517,11 +691,15 @@ async def delete_meeting(
             # Use pipeline for atomic operations
             async with redis_c.pipeline(transaction=True) as pipe:
                 pipe.delete(hash_key)
+                pipe.delete(f"meeting:{internal_meeting_id}:segment_updates")
+                pipe.delete(f"meeting:{internal_meeting_id}:transcript_version")
+                pipe.delete(f"meeting:{internal_meeting_id}:session_seq")
                 pipe.srem("active_meetings", str(internal_meeting_id))
                 results = await pipe.execute()
             logger.debug(f"[API] Deleted Redis hash {hash_key} and removed from active_meetings")
         except Exception as e:
             logger.error(f"[API] Failed to delete Redis data for meeting {internal_meeting_id}: {e}")
+    TRANSCRIPT_CACHE.invalidate_meeting(internal_meeting_id)
     
     # Scrub PII from meeting record while preserving telemetry
     original_data = meeting.data or {}
@@ -0,0 +1,430 @@
+"""In-process cache of assembled transcripts for the transcript endpoints.
+
+A transcript is the meeting's finalized segments in PostgreSQL merged with its mutable
+segments in the Redis hash `meeting:{id}:segments`. Rebuilding it on every poll of a live
+meeting means loading every row again, so each replica keeps the assembled transcript of
+recently requested meetings and only applies what changed.
+
+Changes are tracked in the Redis hash `meeting:{id}:transcript_version`, shared by all
+replicas:
+- `version` is incremented by the stream processor with every segment write and by the
+  background writer when it moves segments to PostgreSQL;
+- `db_version` is incremented by the writer only, so new PostgreSQL rows are fetched
+  (by id, past the last one seen) only when there are some;
+- `epoch` is a random token set by the first reader. It is removed when absolute times
+  change (session_start) and the whole hash is deleted with the meeting's transcripts,
+  which makes every replica rebuild the transcript from scratch.
+
+On a version change, changed Redis segments are read through the updated_at index
+(`meeting:{id}:segment_updates`) from TRANSCRIPT_REORDER_WINDOW_S before the newest update
+seen; when the index and the cached keys disagree in size (segments were flushed or
+deleted) the hash is reloaded. The ETag is derived from (epoch, version, db_version) and
+the meeting's details, so conditional polls are answered from Redis alone. Windowed
+requests (TranscriptWindow: since/until/after_segment/limit) are cut from the same
+sorted view, ordered by (absolute start, start), by bisection.
+
+Authenticated meeting lookups (API key, platform, native id) are reused for
+TRANSCRIPT_META_CACHE_TTL seconds, so meeting status changes and revoked keys take up to
+that long to show.
+"""
+import asyncio
+import bisect
+import hashlib
+import json
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Set, Tuple, TypeVar, Union
+
+import redis.asyncio as aioredis
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from shared_models.models import Meeting, MeetingSession, Transcription
+from shared_models.schemas import MeetingResponse, Platform, TranscriptionResponse, TranscriptionSegment
+
+from config import (
+    REDIS_SEGMENT_TTL,
+    TRANSCRIPT_CACHE_MAX_MEETINGS,
+    TRANSCRIPT_META_CACHE_TTL,
+    TRANSCRIPT_REORDER_WINDOW_S,
+)
+
+logger = logging.getLogger(__name__)
+
+_SESSION_PREFIXES = tuple(f"{p.value}_" for p in Platform)
+
+MetaKey = Tuple[str, str, str, Optional[int]]  # (api key hash, platform, native meeting id, meeting_id query)
+VersionState = Tuple[str, int, int]  # (epoch, version, db_version)
+T = TypeVar("T")
+
+
+class MeetingMeta(NamedTuple):
+    meeting_id: int
+    user_id: int
+    header: Dict[str, Any]  # Encoded TranscriptionResponse fields, without segments
+    digest: str
+
+
+def make_meta_key(api_key: str, platform: str, native_meeting_id: str, meeting_id: Optional[int]) -> MetaKey:
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest(), platform, native_meeting_id, meeting_id
+
+
+def build_meeting_meta(meeting: Meeting) -> MeetingMeta:
+    header = jsonable_encoder(TranscriptionResponse(**MeetingResponse.from_orm(meeting).dict(), segments=[]))
+    header.pop("segments", None)
+    digest = hashlib.sha1(json.dumps(header, sort_keys=True).encode("utf-8")).hexdigest()[:12]
+    return MeetingMeta(meeting.id, meeting.user_id, header, digest)
+
+
+def _redis_session_key(session_uid: str) -> str:
+    # Redis segments may carry a platform-prefixed session uid; MeetingSession rows do not
+    for prefix in _SESSION_PREFIXES:
+        if session_uid.startswith(prefix):
+            return session_uid[len(prefix):]
+    return session_uid
+
+
+def _as_utc(session_start: datetime) -> datetime:
+    return session_start.replace(tzinfo=timezone.utc) if session_start.tzinfo is None else session_start
+
+
+def encode_db_segment(row: Transcription, session_times: Dict[str, datetime]) -> Optional[Tuple[datetime, Dict[str, Any]]]:
+    """(absolute start, encoded TranscriptionSegment) of a PostgreSQL row, None if its session start is unknown."""
+    session_start = session_times.get(row.session_uid) if row.session_uid else None
+    if session_start is None:
+        return None
+    session_start = _as_utc(session_start)
+    absolute_start_time = session_start + timedelta(seconds=row.start_time)
+    segment = TranscriptionSegment(
+        start_time=row.start_time,
+        end_time=row.end_time,
+        text=row.text,
+        language=row.language,
+        speaker=row.speaker,
+        created_at=row.created_at,
+        absolute_start_time=absolute_start_time,
+        absolute_end_time=session_start + timedelta(seconds=row.end_time),
+    )
+    return absolute_start_time, jsonable_encoder(segment)
+
+
+def encode_redis_segment(start_time_str: str, segment_data: Dict[str, Any], session_times: Dict[str, datetime]) -> Optional[Tuple[datetime, Dict[str, Any]]]:
+    """(absolute start, encoded TranscriptionSegment) of a Redis hash segment, None if incomplete or its session start is unknown."""
+    session_uid = segment_data.get("session_uid")
+    session_start = session_times.get(_redis_session_key(session_uid)) if session_uid else None
+    if session_start is None or "end_time" not in segment_data or "text" not in segment_data:
+        return None
+    session_start = _as_utc(session_start)
+    relative_start_time = float(start_time_str)
+    absolute_start_time = session_start + timedelta(seconds=relative_start_time)
+    segment = TranscriptionSegment(
+        start_time=relative_start_time,
+        end_time=segment_data["end_time"],
+        text=segment_data["text"],
+        language=segment_data.get("language"),
+        speaker=segment_data.get("speaker"),
+        absolute_start_time=absolute_start_time,
+        absolute_end_time=session_start + timedelta(seconds=segment_data["end_time"]),
+    )
+    return absolute_start_time, jsonable_encoder(segment)
+
+
+def duplicate_of_last(last: Dict[str, Any], seg: Dict[str, Any]) -> Optional[str]:
+    """How seg relates to the previous (encoded) segment of the same text: "inside", "contains" or None."""
+    if (seg["text"] or "").strip() != (last["text"] or "").strip():
+        return None
+    if not max(seg["start"], last["start"]) < min(seg["end"], last["end"]):
+        return None
+    if seg["start"] >= last["start"] and seg["end"] <= last["end"]:
+        return "inside"
+    if seg["start"] <= last["start"] and seg["end"] >= last["end"]:
+        return "contains"
+    return None
+
+
+class AssembledTranscript:
+    """Merged segments of one meeting, kept current by refresh()."""
+
+    def __init__(self, meeting_id: int, epoch: str):
+        self.meeting_id = meeting_id
+        self.epoch = epoch
+        self.version: Optional[int] = None
+        self.db_version: Optional[int] = None
+        self.lock = asyncio.Lock()
+        self.session_times: Dict[str, datetime] = {}
+        # start key -> (absolute start, encoded TranscriptionSegment)
+        self.db_segments: Dict[str, Tuple[datetime, Dict[str, Any]]] = {}
+        self.redis_segments: Dict[str, Tuple[datetime, Dict[str, Any]]] = {}
+        self.max_db_id = 0
+        self.redis_keys: Set[str] = set()  # Indexed hash fields seen, including unusable ones
+        self.redis_max_score: Optional[float] = None
+        # Segments whose session start time is not known yet: start key -> (source, raw data)
+        self.unresolved: Dict[str, Tuple[str, Any]] = {}
+        self.segments: List[Dict[str, Any]] = []
+        self.absolute_starts: List[datetime] = []  # Absolute start of each assembled segment
+        self.body: Optional[Tuple[str, bytes]] = None  # (etag, encoded response)
+
+    def _apply(self, source: str, key: str, raw: Any) -> None:
+        """Convert and store one PostgreSQL row or Redis segment (JSON string, None when deleted)."""
+        target = self.db_segments if source == "db" else self.redis_segments
+        pending = self.unresolved.get(key)
+        if pending is not None and pending[0] == source:
+            del self.unresolved[key]
+        if raw is None:
+            target.pop(key, None)
+            return
+        try:
+            if source == "db":
+                converted = encode_db_segment(raw, self.session_times)
+                if converted is None:
+                    logger.warning(f"[API Meet {self.meeting_id}] Missing session UID ({raw.session_uid}) or start time for DB segment {key}. Cannot calculate absolute time.")
+            else:
+                segment_data = json.loads(raw)
+                converted = encode_redis_segment(key, segment_data, self.session_times)
+        except (json.JSONDecodeError, KeyError, ValueError, TypeError) as e:
+            logger.error(f"[TranscriptCache] Error converting {source} segment {key} for meeting {self.meeting_id}: {e}")
+            target.pop(key, None)
+            return
+        if converted is None:
+            target.pop(key, None)
+            session_uid = raw.session_uid if source == "db" else segment_data.get("session_uid")
+            if session_uid:  # Retried once the session's start time is known
+                self.unresolved[key] = (source, raw)
+        else:
+            target[key] = converted
+
+    async def _load_sessions(self, db: AsyncSession) -> None:
+        result = await db.execute(select(MeetingSession).where(MeetingSession.meeting_id == self.meeting_id))
+        self.session_times = {s.session_uid: s.session_start_time for s in result.scalars().all()}
+
+    async def _load_db_rows(self, db: AsyncSession) -> None:
+        result = await db.execute(
+            select(Transcription)
+            .where(Transcription.meeting_id == self.meeting_id, Transcription.id > self.max_db_id)
+            .order_by(Transcription.id)
+        )
+        for row in result.scalars().all():
+            self._apply("db", f"{row.start_time:.3f}", row)
+            self.max_db_id = max(self.max_db_id, row.id)
+
+    async def _load_redis(self, redis_c: aioredis.Redis) -> None:
+        hash_key = f"meeting:{self.meeting_id}:segments"
+        updates_key = f"meeting:{self.meeting_id}:segment_updates"
+        since = self.redis_max_score - TRANSCRIPT_REORDER_WINDOW_S if self.redis_max_score is not None else "-inf"
+        async with redis_c.pipeline(transaction=False) as pipe:
+            pipe.hlen(hash_key)
+            pipe.zcard(updates_key)
+            pipe.zrangebyscore(updates_key, since, "+inf", withscores=True)
+            hash_len, index_len, changed = await pipe.execute()
+
+        changed_keys = [key for key, _ in changed]
+        known_keys = self.redis_keys | set(changed_keys)
+        if hash_len != index_len or len(known_keys) != index_len:
+            # Segments were flushed or deleted, or are not indexed yet: reload the (mutable) hash
+            async with redis_c.pipeline(transaction=False) as pipe:
+                pipe.hgetall(hash_key)
+                pipe.zrange(updates_key, -1, -1, withscores=True)
+                values, newest = await pipe.execute()
+            for key in self.redis_keys - set(values):
+                self._apply("redis", key, None)
+            for key, raw in values.items():
+                self._apply("redis", key, raw)
+            self.redis_keys = set(values)
+            self.redis_max_score = newest[0][1] if newest else None
+            return
+
+        if changed_keys:
+            for key, raw in zip(changed_keys, await redis_c.hmget(hash_key, changed_keys)):
+                self._apply("redis", key, raw)
+            self.redis_keys = known_keys
+            self.redis_max_score = max(score for _, score in changed)
+
+    async def refresh(self, state: VersionState, redis_c: aioredis.Redis, db: AsyncSession) -> bool:
+        """Bring the transcript up to state; returns False if it already was."""
+        _, version, db_version = state
+        if self.version == version and self.db_version == db_version:
+            return False
+        if self.version is None:
+            await self._load_sessions(db)
+        if self.version is None or self.db_version != db_version:
+            await self._load_db_rows(db)
+        await self._load_redis(redis_c)
+        if self.unresolved:
+            # A session row may have been created since; retry the segments that needed it
+            await self._load_sessions(db)
+            for key, (source, raw) in list(self.unresolved.items()):
+                self._apply(source, key, raw)
+        self.version, self.db_version = version, db_version
+        self._assemble()
+        return True
+
+    def _assemble(self) -> None:
+        merged = dict(self.db_segments)
+        merged.update(self.redis_segments)
+        deduped: List[Tuple[datetime, Dict[str, Any]]] = []
+        # Ties on the absolute start are ordered by the (unique) session-relative start, for the cursor
+        for absolute_start, seg in sorted(merged.values(), key=lambda item: (item[0], item[1]["start"])):
+            # Same text overlapping the previous segment: keep only the longer one
+            duplicate = duplicate_of_last(deduped[-1][1], seg) if deduped else None
+            if duplicate == "inside":
+                continue
+            if duplicate == "contains":
+                deduped[-1] = (absolute_start, seg)
+                continue
+            deduped.append((absolute_start, seg))
+        self.absolute_starts = [absolute_start for absolute_start, _ in deduped]
+        self.segments = [seg for _, seg in deduped]
+        self.body = None
+
+    def select(self, window: "TranscriptWindow") -> List[Dict[str, Any]]:
+        if window.is_full:
+            return self.segments
+        return window.select(self.absolute_starts, self.segments, lambda seg: seg["start"])
+
+    def render(self, meta: MeetingMeta, etag: str, window: Optional["TranscriptWindow"] = None) -> bytes:
+        """JSON body of the TranscriptionResponse; the full transcript is encoded once per ETag."""
+        if window is not None and not window.is_full:
+            payload = dict(meta.header)
+            payload["segments"] = self.select(window)
+            return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        if self.body is None or self.body[0] != etag:
+            payload = dict(meta.header)
+            payload["segments"] = self.segments
+            self.body = (etag, json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+        return self.body[1]
+
+
+class TranscriptWindow(NamedTuple):
+    """Part of a transcript a request asks for; all bounds are optional.
+
+    since/until are absolute UTC datetimes, or floats compared with the segments' own
+    (session-relative) start. The cursor (after_segment, after_segment_start) is the
+    absolute and relative start of the last segment the client already has; segments
+    sharing that absolute start are told apart by their relative start (without it, every
+    segment at after_segment is skipped). Segments are selected by start time, in
+    transcript order.
+    """
+    since: Optional[Union[datetime, float]] = None
+    until: Optional[Union[datetime, float]] = None
+    after_segment: Optional[datetime] = None
+    limit: Optional[int] = None
+    after_segment_start: Optional[float] = None
+
+    @property
+    def is_full(self) -> bool:
+        return self == FULL_TRANSCRIPT
+
+    def etag_suffix(self) -> str:
+        return "" if self.is_full else "-" + hashlib.sha1(repr(tuple(self)).encode("utf-8")).hexdigest()[:8]
+
+    def select(self, absolute_starts: Sequence[datetime], segments: Sequence[T], relative_start: Callable[[T], float]) -> List[T]:
+        """Segments (sorted by (absolute start, start), as in absolute_starts) inside the window."""
+        lo, hi = 0, len(segments)
+        if isinstance(self.since, datetime):
+            lo = bisect.bisect_left(absolute_starts, self.since)
+        if self.after_segment is not None and self.after_segment_start is not None:
+            after = bisect.bisect_left(absolute_starts, self.after_segment)
+            while (after < len(segments) and absolute_starts[after] == self.after_segment
+                   and relative_start(segments[after]) <= self.after_segment_start):
+                after += 1
+            lo = max(lo, after)
+        elif self.after_segment is not None:
+            lo = max(lo, bisect.bisect_right(absolute_starts, self.after_segment))
+        if isinstance(self.until, datetime):
+            hi = bisect.bisect_left(absolute_starts, self.until, lo=lo)
+        selected = list(segments[lo:hi])
+        if isinstance(self.since, float):
+            selected = [seg for seg in selected if relative_start(seg) >= self.since]
+        if isinstance(self.until, float):
+            selected = [seg for seg in selected if relative_start(seg) < self.until]
+        return selected[:self.limit] if self.limit is not None else selected
+
+
+FULL_TRANSCRIPT = TranscriptWindow()
+
+
+class TranscriptCache:
+    def __init__(self, max_meetings: int = TRANSCRIPT_CACHE_MAX_MEETINGS, meta_ttl_s: float = TRANSCRIPT_META_CACHE_TTL):
+        self.max_meetings = max_meetings
+        self.meta_ttl_s = meta_ttl_s
+        self._transcripts: "OrderedDict[int, AssembledTranscript]" = OrderedDict()
+        self._meta: "OrderedDict[MetaKey, Tuple[float, MeetingMeta]]" = OrderedDict()
+        self.not_modified = 0
+        self.served = 0
+        self.refreshes = 0
+        self.rebuilds = 0
+        self.meta_hits = 0
+        self.meta_misses = 0
+
+    def get_meta(self, key: MetaKey) -> Optional[MeetingMeta]:
+        entry = self._meta.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            self._meta.move_to_end(key)
+            self.meta_hits += 1
+            return entry[1]
+        if entry is not None:
+            del self._meta[key]
+        self.meta_misses += 1
+        return None
+
+    def put_meta(self, key: MetaKey, meta: MeetingMeta) -> None:
+        self._meta[key] = (time.monotonic() + self.meta_ttl_s, meta)
+        self._meta.move_to_end(key)
+        while len(self._meta) > self.max_meetings * 10:
+            self._meta.popitem(last=False)
+
+    async def read_state(self, redis_c: aioredis.Redis, meeting_id: int) -> VersionState:
+        """Current (epoch, version, db_version) of a meeting's transcript, stamping an epoch if there is none."""
+        state_key = f"meeting:{meeting_id}:transcript_version"
+        epoch, version, db_version = await redis_c.hmget(state_key, "epoch", "version", "db_version")
+        if epoch is None:
+            async with redis_c.pipeline(transaction=True) as pipe:
+                pipe.hsetnx(state_key, "epoch", uuid.uuid4().hex[:12])
+                pipe.expire(state_key, REDIS_SEGMENT_TTL)
+                pipe.hmget(state_key, "epoch", "version", "db_version")
+                epoch, version, db_version = (await pipe.execute())[-1]
+        return epoch, int(version or 0), int(db_version or 0)
+
+    @staticmethod
+    def make_etag(meta: MeetingMeta, state: VersionState, window: TranscriptWindow = FULL_TRANSCRIPT) -> str:
+        epoch, version, db_version = state
+        return f'"{meta.meeting_id}-{epoch}-{version}-{db_version}-{meta.digest}{window.etag_suffix()}"'
+
+    async def get_transcript(self, meeting_id: int, state: VersionState, redis_c: aioredis.Redis, db: AsyncSession) -> AssembledTranscript:
+        """The meeting's assembled transcript, brought up to (at least) state."""
+        transcript = self._transcripts.get(meeting_id)
+        if transcript is None or transcript.epoch != state[0]:
+            transcript = AssembledTranscript(meeting_id, state[0])
+            self._transcripts[meeting_id] = transcript
+            while len(self._transcripts) > self.max_meetings:
+                self._transcripts.popitem(last=False)
+            self.rebuilds += 1
+        self._transcripts.move_to_end(meeting_id)
+        async with transcript.lock:
+            if await transcript.refresh(state, redis_c, db):
+                self.refreshes += 1
+        self.served += 1
+        return transcript
+
+    def invalidate_meeting(self, meeting_id: int) -> None:
+        self._transcripts.pop(meeting_id, None)
+        for key in [key for key, (_, meta) in self._meta.items() if meta.meeting_id == meeting_id]:
+            del self._meta[key]
+
+    def get_metrics(self) -> Dict[str, float]:
+        return {
+            "transcript_cache_meetings": len(self._transcripts),
+            "transcript_cache_served": self.served,
+            "transcript_cache_not_modified": self.not_modified,
+            "transcript_cache_refreshes": self.refreshes,
+            "transcript_cache_rebuilds": self.rebuilds,
+            "transcript_meta_cache_hits": self.meta_hits,
+            "transcript_meta_cache_misses": self.meta_misses,
+        }
+
+
+TRANSCRIPT_CACHE = TranscriptCache()
@@ -0,0 +1,174 @@
+"""Streaming transcript export (NDJSON, SRT, WebVTT).
+
+The finalized segments are read from PostgreSQL through a server-side cursor
+(yield_per TRANSCRIPT_EXPORT_BATCH_SIZE rows) in absolute start order, and the mutable
+tail in the meeting's Redis hash is merged in as the rows go by. The same selection as
+the transcript endpoint applies (Redis wins over a PostgreSQL row with the same start,
+same-text overlapping neighbours are collapsed), but nothing is collected: output is
+written in chunks of about TRANSCRIPT_EXPORT_CHUNK_BYTES, so memory does not grow with
+the length of the meeting.
+"""
+import json
+import logging
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+import redis.asyncio as aioredis
+from sqlalchemy import func, select
+
+from shared_models.database import async_session_local
+from shared_models.models import MeetingSession, Transcription
+
+from api.transcript_cache import duplicate_of_last, encode_db_segment, encode_redis_segment
+from config import TRANSCRIPT_EXPORT_BATCH_SIZE, TRANSCRIPT_EXPORT_CHUNK_BYTES
+
+logger = logging.getLogger(__name__)
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "srt": "application/x-subrip",
+    "vtt": "text/vtt",
+}
+
+Segment = Tuple[datetime, Dict[str, Any]]  # (absolute start, encoded TranscriptionSegment)
+
+
+def _absolute_start(session_start, relative_start):
+    """SQL expression: session start plus a segment's start offset in seconds."""
+    return session_start + func.make_interval(0, 0, 0, 0, 0, 0, relative_start)
+
+
+async def _db_segments(db, meeting_id: int, session_times: Dict[str, datetime], skip_keys) -> AsyncIterator[Segment]:
+    sessions = (
+        select(MeetingSession.session_uid, func.min(MeetingSession.session_start_time).label("session_start_time"))
+        .where(MeetingSession.meeting_id == meeting_id)
+        .group_by(MeetingSession.session_uid)
+        .subquery()
+    )
+    stmt = (
+        select(Transcription)
+        .join(sessions, sessions.c.session_uid == Transcription.session_uid)
+        .where(Transcription.meeting_id == meeting_id)
+        .order_by(_absolute_start(sessions.c.session_start_time, Transcription.start_time), Transcription.id)
+        .execution_options(yield_per=TRANSCRIPT_EXPORT_BATCH_SIZE)
+    )
+    rows = await db.stream_scalars(stmt)
+    async for row in rows:
+        if f"{row.start_time:.3f}" in skip_keys:
+            continue  # Superseded by the version still in Redis
+        converted = encode_db_segment(row, session_times)
+        if converted is not None:
+            yield converted
+
+
+async def _redis_tail(redis_c: Optional[aioredis.Redis], meeting_id: int, session_times: Dict[str, datetime]) -> Dict[str, Segment]:
+    """Mutable segments of the meeting by start key (the hash holds only the last IMMUTABILITY_THRESHOLD seconds or so)."""
+    if not redis_c:
+        return {}
+    tail: Dict[str, Segment] = {}
+    try:
+        raw_segments = await redis_c.hgetall(f"meeting:{meeting_id}:segments")
+    except Exception as e:
+        logger.error(f"[Export Meet {meeting_id}] Failed to fetch Redis segments: {e}")
+        return {}
+    for start_time_str, segment_json in raw_segments.items():
+        try:
+            converted = encode_redis_segment(start_time_str, json.loads(segment_json), session_times)
+        except (json.JSONDecodeError, KeyError, ValueError, TypeError) as e:
+            logger.error(f"[Export Meet {meeting_id}] Error parsing Redis segment {start_time_str}: {e}")
+            continue
+        if converted is not None:
+            tail[start_time_str] = converted
+    return tail
+
+
+async def _merge_tail(db_segments: AsyncIterator[Segment], tail: List[Segment]) -> AsyncIterator[Segment]:
+    """Merge the (sorted) Redis tail into the ordered PostgreSQL segments."""
+    i = 0
+    async for db_segment in db_segments:
+        while i < len(tail) and tail[i][0] < db_segment[0]:
+            yield tail[i]
+            i += 1
+        yield db_segment
+    for segment in tail[i:]:
+        yield segment
+
+
+async def iter_transcript_segments(meeting_id: int, redis_c: Optional[aioredis.Redis]) -> AsyncIterator[Segment]:
+    """The meeting's transcript segments in order, as the transcript endpoint would return them."""
+    async with async_session_local() as db:
+        result = await db.execute(
+            select(MeetingSession.session_uid, func.min(MeetingSession.session_start_time))
+            .where(MeetingSession.meeting_id == meeting_id)
+            .group_by(MeetingSession.session_uid)
+        )
+        session_times = {session_uid: start for session_uid, start in result.all()}
+        tail = await _redis_tail(redis_c, meeting_id, session_times)
+        merged = _merge_tail(
+            _db_segments(db, meeting_id, session_times, tail.keys()),
+            sorted(tail.values(), key=lambda item: item[0]),
+        )
+
+        # Same text overlapping the previous segment: keep only the longer one (one segment of lookahead)
+        last: Optional[Segment] = None
+        async for segment in merged:
+            if last is not None:
+                duplicate = duplicate_of_last(last[1], segment[1])
+                if duplicate == "inside":
+                    continue
+                if duplicate == "contains":
+                    last = segment
+                    continue
+                yield last
+            last = segment
+        if last is not None:
+            yield last
+
+
+def _clock(seconds: float, decimal_separator: str) -> str:
+    ms = max(0, int(round(seconds * 1000)))
+    hours, ms = divmod(ms, 3_600_000)
+    minutes, ms = divmod(ms, 60_000)
+    secs, ms = divmod(ms, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}{decimal_separator}{ms:03d}"
+
+
+def _escape_vtt(text: str) -> str:
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+async def stream_transcript_export(meeting_id: int, redis_c: Optional[aioredis.Redis], export_format: str) -> AsyncIterator[bytes]:
+    """Encoded export of a meeting's transcript, in chunks.
+
+    ndjson: one TranscriptionSegment JSON object per line. srt/vtt: one cue per segment,
+    "Speaker: text" (SRT) or a <v Speaker> voice span (WebVTT); cue times count from the
+    start of the first segment's session.
+    """
+    buffer: List[str] = ["WEBVTT\n\n"] if export_format == "vtt" else []
+    buffered = 0
+    origin: Optional[datetime] = None
+    count = 0
+    async for absolute_start, seg in iter_transcript_segments(meeting_id, redis_c):
+        count += 1
+        if export_format == "ndjson":
+            entry = json.dumps(seg, ensure_ascii=False, separators=(",", ":")) + "\n"
+        else:
+            if origin is None:
+                origin = absolute_start - timedelta(seconds=seg["start"])
+            start = (absolute_start - origin).total_seconds()
+            end = start + max(0.0, seg["end"] - seg["start"])
+            text = " ".join((seg.get("text") or "").split())
+            speaker = seg.get("speaker")
+            if export_format == "srt":
+                entry = f"{count}\n{_clock(start, ',')} --> {_clock(end, ',')}\n{f'{speaker}: ' if speaker else ''}{text}\n\n"
+            else:
+                voice = f"<v {_escape_vtt(speaker)}>" if speaker else ""
+                entry = f"{_clock(start, '.')} --> {_clock(end, '.')}\n{voice}{_escape_vtt(text)}\n\n"
+        buffer.append(entry)
+        buffered += len(entry)
+        if buffered >= TRANSCRIPT_EXPORT_CHUNK_BYTES:
+            yield "".join(buffer).encode("utf-8")
+            buffer, buffered = [], 0
+    if buffer:
+        yield "".join(buffer).encode("utf-8")
+    logger.info(f"[Export Meet {meeting_id}] Exported {count} segments as {export_format}")
@@ -0,0 +1,87 @@
+"""Full-text search over a user's stored transcript segments.
+
+Matches use the generated transcriptions.text_search tsvector (GIN indexed) with the
+'simple' configuration, which lowercases words but does not stem them, so it works the
+same for every transcription language. Queries take web search syntax ("quoted phrase",
+or, -word). Ranking (ts_rank_cd) is computed for the matching rows, but highlighted
+snippets (ts_headline) only for the page returned. Segments still in Redis (roughly the
+last IMMUTABILITY_THRESHOLD seconds of a live meeting) are not searchable yet.
+"""
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from sqlalchemy import and_, func, literal_column, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+
+from shared_models.models import Meeting, MeetingSession, Transcription
+
+# Must be the configuration of the transcriptions.text_search generated column
+SEARCH_CONFIG = literal_column("'simple'::regconfig")
+HEADLINE_OPTIONS = "StartSel=<mark>, StopSel=</mark>, MaxWords=35, MinWords=15"
+
+TimeBound = Union[datetime, float, None]  # absolute, or seconds on a meeting's segment start timeline
+
+
+def build_search_query(
+    user_id: int,
+    query: str,
+    meeting_id: Optional[int] = None,
+    speaker: Optional[str] = None,
+    since: TimeBound = None,
+    until: TimeBound = None,
+    limit: int = 20,
+    offset: int = 0,
+) -> Select:
+    """One page (limit + 1 rows, to tell whether there is more) of matches, best first."""
+    tsquery = func.websearch_to_tsquery(SEARCH_CONFIG, query)
+    rank = func.ts_rank_cd(Transcription.text_search, tsquery)
+    absolute_start = MeetingSession.session_start_time + func.make_interval(0, 0, 0, 0, 0, 0, Transcription.start_time)
+
+    conditions = [Meeting.user_id == user_id, Transcription.text_search.op("@@")(tsquery)]
+    if meeting_id is not None:
+        conditions.append(Transcription.meeting_id == meeting_id)
+    if speaker:
+        conditions.append(Transcription.speaker == speaker)
+    for bound, is_lower in ((since, True), (until, False)):
+        if bound is None:
+            continue
+        column = Transcription.start_time if isinstance(bound, float) else absolute_start
+        conditions.append(column >= bound if is_lower else column < bound)
+
+    matches = (
+        select(
+            Transcription.id,
+            Transcription.meeting_id,
+            Meeting.platform,
+            Meeting.platform_specific_id.label("native_meeting_id"),
+            Transcription.start_time,
+            Transcription.end_time,
+            Transcription.text,
+            Transcription.speaker,
+            Transcription.language,
+            absolute_start.label("absolute_start_time"),
+            rank.label("rank"),
+        )
+        .join(Meeting, Meeting.id == Transcription.meeting_id)
+        .outerjoin(MeetingSession, and_(
+            MeetingSession.meeting_id == Transcription.meeting_id,
+            MeetingSession.session_uid == Transcription.session_uid,
+        ))
+        .where(*conditions)
+        .order_by(rank.desc(), Transcription.id.desc())
+        .limit(limit + 1)
+        .offset(offset)
+        .subquery()
+    )
+    return (
+        select(matches, func.ts_headline(SEARCH_CONFIG, matches.c.text, tsquery, HEADLINE_OPTIONS).label("snippet"))
+        .order_by(matches.c.rank.desc(), matches.c.id.desc())
+    )
+
+
+async def search_transcripts(db: AsyncSession, user_id: int, query: str, limit: int = 20, offset: int = 0, **filters) -> Tuple[List[Dict[str, Any]], bool]:
+    """(hits of the page, whether there are more); filters as for build_search_query."""
+    result = await db.execute(build_search_query(user_id, query, limit=limit, offset=offset, **filters))
+    rows = [dict(row._mapping) for row in result]
+    return rows[:limit], len(rows) > limit
@@ -1,238 +1,447 @@
 import logging
 import json
 import asyncio
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
-from typing import Optional, Dict, Set
+from typing import Any, Optional, Dict, List, Set, Tuple
 
 import redis # For redis.exceptions
 import redis.asyncio as aioredis
+from sqlalchemy import func, insert, literal_column, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from shared_models.database import async_session_local
-from shared_models.models import Transcription, Meeting
+from shared_models.models import Transcription, Meeting, MeetingSession, MeetingTranscriptStats
 # No schemas needed directly by these functions as they create Transcription objects
-from config import BACKGROUND_TASK_INTERVAL, IMMUTABILITY_THRESHOLD, REDIS_SPEAKER_EVENT_KEY_PREFIX
+from config import BACKGROUND_TASK_INTERVAL, IMMUTABILITY_THRESHOLD, REDIS_SEGMENT_TTL, REDIS_SPEAKER_EVENT_KEY_PREFIX
 from filters import TranscriptionFilter
+from background.ownership import MEETING_OWNERSHIP
 # Speaker re-mapping before persistence
 from mapping.speaker_mapper import (
-    get_speaker_mapping_for_segment,
-    STATUS_MAPPED,
+    get_speaker_mappings_for_segments,
     STATUS_UNKNOWN,
     STATUS_NO_SPEAKER_EVENTS,
-    STATUS_MULTIPLE,
     STATUS_ERROR,
 )
 
 logger = logging.getLogger(__name__)
 
-# This helper is used by process_redis_to_postgres
-def create_transcription_object(meeting_id: int, start: float, end: float, text: str, language: Optional[str], session_uid: Optional[str], mapped_speaker_name: Optional[str]) -> Transcription:
-    """Creates a Transcription ORM object without adding/committing."""
-    return Transcription(
-        meeting_id=meeting_id,
-        start_time=start,
-        end_time=end,
-        text=text,
-        speaker=mapped_speaker_name,
-        language=language,
-        session_uid=session_uid, 
-        created_at=datetime.utcnow()
+# Rows per multi-row INSERT statement (asyncpg allows at most 32767 bind parameters)
+INSERT_CHUNK_SIZE = 1000
+MEETING_CHANNEL_CACHE_SIZE = 10000
+
+# meeting id -> (user_id, platform, native meeting id); these never change for a meeting
+_meeting_channel_cache: "OrderedDict[int, Tuple[int, str, str]]" = OrderedDict()
+
+def build_transcription_row(meeting_id: int, start: float, end: float, text: str, language: Optional[str], session_uid: Optional[str], mapped_speaker_name: Optional[str]) -> Dict[str, Any]:
+    """Column values of one transcriptions row for the bulk INSERT."""
+    return {
+        "meeting_id": meeting_id,
+        "start_time": start,
+        "end_time": end,
+        "text": text,
+        "speaker": mapped_speaker_name,
+        "language": language,
+        "session_uid": session_uid,
+        "created_at": datetime.utcnow(),
+    }
+
+def _parse_updated_at(value: str) -> float:
+    # Handle 'Z' suffix in timestamps
+    if value.endswith('Z'):
+        value = value[:-1] + '+00:00'
+    updated_at = datetime.fromisoformat(value)
+    if updated_at.tzinfo is None:
+        updated_at = updated_at.replace(tzinfo=timezone.utc)
+    return updated_at.timestamp()
+
+def _start_time_order(item: Tuple[str, Any]) -> float:
+    try:
+        return float(item[0])
+    except ValueError:
+        return float('inf')
+
+def parse_segment(start_time_str: str, segment_json: str) -> Tuple[Dict[str, Any], Optional[float]]:
+    """Parse a segment hash value into (segment, updated_at timestamp or None).
+
+    Raises:
+        ValueError: If the start key or the value cannot be parsed.
+    """
+    try:
+        float(start_time_str)
+        segment_data = json.loads(segment_json)
+        updated_at = _parse_updated_at(segment_data['updated_at']) if 'updated_at' in segment_data else None
+    except (json.JSONDecodeError, TypeError, AttributeError) as e:
+        raise ValueError(str(e)) from e
+    return segment_data, updated_at
+
+async def final_speaker_remap(redis_c: aioredis.Redis, immutable: List[Tuple[int, str, Dict[str, Any]]]) -> None:
+    """Attempt ONE FINAL speaker mapping pass for immutable segments whose speaker is missing or uncertain.
+
+    Segments are mapped in one batch per session, and the new mappings are written back to the
+    meeting hashes in one pipeline so the API reflects them while the segments are still in Redis.
+    """
+    by_session: Dict[str, List[Tuple[int, str, Dict[str, Any]]]] = {}
+    for meeting_id, start_time_str, segment_data in immutable:
+        needs_remap = (
+            (not segment_data.get("speaker"))
+            or segment_data.get("speaker_mapping_status", STATUS_UNKNOWN) in (STATUS_UNKNOWN, STATUS_NO_SPEAKER_EVENTS, STATUS_ERROR)
+        )
+        if needs_remap and segment_data.get("session_uid"):
+            by_session.setdefault(segment_data["session_uid"], []).append((meeting_id, start_time_str, segment_data))
+    if not by_session:
+        return
+
+    async def remap_session(session_uid: str, items: List[Tuple[int, str, Dict[str, Any]]]):
+        try:
+            segments_ms = [(float(start_time_str) * 1000.0, float(segment_data["end_time"]) * 1000.0) for _, start_time_str, segment_data in items]
+        except (KeyError, ValueError, TypeError) as e:
+            logger.error(f"[FinalMap] Invalid segment times for session {session_uid}: {e}")
+            return []
+        return await get_speaker_mappings_for_segments(
+            redis_c=redis_c,
+            session_uid=session_uid,
+            segments_ms=segments_ms,
+            config_speaker_event_key_prefix=REDIS_SPEAKER_EVENT_KEY_PREFIX,
+            context_log_msg=f"[FinalMap UID:{session_uid}]"
+        )
+
+    sessions = list(by_session.items())
+    results = await asyncio.gather(*(remap_session(uid, items) for uid, items in sessions))
+
+    async with redis_c.pipeline(transaction=False) as pipe:
+        remapped = 0
+        remapped_meetings = set()
+        for (session_uid, items), mapping_results in zip(sessions, results):
+            for (meeting_id, start_time_str, segment_data), mapping_result in zip(items, mapping_results):
+                segment_data["speaker"] = mapping_result.get("speaker_name")
+                segment_data["speaker_mapping_status"] = mapping_result.get("status", STATUS_ERROR)
+                pipe.hset(f"meeting:{meeting_id}:segments", start_time_str, json.dumps(segment_data))
+                remapped_meetings.add(meeting_id)
+                remapped += 1
+        # Cached assembled transcripts (api.transcript_cache) re-read the remapped speakers
+        for meeting_id in remapped_meetings:
+            version_key = f"meeting:{meeting_id}:transcript_version"
+            pipe.hincrby(version_key, "version", 1)
+            pipe.expire(version_key, REDIS_SEGMENT_TTL)
+        if remapped:
+            await pipe.execute()
+            logger.info(f"[FinalMap] Remapped speakers of {remapped} segments across {len(sessions)} sessions")
+
+async def insert_transcriptions(db: AsyncSession, rows: List[Dict[str, Any]]) -> None:
+    """Insert transcription rows with multi-row INSERT ... VALUES statements (not committed)."""
+    for i in range(0, len(rows), INSERT_CHUNK_SIZE):
+        await db.execute(insert(Transcription).values(rows[i:i + INSERT_CHUNK_SIZE]))
+
+def _merged_array(column: str) -> Any:
+    """ON CONFLICT value: the stored array of a rollup column united with the new values, distinct and sorted."""
+    return literal_column(
+        f"ARRAY(SELECT DISTINCT v FROM unnest(meeting_transcript_stats.{column} || excluded.{column}) AS v ORDER BY v)"
+    )
+
+async def get_session_starts(db: AsyncSession, rows: List[Dict[str, Any]]) -> Dict[Tuple[int, str], datetime]:
+    """Naive UTC start time per (meeting id, session uid) of the given rows, from one query."""
+    session_uids = {row["session_uid"] for row in rows if row["session_uid"]}
+    if not session_uids:
+        return {}
+    result = await db.execute(
+        select(MeetingSession.meeting_id, MeetingSession.session_uid, func.min(MeetingSession.session_start_time))
+        .where(MeetingSession.meeting_id.in_({row["meeting_id"] for row in rows}), MeetingSession.session_uid.in_(session_uids))
+        .group_by(MeetingSession.meeting_id, MeetingSession.session_uid)
     )
+    starts = {}
+    for meeting_id, session_uid, session_start in result.all():
+        if session_start.tzinfo is not None:
+            session_start = session_start.astimezone(timezone.utc).replace(tzinfo=None)
+        starts[(meeting_id, session_uid)] = session_start
+    return starts
+
+async def update_transcript_stats(db: AsyncSession, rows: List[Dict[str, Any]]) -> None:
+    """Add stored rows to their meetings' meeting_transcript_stats rollup with one upsert (not committed).
+
+    last_segment_at is the wall-clock end of the latest segment (session start + end_time); rows whose
+    session start is unknown leave it unchanged.
+    """
+    session_starts = await get_session_starts(db, rows)
+    stats: Dict[int, Dict[str, Any]] = {}
+    for row in rows:
+        entry = stats.setdefault(row["meeting_id"], {
+            "meeting_id": row["meeting_id"], "segment_count": 0, "speech_seconds": 0.0,
+            "speakers": set(), "languages": set(), "last_segment_at": None,
+        })
+        entry["segment_count"] += 1
+        entry["speech_seconds"] += row["end_time"] - row["start_time"]
+        if row["speaker"]:
+            entry["speakers"].add(row["speaker"])
+        if row["language"]:
+            entry["languages"].add(row["language"])
+        session_start = session_starts.get((row["meeting_id"], row["session_uid"]))
+        if session_start is not None:
+            segment_end = session_start + timedelta(seconds=row["end_time"])
+            if entry["last_segment_at"] is None or segment_end > entry["last_segment_at"]:
+                entry["last_segment_at"] = segment_end
+    values = [{**entry, "speakers": sorted(entry["speakers"]), "languages": sorted(entry["languages"])} for entry in stats.values()]
+    stmt = pg_insert(MeetingTranscriptStats).values(values)
+    table = MeetingTranscriptStats.__table__
+    await db.execute(stmt.on_conflict_do_update(
+        index_elements=[table.c.meeting_id],
+        set_={
+            "segment_count": table.c.segment_count + stmt.excluded.segment_count,
+            "speech_seconds": table.c.speech_seconds + stmt.excluded.speech_seconds,
+            "speakers": _merged_array("speakers"),
+            "languages": _merged_array("languages"),
+            "last_segment_at": func.greatest(table.c.last_segment_at, stmt.excluded.last_segment_at),
+            "updated_at": func.now(),
+        },
+    ))
+
+async def get_meeting_channels(db: AsyncSession, meeting_ids: Set[int]) -> Dict[int, Tuple[int, str, str]]:
+    """(user_id, platform, native meeting id) per meeting, from the cache or one query for the misses."""
+    missing = [m_id for m_id in meeting_ids if m_id not in _meeting_channel_cache]
+    if missing:
+        rows = await db.execute(
+            select(Meeting.id, Meeting.user_id, Meeting.platform, Meeting.platform_specific_id).where(Meeting.id.in_(missing))
+        )
+        for m_id, user_id, platform, native_id in rows.all():
+            if platform and native_id:
+                _meeting_channel_cache[m_id] = (user_id, platform, native_id)
+        while len(_meeting_channel_cache) > MEETING_CHANNEL_CACHE_SIZE:
+            _meeting_channel_cache.popitem(last=False)
+    channels = {}
+    for m_id in meeting_ids:
+        if m_id in _meeting_channel_cache:
+            _meeting_channel_cache.move_to_end(m_id)
+            channels[m_id] = _meeting_channel_cache[m_id]
+    return channels
+
+async def publish_finalized_segments(redis_c: aioredis.Redis, db: AsyncSession, rows: List[Dict[str, Any]]) -> None:
+    """Publish finalized segments per meeting via Redis Pub/Sub, in one pipeline."""
+    # Group by meeting for channel fan-out
+    segments_by_meeting: Dict[int, list] = {}
+    for row in rows:
+        segments_by_meeting.setdefault(row["meeting_id"], []).append({
+            "start": row["start_time"],
+            "end": row["end_time"],
+            "text": row["text"],
+            "language": row["language"],
+            "speaker": row["speaker"],
+            "session_uid": row["session_uid"],
+        })
+    channels = await get_meeting_channels(db, set(segments_by_meeting))
+    now = datetime.now(timezone.utc).isoformat()
+    async with redis_c.pipeline(transaction=False) as pipe:
+        for m_id, segs in segments_by_meeting.items():
+            if m_id not in channels:
+                continue
+            user_id, platform, native_id = channels[m_id]
+            payload = {
+                "type": "transcript.finalized",
+                "meeting": {"platform": platform, "native_id": native_id},
+                "payload": {"segments": segs},
+                "ts": now
+            }
+            pipe.publish(f"tc:meeting:{user_id}:{platform}:{native_id}:finalized", json.dumps(payload))
+        await pipe.execute()
 
 async def process_redis_to_postgres(redis_c: aioredis.Redis, local_transcription_filter: TranscriptionFilter):
     """
     Background task that runs periodically to:
     1. Check for segments in Redis Hashes that are older than IMMUTABILITY_THRESHOLD
     2. Filter these segments
-    3. Store passing segments in PostgreSQL 
+    3. Store passing segments in PostgreSQL
     4. Remove processed segments from Redis Hashes
+
+    Only meetings owned by this replica are processed, so replicas never store a segment twice.
+    Each pass reads only the segments that became immutable (via the per-meeting updated_at
+    index) in one pipeline, stores them with multi-row INSERTs in one transaction, and
+    publishes/deletes them with one pipeline each.
     """
     logger.info("Background Redis-to-PostgreSQL processor started")
-    
+
     while True:
         try:
             await asyncio.sleep(BACKGROUND_TASK_INTERVAL)
             logger.debug("Background processor checking for immutable segments in Redis Hashes...")
-            
+
             meeting_ids_raw = await redis_c.smembers("active_meetings")
             if not meeting_ids_raw:
                 logger.debug("No active meetings found in Redis Set")
                 continue
-                
-            meeting_ids = [mid for mid in meeting_ids_raw]
-            logger.debug(f"Found {len(meeting_ids)} active meetings in Redis Set")
-            
-            batch_to_store = []
-            segments_to_delete_from_redis: Dict[int, Set[str]] = {}  
-            
-            async with async_session_local() as db:
+
+            # With several replicas each one flushes only the meetings it owns (see background.ownership)
+            meeting_ids = await MEETING_OWNERSHIP.claim(redis_c, list(meeting_ids_raw))
+            logger.debug(f"Found {len(meeting_ids_raw)} active meetings in Redis Set, {len(meeting_ids)} owned by this replica")
+            if not meeting_ids:
+                continue
+
+            immutability_time = (datetime.now(timezone.utc) - timedelta(seconds=IMMUTABILITY_THRESHOLD)).timestamp()
+
+            # The processor indexes every segment it writes in meeting:{id}:segment_updates (scored by
+            # updated_at), so only segments that became immutable are read from the hashes.
+            async with redis_c.pipeline(transaction=False) as pipe:
                 for meeting_id_str in meeting_ids:
-                    try:
-                        meeting_id = int(meeting_id_str)
-                        hash_key = f"meeting:{meeting_id}:segments"
-                        redis_segments_dict = await redis_c.hgetall(hash_key)
-                        
-                        if not redis_segments_dict:
-                            await redis_c.srem("active_meetings", meeting_id_str)
-                            local_transcription_filter.clear_processed_segments_cache(meeting_id)
-                            logger.debug(f"Removed empty meeting {meeting_id} from active meetings set and cleared its filter cache.")
+                    pipe.hlen(f"meeting:{meeting_id_str}:segments")
+                    pipe.zcard(f"meeting:{meeting_id_str}:segment_updates")
+                    pipe.zrangebyscore(f"meeting:{meeting_id_str}:segment_updates", "-inf", immutability_time)
+                index_results = await pipe.execute()
+
+            immutable: List[Tuple[int, str, Dict[str, Any]]] = []
+            segments_to_delete_from_redis: Dict[int, Set[str]] = {}
+            stale_index_entries: Dict[int, List[str]] = {}
+            empty_meetings: List[str] = []
+            to_read: List[Tuple[int, Optional[List[str]]]] = []  # (meeting id, due start keys or None for a full scan)
+
+            for i, meeting_id_str in enumerate(meeting_ids):
+                hash_len, index_len, due_keys = index_results[3 * i:3 * i + 3]
+                try:
+                    meeting_id = int(meeting_id_str)
+                except ValueError:
+                    logger.error(f"Invalid meeting id '{meeting_id_str}' in active meetings set")
+                    continue
+                if not hash_len:
+                    empty_meetings.append(meeting_id_str)
+                elif hash_len > index_len:
+                    # Segments written before the index existed: scan the hash once and index them
+                    to_read.append((meeting_id, None))
+                elif due_keys:
+                    to_read.append((meeting_id, due_keys))
+
+            if to_read:
+                async with redis_c.pipeline(transaction=False) as pipe:
+                    for meeting_id, due_keys in to_read:
+                        if due_keys is None:
+                            pipe.hgetall(f"meeting:{meeting_id}:segments")
+                        else:
+                            pipe.hmget(f"meeting:{meeting_id}:segments", due_keys)
+                    read_results = await pipe.execute()
+
+                backfill: Dict[int, Dict[str, float]] = {}
+                for (meeting_id, due_keys), values in zip(to_read, read_results):
+                    if due_keys is None:
+                        segment_items = list(values.items())
+                    else:
+                        segment_items = list(zip(due_keys, values))
+                    logger.debug(f"Processing {len(segment_items)} {'segments' if due_keys is None else 'due segments'} from Redis Hash for meeting {meeting_id}")
+                    for start_time_str, segment_json in sorted(segment_items, key=_start_time_order):
+                        if segment_json is None:  # Already gone from the hash
+                            stale_index_entries.setdefault(meeting_id, []).append(start_time_str)
+                            continue
+                        try:
+                            segment_data, updated_at = parse_segment(start_time_str, segment_json)
+                        except ValueError as e:
+                            logger.error(f"Error parsing segment {start_time_str} from hash for meeting {meeting_id}: {e}")
+                            segments_to_delete_from_redis.setdefault(meeting_id, set()).add(start_time_str)
                             continue
+                        if due_keys is None:
+                            backfill.setdefault(meeting_id, {})[start_time_str] = updated_at if updated_at is not None else immutability_time
+                        if updated_at is None:
+                            if due_keys is None:
+                                logger.warning(f"Segment {start_time_str} in meeting {meeting_id} hash is missing 'updated_at'. Indexing it as of now.")
+                                continue
+                        elif updated_at >= immutability_time:
+                            continue  # Updated after the index was read; it will become due again
+                        immutable.append((meeting_id, start_time_str, segment_data))
 
-                        sorted_segment_items = sorted(redis_segments_dict.items(), key=lambda item: float(item[0]))
-                            
-                        logger.debug(f"Processing {len(sorted_segment_items)} segments from Redis Hash for meeting {meeting_id} (sorted)")
-                        immutability_time = datetime.now(timezone.utc) - timedelta(seconds=IMMUTABILITY_THRESHOLD)
-                        
-                        for start_time_str, segment_json in sorted_segment_items:
-                            try:
-                                segment_data = json.loads(segment_json)
-                                segment_session_uid = segment_data.get("session_uid")
-                                if 'updated_at' not in segment_data:
-                                     logger.warning(f"Segment {start_time_str} in meeting {meeting_id} hash is missing 'updated_at'. Skipping immutability check.")
-                                     continue 
-                                
-                                # Handle 'Z' suffix in timestamps
-                                updated_at_str = segment_data['updated_at']
-                                if updated_at_str.endswith('Z'):
-                                    updated_at_str = updated_at_str[:-1] + '+00:00'
-                                segment_updated_at = datetime.fromisoformat(updated_at_str)
-                                if segment_updated_at.tzinfo is None: 
-                                    segment_updated_at = segment_updated_at.replace(tzinfo=timezone.utc)
-                                
-                                if segment_updated_at < immutability_time:
-                                    # Segment is immutable. Attempt ONE FINAL speaker mapping pass if speaker name is missing or uncertain.
-                                    mapped_speaker_name: Optional[str] = segment_data.get("speaker")
-                                    mapping_status: str = segment_data.get("speaker_mapping_status", STATUS_UNKNOWN)
-
-                                    needs_remap = (
-                                        (not mapped_speaker_name)
-                                        or mapping_status in (STATUS_UNKNOWN, STATUS_NO_SPEAKER_EVENTS, STATUS_ERROR)
-                                    )
-
-                                    if needs_remap and segment_session_uid:
-                                        try:
-                                            segment_start_ms = float(start_time_str) * 1000.0
-                                            segment_end_ms = float(segment_data["end_time"]) * 1000.0
-                                            
-                                            context_log = f"[FinalMap Meet:{meeting_id}/Seg:{start_time_str}]"
-                                            mapping_result = await get_speaker_mapping_for_segment(
-                                                redis_c=redis_c,
-                                                session_uid=segment_session_uid,
-                                                segment_start_ms=segment_start_ms,
-                                                segment_end_ms=segment_end_ms,
-                                                config_speaker_event_key_prefix=REDIS_SPEAKER_EVENT_KEY_PREFIX,
-                                                context_log_msg=context_log
-                                            )
-
-                                            mapped_speaker_name = mapping_result.get("speaker_name")
-                                            mapping_status = mapping_result.get("status", STATUS_ERROR)
-                                            
-                                            # Persist new mapping back into Redis so API reflects it while still in Redis
-                                            segment_data["speaker"] = mapped_speaker_name
-                                            segment_data["speaker_mapping_status"] = mapping_status
-                                            await redis_c.hset(hash_key, start_time_str, json.dumps(segment_data))
-
-                                            logger.info(
-                                                f"[FinalMap] Meeting {meeting_id} segment {start_time_str} remapped to '{mapped_speaker_name}' with status {mapping_status}"
-                                            )
-                                        except Exception as map_err:
-                                            logger.error(
-                                                f"[FinalMap] Error remapping speaker for meeting {meeting_id} segment {start_time_str}: {map_err}",
-                                                exc_info=True,
-                                            )
-
-                                    else:
-                                        logger.debug(
-                                            f"Segment {start_time_str} (UID: {segment_session_uid}) uses speaker: '{mapped_speaker_name}' (status {mapping_status})"
-                                        )
-
-                                    # Filter the segment (deduplication, etc.)
-                                    segment_start_time_float = float(start_time_str)
-                                    segment_end_time_float = segment_data['end_time']
-                                    
-                                    # Fix inverted timestamps before filtering
-                                    if segment_end_time_float < segment_start_time_float:
-                                        segment_start_time_float, segment_end_time_float = segment_end_time_float, segment_start_time_float
-                                        logger.warning(f"[FinalMap] Corrected inverted segment times for meet {meeting_id}, start={segment_start_time_float}, end={segment_end_time_float}")
-                                    
-                                    if local_transcription_filter.filter_segment(
-                                        segment_data['text'], 
-                                        start_time=segment_start_time_float, 
-                                        end_time=segment_end_time_float, 
-                                        meeting_id=meeting_id,
-                                        language=segment_data.get('language')
-                                    ):
-                                        new_transcription = create_transcription_object(
-                                            meeting_id=meeting_id,
-                                            start=segment_start_time_float,
-                                            end=segment_end_time_float,
-                                            text=segment_data['text'],
-                                            language=segment_data.get('language'),
-                                            session_uid=segment_session_uid,
-                                            mapped_speaker_name=mapped_speaker_name
-                                        )
-                                        batch_to_store.append(new_transcription)
-                                    segments_to_delete_from_redis.setdefault(meeting_id, set()).add(start_time_str)
-                            except (json.JSONDecodeError, KeyError, ValueError, TypeError) as e:
-                                logger.error(f"Error processing segment {start_time_str} from hash for meeting {meeting_id}: {e}")
-                                segments_to_delete_from_redis.setdefault(meeting_id, set()).add(start_time_str)
-                    except Exception as e:
-                        logger.error(f"Error processing meeting {meeting_id_str} in Redis-to-PG task: {e}", exc_info=True)
-                
-                if batch_to_store:
+                if backfill:
+                    async with redis_c.pipeline(transaction=False) as pipe:
+                        for meeting_id, scores in backfill.items():
+                            # nx: never override the score of an update the processor indexed meanwhile
+                            pipe.zadd(f"meeting:{meeting_id}:segment_updates", scores, nx=True)
+                            pipe.expire(f"meeting:{meeting_id}:segment_updates", REDIS_SEGMENT_TTL)
+                        await pipe.execute()
+                    logger.info(f"Indexed {sum(len(v) for v in backfill.values())} unindexed segments of {len(backfill)} meetings")
+
+            if empty_meetings:
+                async with redis_c.pipeline(transaction=False) as pipe:
+                    pipe.srem("active_meetings", *empty_meetings)
+                    for meeting_id_str in empty_meetings:
+                        pipe.delete(f"meeting:{meeting_id_str}:segment_updates")
+                    await pipe.execute()
+                for meeting_id_str in empty_meetings:
+                    local_transcription_filter.clear_processed_segments_cache(int(meeting_id_str))
+                logger.debug(f"Removed empty meetings {empty_meetings} from active meetings set and cleared their filter caches.")
+
+            if stale_index_entries:
+                async with redis_c.pipeline(transaction=False) as pipe:
+                    for meeting_id, start_times in stale_index_entries.items():
+                        pipe.zrem(f"meeting:{meeting_id}:segment_updates", *start_times)
+                    await pipe.execute()
+
+            if not immutable and not segments_to_delete_from_redis:
+                logger.debug("No segments ready for PostgreSQL storage this interval.")
+                continue
+
+            await final_speaker_remap(redis_c, immutable)
+
+            rows_to_store: List[Dict[str, Any]] = []
+            for meeting_id, start_time_str, segment_data in immutable:
+                segments_to_delete_from_redis.setdefault(meeting_id, set()).add(start_time_str)
+                try:
+                    # Filter the segment (deduplication, etc.)
+                    segment_start_time_float = float(start_time_str)
+                    segment_end_time_float = float(segment_data['end_time'])
+
+                    # Fix inverted timestamps before filtering
+                    if segment_end_time_float < segment_start_time_float:
+                        segment_start_time_float, segment_end_time_float = segment_end_time_float, segment_start_time_float
+                        logger.warning(f"[FinalMap] Corrected inverted segment times for meet {meeting_id}, start={segment_start_time_float}, end={segment_end_time_float}")
+
+                    if local_transcription_filter.filter_segment(
+                        segment_data['text'],
+                        start_time=segment_start_time_float,
+                        end_time=segment_end_time_float,
+                        meeting_id=meeting_id,
+                        language=segment_data.get('language')
+                    ):
+                        rows_to_store.append(build_transcription_row(
+                            meeting_id=meeting_id,
+                            start=segment_start_time_float,
+                            end=segment_end_time_float,
+                            text=segment_data['text'],
+                            language=segment_data.get('language'),
+                            session_uid=segment_data.get("session_uid"),
+                            mapped_speaker_name=segment_data.get("speaker")
+                        ))
+                except (KeyError, ValueError, TypeError) as e:
+                    logger.error(f"Error processing segment {start_time_str} from hash for meeting {meeting_id}: {e}")
+
+            if rows_to_store:
+                async with async_session_local() as db:
                     try:
-                        db.add_all(batch_to_store)
+                        await insert_transcriptions(db, rows_to_store)
+                        # Same transaction, so the rollup counts every stored row exactly once
+                        await update_transcript_stats(db, rows_to_store)
                         await db.commit()
-                        logger.info(f"Stored {len(batch_to_store)} segments to PostgreSQL from {len(segments_to_delete_from_redis)} meetings")
-                        # Publish finalized segments per meeting via Redis Pub/Sub
-                        try:
-                            # Group by meeting for channel fan-out
-                            segments_by_meeting: Dict[int, list] = {}
-                            for t in batch_to_store:
-                                segments_by_meeting.setdefault(t.meeting_id, []).append({
-                                    "start": t.start_time,
-                                    "end": t.end_time,
-                                    "text": t.text,
-                                    "language": t.language,
-                                    "speaker": t.speaker,
-                                    "session_uid": t.session_uid,
-                                })
-                            for m_id, segs in segments_by_meeting.items():
-                                try:
-                                    meet_row = await db.get(Meeting, m_id)
-                                except Exception:
-                                    meet_row = None
-                                if meet_row and meet_row.platform and meet_row.platform_specific_id:
-                                    try:
-                                        payload = {
-                                            "type": "transcript.finalized",
-                                            "meeting": {"platform": meet_row.platform, "native_id": meet_row.platform_specific_id},
-                                            "payload": {"segments": segs},
-                                            "ts": datetime.now(timezone.utc).isoformat()
-                                        }
-                                        channel = f"tc:meeting:{meet_row.user_id}:{meet_row.platform}:{meet_row.platform_specific_id}:finalized"
-                                        await redis_c.publish(channel, json.dumps(payload))
-                                    except Exception as _pub_err:
-                                        logger.error(f"Failed to publish finalized segments for meeting {m_id}: {_pub_err}")
-                        except Exception as pub_err:
-                            logger.error(f"Failed to publish finalized segments: {pub_err}")
-                        
-                        for meeting_id, start_times in segments_to_delete_from_redis.items():
-                            if start_times:
-                                hash_key = f"meeting:{meeting_id}:segments"
-                                await redis_c.hdel(hash_key, *start_times)
-                                logger.debug(f"Deleted {len(start_times)} processed segments for meeting {meeting_id} from Redis Hash")
                     except Exception as e:
                         logger.error(f"Error committing batch to PostgreSQL: {e}", exc_info=True)
                         await db.rollback()
-                else:
-                    logger.debug("No segments ready for PostgreSQL storage this interval.")
-        
+                        continue  # Segments stay in Redis and are retried next pass
+                    logger.info(f"Stored {len(rows_to_store)} segments to PostgreSQL from {len(segments_to_delete_from_redis)} meetings")
+                    try:
+                        await publish_finalized_segments(redis_c, db, rows_to_store)
+                    except Exception as pub_err:
+                        logger.error(f"Failed to publish finalized segments: {pub_err}")
+
+            # Stored and filtered-out segments are both done with
+            async with redis_c.pipeline(transaction=False) as pipe:
+                for meeting_id, start_times in segments_to_delete_from_redis.items():
+                    pipe.hdel(f"meeting:{meeting_id}:segments", *start_times)
+                    pipe.zrem(f"meeting:{meeting_id}:segment_updates", *start_times)
+                    # Cached assembled transcripts (api.transcript_cache) re-read the hash and the new rows
+                    version_key = f"meeting:{meeting_id}:transcript_version"
+                    pipe.hincrby(version_key, "version", 1)
+                    pipe.hincrby(version_key, "db_version", 1)
+                    pipe.expire(version_key, REDIS_SEGMENT_TTL)
+                await pipe.execute()
+            logger.debug(f"Deleted {sum(len(s) for s in segments_to_delete_from_redis.values())} processed segments from {len(segments_to_delete_from_redis)} Redis Hashes")
+
         except asyncio.CancelledError:
             logger.info("Redis-to-PostgreSQL processor task cancelled")
             break
         except redis.exceptions.ConnectionError as e:
              logger.error(f"Redis connection error in Redis-to-PG task: {e}. Retrying after delay...", exc_info=True)
-             await asyncio.sleep(5) 
+             await asyncio.sleep(5)
         except Exception as e:
             logger.error(f"Unhandled error in Redis-to-PostgreSQL processor: {e}", exc_info=True)
-            await asyncio.sleep(BACKGROUND_TASK_INTERVAL) 
\ No newline at end of file
+            await asyncio.sleep(BACKGROUND_TASK_INTERVAL)
@@ -0,0 +1,135 @@
+"""Meeting ownership for the background writer when several collector replicas run.
+
+Every replica heartbeats its consumer name into a Redis sorted set (scored by the
+last heartbeat); replicas that stop heartbeating drop out after REPLICA_TTL_S. The
+live replicas form a consistent-hash ring, and a replica only flushes the meetings
+that hash to it, so adding or removing a replica only moves ~1/N of the meetings.
+
+Replicas see membership changes at slightly different times, so ownership is
+additionally confirmed through a short per-meeting lease in Redis; a meeting is never
+flushed by two replicas at once during a hand-over.
+"""
+import asyncio
+import bisect
+import hashlib
+import logging
+import time
+from typing import Dict, Iterable, List, Optional
+
+import redis.asyncio as aioredis
+
+from config import (
+    CONSUMER_NAME,
+    HASH_RING_VNODES,
+    REPLICA_HEARTBEAT_INTERVAL_S,
+    REPLICA_SET_KEY,
+    REPLICA_TTL_S,
+    WRITER_LEASE_KEY_PREFIX,
+    WRITER_LEASE_TTL_MS,
+)
+from streaming.compact_format import advertise_formats, withdraw_formats
+
+logger = logging.getLogger(__name__)
+
+
+def _hash(value: str) -> int:
+    return int.from_bytes(hashlib.md5(value.encode("utf-8")).digest()[:8], "big")
+
+
+class HashRing:
+    """Consistent-hash ring with virtual nodes."""
+
+    def __init__(self, nodes: Iterable[str], vnodes: int = HASH_RING_VNODES):
+        self.nodes = sorted(set(nodes))
+        points = sorted((_hash(f"{node}#{i}"), node) for node in self.nodes for i in range(vnodes))
+        self._hashes = [point for point, _ in points]
+        self._owners = [node for _, node in points]
+
+    def owner(self, key: str) -> Optional[str]:
+        if not self._hashes:
+            return None
+        index = bisect.bisect(self._hashes, _hash(key)) % len(self._hashes)
+        return self._owners[index]
+
+
+class MeetingOwnership:
+    def __init__(self, replica_name: str = CONSUMER_NAME):
+        self.replica_name = replica_name
+        # Until the first heartbeat this replica owns everything (single-replica behaviour)
+        self.ring = HashRing([replica_name])
+
+    async def heartbeat(self, redis_c: aioredis.Redis) -> None:
+        """Refresh this replica's membership and rebuild the ring from the live replicas."""
+        now = time.time()
+        async with redis_c.pipeline(transaction=True) as pipe:
+            pipe.zadd(REPLICA_SET_KEY, {self.replica_name: now})
+            pipe.zremrangebyscore(REPLICA_SET_KEY, "-inf", now - REPLICA_TTL_S)
+            pipe.zrange(REPLICA_SET_KEY, 0, -1)
+            _, _, members = await pipe.execute()
+        live = set(members) | {self.replica_name}
+        if sorted(live) != self.ring.nodes:
+            logger.info(f"Collector replicas changed: {sorted(live)} (this replica: {self.replica_name})")
+            self.ring = HashRing(live)
+
+    async def leave(self, redis_c: aioredis.Redis) -> None:
+        """Remove this replica from the ring so its meetings are handed over immediately."""
+        await redis_c.zrem(REPLICA_SET_KEY, self.replica_name)
+
+    def owns(self, meeting_id: str) -> bool:
+        return self.ring.owner(str(meeting_id)) == self.replica_name
+
+    async def claim(self, redis_c: aioredis.Redis, meeting_ids: List[str]) -> List[str]:
+        """Return the meetings this replica owns on the ring and holds the writer lease for.
+
+        Leases are taken (SET NX) or renewed in one pipeline round trip. A lease still held by
+        a previous owner makes the meeting wait until that lease expires.
+        """
+        candidates = [meeting_id for meeting_id in meeting_ids if self.owns(meeting_id)]
+        if not candidates:
+            return []
+        async with redis_c.pipeline(transaction=False) as pipe:
+            for meeting_id in candidates:
+                lease_key = f"{WRITER_LEASE_KEY_PREFIX}:{meeting_id}"
+                pipe.set(lease_key, self.replica_name, nx=True, px=WRITER_LEASE_TTL_MS)
+                pipe.get(lease_key)
+            results = await pipe.execute()
+        claimed = [
+            meeting_id for meeting_id, holder in zip(candidates, results[1::2])
+            if holder == self.replica_name
+        ]
+        renew = [
+            meeting_id for meeting_id, acquired, holder in zip(candidates, results[0::2], results[1::2])
+            if not acquired and holder == self.replica_name
+        ]
+        if renew:
+            async with redis_c.pipeline(transaction=False) as pipe:
+                for meeting_id in renew:
+                    pipe.pexpire(f"{WRITER_LEASE_KEY_PREFIX}:{meeting_id}", WRITER_LEASE_TTL_MS)
+                await pipe.execute()
+        return claimed
+
+    def get_metrics(self) -> Dict[str, object]:
+        return {"replica_name": self.replica_name, "live_replicas": len(self.ring.nodes)}
+
+
+MEETING_OWNERSHIP = MeetingOwnership()
+
+
+async def maintain_replica_membership(redis_c: aioredis.Redis) -> None:
+    """Background task: heartbeat this replica (and its stream formats) until cancelled, then leave the ring."""
+    logger.info(f"Replica membership task started for '{CONSUMER_NAME}' (heartbeat {REPLICA_HEARTBEAT_INTERVAL_S}s, ttl {REPLICA_TTL_S}s)")
+    try:
+        while True:
+            try:
+                await MEETING_OWNERSHIP.heartbeat(redis_c)
+                await advertise_formats(redis_c, MEETING_OWNERSHIP.replica_name, MEETING_OWNERSHIP.ring.nodes)
+            except Exception as e:
+                logger.error(f"Replica heartbeat failed: {e}")
+            await asyncio.sleep(REPLICA_HEARTBEAT_INTERVAL_S)
+    except asyncio.CancelledError:
+        try:
+            await MEETING_OWNERSHIP.leave(redis_c)
+            await withdraw_formats(redis_c, MEETING_OWNERSHIP.replica_name)
+        except Exception as e:
+            logger.warning(f"Failed to leave replica set on shutdown: {e}")
+        raise
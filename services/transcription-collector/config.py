@@ -1,13 +1,20 @@
 import os
+import socket
 
 # Configuration for Redis Stream consumer
 REDIS_STREAM_NAME = os.environ.get("REDIS_STREAM_NAME", "transcription_segments")
 REDIS_CONSUMER_GROUP = os.environ.get("REDIS_CONSUMER_GROUP", "collector_group")
 REDIS_STREAM_READ_COUNT = int(os.environ.get("REDIS_STREAM_READ_COUNT", "10"))
+# Upper bound for the adaptive read count: full reads double it (backlog), short reads halve it
+REDIS_STREAM_READ_COUNT_MAX = int(os.environ.get("REDIS_STREAM_READ_COUNT_MAX", "500"))
+# Number of sessions whose messages are processed concurrently within one read batch
+REDIS_STREAM_MAX_CONCURRENCY = int(os.environ.get("REDIS_STREAM_MAX_CONCURRENCY", "16"))
 REDIS_STREAM_BLOCK_MS = int(os.environ.get("REDIS_STREAM_BLOCK_MS", "2000"))  # 2 seconds
-# Use a fixed consumer name, potentially add hostname later if scaling replicas
-CONSUMER_NAME = os.environ.get("POD_NAME", "collector-main")  # Get POD_NAME from env if avail (k8s), else fixed
-PENDING_MSG_TIMEOUT_MS = 60000  # Milliseconds: Timeout after which pending messages are considered stale (e.g., 1 minute)
+# Unique per replica: POD_NAME (k8s) if set, else the container hostname
+CONSUMER_NAME = os.environ.get("POD_NAME") or f"collector-{socket.gethostname()}"
+PENDING_MSG_TIMEOUT_MS = int(os.environ.get("PENDING_MSG_TIMEOUT_MS", "60000"))  # Milliseconds: Timeout after which pending messages are considered stale (e.g., 1 minute)
+# How often each replica reclaims stale pending messages of dead consumers (XAUTOCLAIM)
+STALE_CLAIM_INTERVAL = int(os.environ.get("STALE_CLAIM_INTERVAL", "30"))  # seconds
 
 # Configuration for Speaker Events Stream (NEW)
 REDIS_SPEAKER_EVENTS_STREAM_NAME = os.environ.get("REDIS_SPEAKER_EVENTS_STREAM_NAME", "speaker_events_relative")
@@ -15,11 +22,42 @@ REDIS_SPEAKER_EVENTS_CONSUMER_GROUP = os.environ.get("REDIS_SPEAKER_EVENTS_CONSU
 REDIS_SPEAKER_EVENT_KEY_PREFIX = os.environ.get("REDIS_SPEAKER_EVENT_KEY_PREFIX", "speaker_events") # For sorted sets
 REDIS_SPEAKER_EVENT_TTL = int(os.environ.get("REDIS_SPEAKER_EVENT_TTL", "86400")) # 24 hours default TTL for speaker events sorted sets
 
+# Session headers (token, platform, meeting id) of sessions using the compact msgpack stream format
+REDIS_SESSION_HEADER_KEY_PREFIX = os.environ.get("REDIS_SESSION_HEADER_KEY_PREFIX", "tc:session_header")
+REDIS_SESSION_HEADER_TTL = int(os.environ.get("REDIS_SESSION_HEADER_TTL", "86400"))
+COMPACT_HEADER_WAIT_S = int(os.environ.get("COMPACT_HEADER_WAIT_S", "600"))  # Compact entries stay pending this long for their session header
+
+# In-process cache of user/meeting/session lookups for stream messages
+SESSION_CACHE_TTL = int(os.environ.get("SESSION_CACHE_TTL", "300"))  # seconds
+SESSION_CACHE_MAX_ENTRIES = int(os.environ.get("SESSION_CACHE_MAX_ENTRIES", "10000"))
+REDIS_SESSION_VERSION_KEY_PREFIX = os.environ.get("REDIS_SESSION_VERSION_KEY_PREFIX", "tc:session_version")  # Bumped on session_start, shared by all replicas
+
+# In-process cache of assembled transcripts served by the transcript endpoints (see api.transcript_cache)
+TRANSCRIPT_CACHE_MAX_MEETINGS = int(os.environ.get("TRANSCRIPT_CACHE_MAX_MEETINGS", "500"))
+TRANSCRIPT_META_CACHE_TTL = int(os.environ.get("TRANSCRIPT_META_CACHE_TTL", "5"))  # seconds an authenticated meeting lookup is reused
+TRANSCRIPT_REORDER_WINDOW_S = float(os.environ.get("TRANSCRIPT_REORDER_WINDOW_S", "5"))  # updated_at skew tolerated between replicas
+
+# Streaming transcript export: rows fetched per server-side cursor batch, bytes per response chunk
+TRANSCRIPT_EXPORT_BATCH_SIZE = int(os.environ.get("TRANSCRIPT_EXPORT_BATCH_SIZE", "500"))
+TRANSCRIPT_EXPORT_CHUNK_BYTES = int(os.environ.get("TRANSCRIPT_EXPORT_CHUNK_BYTES", "65536"))
+
+# Full-text transcript search: largest page size and longest query accepted
+TRANSCRIPT_SEARCH_MAX_LIMIT = int(os.environ.get("TRANSCRIPT_SEARCH_MAX_LIMIT", "100"))
+TRANSCRIPT_SEARCH_MAX_QUERY_LENGTH = int(os.environ.get("TRANSCRIPT_SEARCH_MAX_QUERY_LENGTH", "256"))
+
 # Configuration for background processing
 BACKGROUND_TASK_INTERVAL = int(os.environ.get("BACKGROUND_TASK_INTERVAL", "10"))  # seconds
 IMMUTABILITY_THRESHOLD = int(os.environ.get("IMMUTABILITY_THRESHOLD", "30"))  # seconds
 REDIS_SEGMENT_TTL = int(os.environ.get("REDIS_SEGMENT_TTL", "3600"))  # 1 hour default TTL for Redis segments
 
+# Replica membership and meeting ownership for the background writer
+REPLICA_SET_KEY = os.environ.get("REPLICA_SET_KEY", "tc:collector:replicas")
+REPLICA_HEARTBEAT_INTERVAL_S = int(os.environ.get("REPLICA_HEARTBEAT_INTERVAL_S", "5"))
+REPLICA_TTL_S = int(os.environ.get("REPLICA_TTL_S", "20"))  # Replicas missing heartbeats this long leave the ring
+HASH_RING_VNODES = int(os.environ.get("HASH_RING_VNODES", "64"))
+WRITER_LEASE_KEY_PREFIX = os.environ.get("WRITER_LEASE_KEY_PREFIX", "tc:writer_lease")
+WRITER_LEASE_TTL_MS = int(os.environ.get("WRITER_LEASE_TTL_MS", str(BACKGROUND_TASK_INTERVAL * 3 * 1000)))
+
 # Logging configuration
 LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO").upper()
 
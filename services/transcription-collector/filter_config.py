@@ -16,6 +16,10 @@ MIN_CHARACTER_LENGTH = 3
 # Minimum number of real words (3+ chars) for a segment to be considered informative
 MIN_REAL_WORDS = 1
 
+# Look-back window (seconds) of the per-meeting deduplication cache: segments starting more
+# than this long before the latest kept segment are no longer compared against
+DEDUP_WINDOW_SECONDS = 600
+
 # Define your own custom filter functions here
 # Each function should take text as input and return True to keep or False to filter out
 
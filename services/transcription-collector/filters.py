@@ -1,8 +1,9 @@
 import re
+import bisect
 import logging
 import importlib
 import os
-from typing import Dict, List
+from typing import Dict, List, Tuple
 
 logger = logging.getLogger("transcription_collector.filters")
 
@@ -22,6 +23,48 @@ BASE_NON_INFORMATIVE_PATTERNS = [
     r"^<<$",   # Just '<<' characters
 ]
 
+# Cached segments starting more than this many seconds before the latest one are dropped
+# from the per-meeting deduplication index
+DEFAULT_DEDUP_WINDOW_SECONDS = 600.0
+
+class MeetingSegmentIndex:
+    """Kept segments of one meeting ordered by start time, bounded to a look-back window.
+
+    Only segments that can overlap or contain a new segment [start, end] are visited:
+    those starting in [start - longest cached duration, end], found by bisection.
+    """
+
+    def __init__(self, window_seconds: float = DEFAULT_DEDUP_WINDOW_SECONDS):
+        self.window_seconds = window_seconds
+        self.starts: List[float] = []
+        self.segments: List[Tuple[float, float, str]] = []  # (start, end, stripped text), parallel to starts
+        self.max_duration = 0.0
+
+    def __len__(self) -> int:
+        return len(self.segments)
+
+    def candidates(self, start_time: float, end_time: float) -> range:
+        """Index range of cached segments that may overlap [start_time, end_time]."""
+        lo = bisect.bisect_left(self.starts, start_time - self.max_duration)
+        hi = bisect.bisect_right(self.starts, end_time)
+        return range(lo, hi)
+
+    def remove(self, indices: List[int]) -> None:
+        for i in sorted(indices, reverse=True):
+            del self.starts[i]
+            del self.segments[i]
+
+    def add(self, text: str, start_time: float, end_time: float) -> None:
+        i = bisect.bisect_right(self.starts, start_time)
+        self.starts.insert(i, start_time)
+        self.segments.insert(i, (start_time, end_time, text))
+        self.max_duration = max(self.max_duration, end_time - start_time)
+        # Evict segments that fell out of the look-back window
+        cutoff = bisect.bisect_left(self.starts, self.starts[-1] - self.window_seconds)
+        if cutoff:
+            del self.starts[:cutoff]
+            del self.segments[:cutoff]
+
 class TranscriptionFilter:
     """Manages transcription filtering logic"""
     
@@ -31,10 +74,12 @@ class TranscriptionFilter:
         self.min_character_length = 3
         self.min_real_words = 1
         self.stopwords = {}
-        self.processed_segments_cache_by_meeting: Dict[int, List[Dict[str, any]]] = {}
+        self.dedup_window_seconds = DEFAULT_DEDUP_WINDOW_SECONDS
+        self.processed_segments_cache_by_meeting: Dict[int, MeetingSegmentIndex] = {}
         
         # Load configuration
         self.load_config()
+        self.compile_patterns()
     
     def load_config(self):
         """Load filter configuration from filter_config.py"""
@@ -64,8 +109,13 @@ class TranscriptionFilter:
             
             # Add stopwords
             if hasattr(config, 'STOPWORDS'):
-                self.stopwords = config.STOPWORDS
+                self.stopwords = {lang: {w.lower() for w in words} for lang, words in config.STOPWORDS.items()}
                 logger.info(f"Loaded stopwords for {len(config.STOPWORDS)} languages")
+
+            # Look-back window of the deduplication index
+            if hasattr(config, 'DEDUP_WINDOW_SECONDS'):
+                self.dedup_window_seconds = float(config.DEDUP_WINDOW_SECONDS)
+                logger.info(f"Set deduplication window to {self.dedup_window_seconds}s")
                 
             logger.info("Successfully loaded filter configuration")
         except ImportError:
@@ -73,6 +123,29 @@ class TranscriptionFilter:
         except Exception as e:
             logger.error(f"Error loading filter configuration: {e}")
     
+    def compile_patterns(self):
+        """Compile self.patterns (call again after changing them).
+
+        Patterns are matched through a single alternation, except those with inline global
+        flags such as "(?i)^um$": those flags are only valid at the start of a whole
+        expression (and would apply to every alternative), so they are matched on their own.
+        """
+        combined = []
+        self.flagged_patterns = []
+        for pattern in self.patterns:
+            compiled = re.compile(pattern)
+            if compiled.flags & ~re.UNICODE:
+                self.flagged_patterns.append(compiled)
+            else:
+                combined.append(f"(?:{pattern})")
+        self.compiled_patterns = re.compile("|".join(combined)) if combined else None
+
+    def matches_pattern(self, text: str) -> bool:
+        """True if the text matches one of the non-informative patterns."""
+        if self.compiled_patterns is not None and self.compiled_patterns.match(text):
+            return True
+        return any(pattern.match(text) for pattern in self.flagged_patterns)
+
     def add_custom_filter(self, filter_function):
         """
         Add a custom filter function
@@ -118,10 +191,9 @@ class TranscriptionFilter:
             return False
         
         # Check against patterns
-        for pattern in self.patterns:
-            if re.match(pattern, text):
-                logger.debug(f"Filtering out text matching pattern {pattern}: '{original_text_for_logging}'")
-                return False
+        if self.matches_pattern(text):
+            logger.debug(f"Filtering out text matching a non-informative pattern: '{original_text_for_logging}'")
+            return False
         
         # Count actual words (at least 3 characters) - exclude stopwords
         real_words = [
@@ -137,15 +209,16 @@ class TranscriptionFilter:
             return False
 
         # Time-based deduplication logic
-        current_meeting_cache = self.processed_segments_cache_by_meeting.setdefault(meeting_id, [])
+        current_meeting_cache = self.processed_segments_cache_by_meeting.get(meeting_id)
+        if current_meeting_cache is None:
+            current_meeting_cache = MeetingSegmentIndex(self.dedup_window_seconds)
+            self.processed_segments_cache_by_meeting[meeting_id] = current_meeting_cache
         
         indices_to_remove_from_cache = []
         should_filter_current = False
 
-        for i, cached_segment in enumerate(current_meeting_cache):
-            cached_text = cached_segment['text'] # Ensure we are using stripped text from cache
-            cached_start = cached_segment['start']
-            cached_end = cached_segment['end']
+        for i in current_meeting_cache.candidates(start_time, end_time):
+            cached_start, cached_end, cached_text = current_meeting_cache.segments[i] # Stripped text from cache
 
             # Condition 1: Current segment's text is identical to a cached segment's text
             if text == cached_text:
@@ -186,8 +259,7 @@ class TranscriptionFilter:
 
         # Remove marked cached segments (those that were sub-segments of the current one and met removal criteria)
         if indices_to_remove_from_cache:
-            for i_val in sorted(indices_to_remove_from_cache, reverse=True):
-                del current_meeting_cache[i_val]
+            current_meeting_cache.remove(indices_to_remove_from_cache)
             logger.debug(f"Removed {len(indices_to_remove_from_cache)} sub-segments from cache for MeetingID {meeting_id} after processing current segment '{text}'.")
 
         # Apply any custom filters
@@ -200,5 +272,5 @@ class TranscriptionFilter:
                 logger.error(f"Error in custom filter {custom_filter.__name__} for MeetingID {meeting_id}: {e}")
         
         # If all filters pass, add to cache for this meeting and return True
-        current_meeting_cache.append({'text': text, 'start': start_time, 'end': end_time}) # Add stripped text to cache
+        current_meeting_cache.add(text, start_time, end_time) # Add stripped text to cache
         return True 
\ No newline at end of file
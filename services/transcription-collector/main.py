@@ -27,8 +27,10 @@ from config import (
     REDIS_SPEAKER_EVENTS_CONSUMER_GROUP
 )
 from api.endpoints import router as api_router
-from streaming.consumer import claim_stale_messages, consume_redis_stream, consume_speaker_events_stream
+from streaming.consumer import reclaim_stale_messages_periodically, consume_redis_stream, consume_speaker_events_stream
+from streaming.compact_format import advertise_formats
 from background.db_writer import process_redis_to_postgres
+from background.ownership import MEETING_OWNERSHIP, maintain_replica_membership
 
 app = FastAPI(
     title="Transcription Collector",
@@ -45,6 +47,8 @@ logger = logging.getLogger("transcription_collector")
 
 # Redis connection
 redis_client: Optional[aioredis.Redis] = None
+# Binary-safe connection for reading the transcription stream (compact entries are msgpack)
+stream_redis_client: Optional[aioredis.Redis] = None
 
 # Initialize transcription filter
 transcription_filter = TranscriptionFilter()
@@ -53,10 +57,12 @@ transcription_filter = TranscriptionFilter()
 redis_to_pg_task = None
 stream_consumer_task = None
 speaker_stream_consumer_task = None
+stale_claim_task = None
+replica_membership_task = None
 
 @app.on_event("startup")
 async def startup():
-    global redis_client, redis_to_pg_task, stream_consumer_task, speaker_stream_consumer_task, transcription_filter
+    global redis_client, stream_redis_client, redis_to_pg_task, stream_consumer_task, speaker_stream_consumer_task, stale_claim_task, replica_membership_task, transcription_filter
     
     logger.info(f"Connecting to Redis at {REDIS_HOST}:{REDIS_PORT}")
     temp_redis_client = aioredis.Redis(
@@ -68,6 +74,12 @@ async def startup():
     await temp_redis_client.ping()
     redis_client = temp_redis_client
     app.state.redis_client = redis_client
+    stream_redis_client = aioredis.Redis(
+        host=REDIS_HOST,
+        port=REDIS_PORT,
+        db=0,
+        decode_responses=False
+    )
     logger.info("Redis connection successful.")
     
     try:
@@ -104,13 +116,20 @@ async def startup():
             return
     
     logger.info("Database initialized.")
-    
-    await claim_stale_messages(redis_client)
+
+    # Join the replica ring before the writer starts so meetings are split from the first pass
+    await MEETING_OWNERSHIP.heartbeat(redis_client)
+    # Formats are advertised as the intersection over the live replicas, so this one must be in the ring
+    await advertise_formats(redis_client, MEETING_OWNERSHIP.replica_name, MEETING_OWNERSHIP.ring.nodes)
+    replica_membership_task = asyncio.create_task(maintain_replica_membership(redis_client))
+    logger.info(f"Replica '{CONSUMER_NAME}' joined the collector ring ({MEETING_OWNERSHIP.get_metrics()['live_replicas']} live)")
+
+    stale_claim_task = asyncio.create_task(reclaim_stale_messages_periodically(redis_client, stream_redis_client))
     
     redis_to_pg_task = asyncio.create_task(process_redis_to_postgres(redis_client, transcription_filter))
     logger.info(f"Redis-to-PostgreSQL task started (Interval: {BACKGROUND_TASK_INTERVAL}s, Threshold: {IMMUTABILITY_THRESHOLD}s)")
     
-    stream_consumer_task = asyncio.create_task(consume_redis_stream(redis_client))
+    stream_consumer_task = asyncio.create_task(consume_redis_stream(redis_client, stream_redis_client))
     logger.info(f"Redis Stream consumer task started (Stream: {REDIS_STREAM_NAME}, Group: {REDIS_CONSUMER_GROUP}, Consumer: {CONSUMER_NAME})")
 
     # Start speaker events consumer task
@@ -121,7 +140,7 @@ async def startup():
 async def shutdown():
     logger.info("Application shutting down...")
     # Cancel background tasks
-    tasks_to_cancel = [redis_to_pg_task, stream_consumer_task, speaker_stream_consumer_task]
+    tasks_to_cancel = [redis_to_pg_task, stream_consumer_task, speaker_stream_consumer_task, stale_claim_task, replica_membership_task]
     for i, task in enumerate(tasks_to_cancel):
         if task and not task.done():
             task.cancel()
@@ -133,6 +152,8 @@ async def shutdown():
                 logger.error(f"Error during background task {i+1} cancellation: {e}", exc_info=True)
     
     # Close Redis connection
+    if stream_redis_client:
+        await stream_redis_client.close()
     if redis_client:
         await redis_client.close()
         logger.info("Redis connection closed.")
@@ -0,0 +1,196 @@
+"""Per-session speaker timeline index used to map transcription segments to speakers.
+
+Speaker events of a session live in the sorted set `{REDIS_SPEAKER_EVENT_KEY_PREFIX}:{uid}`
+(scored by relative_client_timestamp_ms). A SpeakerTimeline mirrors that set in memory:
+each event JSON is parsed once, SPEAKER_START/SPEAKER_END events are paired into speaking
+intervals per participant, and the intervals are kept as NumPy arrays sorted by start.
+A whole batch of segments is then mapped with bisection (searchsorted) and vectorised
+overlap arithmetic.
+
+The index is refreshed incrementally: one pipelined read fetches the set's size and the
+events scored after the last one seen (minus REORDER_WINDOW_MS, for events that arrive
+slightly out of order). If the size still disagrees with what the index holds (a late
+event, or expired members) the session is reloaded in full.
+"""
+import bisect
+import json
+import logging
+import math
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import redis.asyncio as aioredis
+
+logger = logging.getLogger(__name__)
+
+# Speaker mapping statuses (re-exported by mapping.speaker_mapper)
+STATUS_UNKNOWN = "UNKNOWN"
+STATUS_MAPPED = "MAPPED"
+STATUS_MULTIPLE = "MULTIPLE_CONCURRENT_SPEAKERS"
+STATUS_NO_SPEAKER_EVENTS = "NO_SPEAKER_EVENTS"
+STATUS_ERROR = "ERROR_IN_MAPPING"
+
+REORDER_WINDOW_MS = 5000
+TIMELINE_CACHE_SIZE = 2000
+
+_EMPTY = np.empty(0)
+
+
+class SpeakerTimeline:
+    def __init__(self):
+        self.members: set = set()
+        self.max_score = -math.inf
+        # participant key -> chronologically sorted [(timestamp_ms, is_start, participant_name, participant_id_meet)]
+        self._events: Dict[str, List[Tuple[float, bool, str, Optional[str]]]] = {}
+        self._dirty = False
+        self._build_index()
+
+    def __len__(self) -> int:
+        return len(self.members)
+
+    def add_events(self, raw_events: Sequence[Tuple[Any, float]]) -> None:
+        """Merge (event JSON, timestamp_ms) pairs; members already in the index are skipped."""
+        for event_json, timestamp_ms in raw_events:
+            if isinstance(event_json, bytes):
+                event_json = event_json.decode('utf-8')
+            if event_json in self.members:
+                continue
+            self.members.add(event_json)
+            timestamp_ms = float(timestamp_ms)
+            self.max_score = max(self.max_score, timestamp_ms)
+            try:
+                event = json.loads(event_json)
+            except json.JSONDecodeError:
+                logger.warning(f"Failed to parse speaker event JSON: {event_json}")
+                continue
+            participant_key = event.get("participant_id_meet") or event.get("participant_name")
+            event_type = event.get("event_type")
+            if not participant_key or event_type not in ("SPEAKER_START", "SPEAKER_END"):
+                continue
+            bisect.insort(
+                self._events.setdefault(participant_key, []),
+                (timestamp_ms, event_type == "SPEAKER_START", event.get("participant_name"), event.get("participant_id_meet")),
+            )
+            self._dirty = True
+
+    def _build_index(self) -> None:
+        """Pair START/END events into intervals and lay them out as arrays sorted by start."""
+        names: List[Tuple[str, Optional[str]]] = []
+        starts: List[float] = []
+        ends: List[float] = []
+        owners: List[int] = []
+        for events in self._events.values():
+            open_start = None
+            for timestamp_ms, is_start, name, participant_id in events:
+                if is_start:
+                    if open_start is None:  # A repeated START while speaking continues the interval
+                        open_start = timestamp_ms
+                        names.append((name, participant_id))
+                elif open_start is not None:
+                    starts.append(open_start)
+                    ends.append(timestamp_ms)
+                    owners.append(len(names) - 1)
+                    open_start = None
+            if open_start is not None:  # Still speaking: open-ended interval
+                starts.append(open_start)
+                ends.append(math.inf)
+                owners.append(len(names) - 1)
+
+        order = np.argsort(starts, kind="stable")
+        self._starts = np.asarray(starts, dtype=float)[order] if starts else _EMPTY
+        self._ends = np.asarray(ends, dtype=float)[order] if ends else _EMPTY
+        self._owners = np.asarray(owners, dtype=np.intp)[order] if owners else np.empty(0, dtype=np.intp)
+        # Speakers are identified by name (several START events may carry the same name)
+        self._speaker_names = sorted({name for name, _ in names if name})
+        name_index = {name: i for i, name in enumerate(self._speaker_names)}
+        self._interval_speaker = np.asarray(
+            [name_index.get(names[owner][0], -1) for owner in self._owners], dtype=np.intp
+        ) if len(self._owners) else np.empty(0, dtype=np.intp)
+        self._speaker_ids = {name: participant_id for name, participant_id in names if name}
+        closed = np.isfinite(self._ends)
+        self._max_closed_len = float((self._ends[closed] - self._starts[closed]).max()) if closed.any() else 0.0
+        self._open = np.flatnonzero(~closed)
+        self._dirty = False
+
+    def map_segments(self, segments_ms: Sequence[Tuple[float, float]]) -> List[Dict[str, Any]]:
+        """Map (start_ms, end_ms) segments to the speaker with the longest overlap."""
+        if not self.members:
+            return [{"speaker_name": None, "participant_id_meet": None, "status": STATUS_NO_SPEAKER_EVENTS} for _ in segments_ms]
+        if self._dirty:
+            self._build_index()
+        if not segments_ms:
+            return []
+
+        seg = np.asarray(segments_ms, dtype=float).reshape(-1, 2)
+        seg_starts, seg_ends = seg[:, 0:1], seg[:, 1:2]
+
+        # Only intervals starting within [first segment start - longest closed interval, last segment end]
+        # can overlap a segment of the batch, plus the open-ended ones.
+        lo = np.searchsorted(self._starts, seg_starts.min() - self._max_closed_len, side="left")
+        hi = np.searchsorted(self._starts, seg_ends.max(), side="right")
+        candidates = np.arange(lo, hi)
+        if len(self._open):
+            candidates = np.union1d(candidates, self._open[self._open < hi])
+
+        results = []
+        if len(candidates) and self._speaker_names:
+            overlap = np.minimum(self._ends[candidates], seg_ends) - np.maximum(self._starts[candidates], seg_starts)
+            np.clip(overlap, 0.0, None, out=overlap)
+            # Sum overlaps per speaker: (segments x intervals) @ (intervals x speakers)
+            speaker_of = self._interval_speaker[candidates]
+            known = speaker_of >= 0
+            onehot = np.zeros((len(candidates), len(self._speaker_names)))
+            onehot[np.flatnonzero(known), speaker_of[known]] = 1.0
+            per_speaker = overlap @ onehot
+            active_counts = (per_speaker > 0).sum(axis=1)
+            # Longest overlap wins; on a tie, the speaker who started speaking first
+            overlapping_starts = np.where(overlap > 0, self._starts[candidates], math.inf)
+            first_start = np.full(per_speaker.shape, math.inf)
+            for speaker_index in np.unique(speaker_of[known]):
+                first_start[:, speaker_index] = overlapping_starts[:, speaker_of == speaker_index].min(axis=1)
+            longest = per_speaker == per_speaker.max(axis=1, keepdims=True)
+            best = np.where(longest, first_start, math.inf).argmin(axis=1)
+        else:
+            active_counts = np.zeros(len(seg), dtype=int)
+            best = active_counts
+
+        for count, best_index in zip(active_counts.tolist(), best.tolist()):
+            if count == 0:
+                results.append({"speaker_name": None, "participant_id_meet": None, "status": STATUS_UNKNOWN})
+                continue
+            name = self._speaker_names[best_index]
+            results.append({
+                "speaker_name": name,
+                "participant_id_meet": self._speaker_ids.get(name),
+                "status": STATUS_MAPPED if count == 1 else STATUS_MULTIPLE,
+            })
+        return results
+
+
+_timelines: "OrderedDict[str, SpeakerTimeline]" = OrderedDict()
+
+
+async def get_session_timeline(redis_c: aioredis.Redis, speaker_event_key: str) -> SpeakerTimeline:
+    """Return the up-to-date timeline of a speaker events key, refreshing it with one pipelined read."""
+    timeline = _timelines.get(speaker_event_key)
+    if timeline is None:
+        timeline = SpeakerTimeline()
+        _timelines[speaker_event_key] = timeline
+        while len(_timelines) > TIMELINE_CACHE_SIZE:
+            _timelines.popitem(last=False)
+    _timelines.move_to_end(speaker_event_key)
+
+    since = timeline.max_score - REORDER_WINDOW_MS if timeline.members else "-inf"
+    async with redis_c.pipeline(transaction=False) as pipe:
+        pipe.zcard(speaker_event_key)
+        pipe.zrangebyscore(speaker_event_key, min=since, max="+inf", withscores=True)
+        total, new_events = await pipe.execute()
+
+    timeline.add_events(new_events)
+    if total != len(timeline):
+        # Events arrived too late for the incremental window or expired: rebuild from scratch
+        timeline = SpeakerTimeline()
+        timeline.add_events(await redis_c.zrangebyscore(speaker_event_key, min="-inf", max="+inf", withscores=True))
+        _timelines[speaker_event_key] = timeline
+    return timeline
@@ -0,0 +1,70 @@
+"""
+Benchmark: TranscriptionFilter.filter_segment over a synthetic multi-hour meeting.
+
+Generates one segment every ~4s for the given duration, the way the background writer
+sees them: mostly new speech, plus repeated finals, expansions of earlier segments and
+shorter re-transcriptions of the same audio, all fed in start-time order. Reports the
+total and per-segment filtering time and how many segments were kept.
+
+Usage:
+    python scripts/bench_filter.py [--hours 4] [--seed 1]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from filters import TranscriptionFilter  # noqa: E402
+
+WORDS = (
+    "rollout region monday budget review customer latency pipeline release schedule "
+    "migration database dashboard incident owner quarter planning roadmap feature metrics"
+).split()
+
+
+def make_segments(hours, rng):
+    segments = []
+    t = 0.0
+    while t < hours * 3600:
+        duration = rng.uniform(1.5, 6.0)
+        text = " ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 12)))
+        segments.append((text, t, t + duration))
+        roll = rng.random()
+        if roll < 0.15:  # The same final published again
+            segments.append((text, t, t + duration))
+        elif roll < 0.25:  # Expanded later with more audio
+            segments.append((text, t, t + duration + 1.0))
+        elif roll < 0.35:  # Shorter re-transcription of part of the same audio
+            segments.append((" ".join(text.split()[:2]), t + 0.2, t + duration - 0.2))
+        t += duration + rng.uniform(0.0, 1.5)
+    segments.sort(key=lambda s: s[1])
+    return segments
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hours", type=float, default=4.0)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    segments = make_segments(args.hours, random.Random(args.seed))
+    transcription_filter = TranscriptionFilter()
+
+    t0 = time.perf_counter()
+    kept = sum(
+        transcription_filter.filter_segment(text, start_time=start, end_time=end, meeting_id=1, language="en")
+        for text, start, end in segments
+    )
+    elapsed = time.perf_counter() - t0
+    print(
+        f"{len(segments)} segments ({args.hours:g}h): kept {kept}, "
+        f"{elapsed:.2f}s total, {elapsed / len(segments) * 1e6:.1f} us/segment"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+Load harness: replay a recorded transcription stream into a running collector and
+measure how many messages per second it consumes.
+
+Record entries from a live stream into a JSONL file (compact msgpack values are
+base64-encoded):
+
+    python scripts/replay_stream_load.py record --out stream.jsonl [--count 50000]
+
+Replay them into the collector's stream, optionally fanned out to several copies of
+each session (uids are rewritten so the copies are processed as distinct sessions),
+and wait until the collector's consumer group has read and acknowledged everything
+(uses the group's `lag` from XINFO GROUPS, Redis >= 7):
+
+    python scripts/replay_stream_load.py replay --file stream.jsonl [--copies 10]
+
+The collector must be running against the same Redis (REDIS_HOST/REDIS_PORT) and the
+recorded sessions' tokens and meetings must exist in its database, otherwise the
+messages are acknowledged without being stored and the rate is overstated.
+"""
+
+import argparse
+import base64
+import json
+import os
+import sys
+import time
+
+import redis
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from config import REDIS_CONSUMER_GROUP, REDIS_HOST, REDIS_PORT, REDIS_STREAM_NAME  # noqa: E402
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+COMPACT_FIELD = "mp"
+
+
+def encode_fields(fields):
+    out = {}
+    for key, value in fields.items():
+        key = key.decode("utf-8")
+        if key == COMPACT_FIELD:
+            out[key] = {"b64": base64.b64encode(value).decode("ascii")}
+        else:
+            out[key] = value.decode("utf-8")
+    return out
+
+
+def decode_fields(fields, copy_index):
+    out = {}
+    for key, value in fields.items():
+        if key == COMPACT_FIELD:
+            raw = base64.b64decode(value["b64"])
+            if copy_index:
+                document = msgpack.unpackb(raw, raw=False)
+                document["uid"] = f"{document.get('uid')}-load{copy_index}"
+                raw = msgpack.packb(document, use_bin_type=True)
+            out[key] = raw
+        elif key == "payload" and copy_index:
+            payload = json.loads(value)
+            if payload.get("uid"):
+                payload["uid"] = f"{payload['uid']}-load{copy_index}"
+            out[key] = json.dumps(payload)
+        else:
+            out[key] = value
+    return out
+
+
+def record(client, args):
+    written = 0
+    last_id = "-"
+    with open(args.out, "w") as f:
+        while written < args.count:
+            entries = client.xrange(args.stream, min=last_id, max="+", count=min(1000, args.count - written))
+            if last_id != "-" and entries and entries[0][0].decode() == last_id:
+                entries = entries[1:]
+            if not entries:
+                break
+            for entry_id, fields in entries:
+                f.write(json.dumps(encode_fields(fields)) + "\n")
+                written += 1
+            last_id = entries[-1][0].decode()
+    print(f"Recorded {written} entries from '{args.stream}' to {args.out}")
+
+
+def group_backlog(client, stream, group):
+    for info in client.xinfo_groups(stream):
+        name = info["name"].decode() if isinstance(info["name"], bytes) else info["name"]
+        if name == group:
+            return (info.get("lag") or 0), info.get("pending", 0)
+    raise SystemExit(f"Consumer group '{group}' not found on stream '{stream}'")
+
+
+def replay(client, args):
+    with open(args.file) as f:
+        recorded = [json.loads(line) for line in f if line.strip()]
+    if any(COMPACT_FIELD in fields for fields in recorded) and args.copies > 1 and msgpack is None:
+        raise SystemExit("msgpack is required to fan out compact entries")
+
+    # Interleave the copies message by message, as concurrent sessions would produce them
+    entries = [decode_fields(fields, copy_index) for fields in recorded for copy_index in range(args.copies)]
+
+    t0 = time.perf_counter()
+    pipe = client.pipeline(transaction=False)
+    for i, fields in enumerate(entries, 1):
+        pipe.xadd(args.stream, fields)
+        if i % 1000 == 0:
+            pipe.execute()
+    pipe.execute()
+    publish_s = time.perf_counter() - t0
+    print(f"Published {len(entries)} entries in {publish_s:.2f}s")
+
+    while True:
+        lag, pending = group_backlog(client, args.stream, args.group)
+        if lag == 0 and pending == 0:
+            break
+        if time.perf_counter() - t0 > args.timeout:
+            raise SystemExit(f"Timed out: lag={lag} pending={pending}")
+        time.sleep(0.05)
+    elapsed = time.perf_counter() - t0
+    print(f"Consumed {len(entries)} entries in {elapsed:.2f}s: {len(entries) / elapsed:.0f} messages/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default=REDIS_HOST)
+    parser.add_argument("--port", type=int, default=REDIS_PORT)
+    parser.add_argument("--stream", default=REDIS_STREAM_NAME)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    record_parser = subparsers.add_parser("record")
+    record_parser.add_argument("--out", required=True)
+    record_parser.add_argument("--count", type=int, default=50000)
+
+    replay_parser = subparsers.add_parser("replay")
+    replay_parser.add_argument("--file", required=True)
+    replay_parser.add_argument("--copies", type=int, default=1)
+    replay_parser.add_argument("--group", default=REDIS_CONSUMER_GROUP)
+    replay_parser.add_argument("--timeout", type=float, default=600)
+
+    args = parser.parse_args()
+    client = redis.Redis(host=args.host, port=args.port, db=0)
+    if args.command == "record":
+        record(client, args)
+    else:
+        replay(client, args)
+
+
+if __name__ == "__main__":
+    main()
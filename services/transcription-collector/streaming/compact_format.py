@@ -0,0 +1,162 @@
+"""Decoding of the compact (msgpack) transcription stream format published by WhisperLive.
+
+WhisperLive uses the compact format only while the collector advertises it in
+FORMATS_KEY. Every replica records the formats it reads in REPLICA_FORMATS_KEY, and
+FORMATS_KEY holds the formats all live replicas can read, since any replica may consume
+any entry. A compact entry has a single "mp" field:
+
+- {"t": "start", "uid", "token", "platform", "meeting_id", "ts"}: session header, sent once
+- {"t": "tx", "uid", "seq", "delta", "s": [[start, end, text, completed, language], ...]}
+- {"t": "end", "uid", "ts"}
+
+Headers are kept in Redis (so they survive collector restarts) and in a bounded local
+cache. Entries are expanded into the same dict shape as the JSON "payload" field, so the
+rest of process_stream_message is format-agnostic.
+"""
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional
+
+import redis.asyncio as aioredis
+
+try:
+    import msgpack
+except ImportError:  # optional dependency; the collector then only advertises JSON
+    msgpack = None
+
+from config import REDIS_SESSION_HEADER_KEY_PREFIX, REDIS_SESSION_HEADER_TTL, REPLICA_TTL_S
+
+logger = logging.getLogger(__name__)
+
+COMPACT_FIELD = "mp"
+FORMATS_KEY = "transcription_collector:stream_formats"
+REPLICA_FORMATS_KEY = "transcription_collector:stream_formats:replicas"
+HEADER_CACHE_SIZE = 10000
+
+_header_cache: "OrderedDict[str, Dict[str, str]]" = OrderedDict()
+
+
+class MissingSessionHeader(Exception):
+    """A compact entry refers to a session whose header has not been stored (yet).
+
+    The session_start entry may still be pending elsewhere (e.g. claimed by another
+    replica), so the entry is left unacknowledged rather than dropped.
+    """
+
+
+def supported_formats() -> list:
+    return ["json", "msgpack"] if msgpack is not None else ["json"]
+
+
+async def advertise_formats(redis_c: aioredis.Redis, replica_name: str, live_replicas: Iterable[str]) -> None:
+    """Publish the wire formats every live collector replica can read for WhisperLive to negotiate against.
+
+    Called on every replica heartbeat. A live replica that has not advertised yet (or runs an
+    older collector) is assumed to read JSON only. FORMATS_KEY expires with the replicas, so
+    WhisperLive falls back to JSON when no collector is heartbeating.
+    """
+    live = set(live_replicas) | {replica_name}
+    await redis_c.hset(REPLICA_FORMATS_KEY, replica_name, ",".join(supported_formats()))
+    advertised = await redis_c.hgetall(REPLICA_FORMATS_KEY)
+    gone = [name for name in advertised if name not in live]
+    common = None
+    for name in live:
+        formats = set(advertised[name].split(",")) if name in advertised else {"json"}
+        common = formats if common is None else common & formats
+    formats = sorted(common | {"json"})
+    async with redis_c.pipeline(transaction=True) as pipe:
+        if gone:
+            pipe.hdel(REPLICA_FORMATS_KEY, *gone)
+        pipe.delete(FORMATS_KEY)
+        pipe.sadd(FORMATS_KEY, *formats)
+        pipe.expire(FORMATS_KEY, REPLICA_TTL_S)
+        await pipe.execute()
+    logger.debug(f"Advertised transcription stream formats {formats} for replicas {sorted(live)}")
+
+
+async def withdraw_formats(redis_c: aioredis.Redis, replica_name: str) -> None:
+    """Drop this replica's formats when it leaves; the remaining replicas re-advertise on their next heartbeat."""
+    await redis_c.hdel(REPLICA_FORMATS_KEY, replica_name)
+
+
+def decode_stream_fields(message_data: Dict[Any, Any]) -> Dict[str, Any]:
+    """Decode a raw stream entry read with decode_responses=False.
+
+    Field names and JSON values are decoded as UTF-8; the compact field stays bytes.
+    """
+    decoded: Dict[str, Any] = {}
+    for key, value in message_data.items():
+        key = key.decode('utf-8') if isinstance(key, bytes) else key
+        if isinstance(value, bytes) and key != COMPACT_FIELD:
+            value = value.decode('utf-8')
+        decoded[key] = value
+    return decoded
+
+
+def _cache_header(session_uid: str, header: Dict[str, str]) -> None:
+    _header_cache[session_uid] = header
+    _header_cache.move_to_end(session_uid)
+    while len(_header_cache) > HEADER_CACHE_SIZE:
+        _header_cache.popitem(last=False)
+
+
+async def _get_header(session_uid: str, redis_c: aioredis.Redis) -> Optional[Dict[str, str]]:
+    header = _header_cache.get(session_uid)
+    if header is None:
+        header = await redis_c.hgetall(f"{REDIS_SESSION_HEADER_KEY_PREFIX}:{session_uid}")
+        if not header:
+            return None
+        _cache_header(session_uid, header)
+    return header
+
+
+async def expand_compact_message(raw: bytes, redis_c: aioredis.Redis) -> Dict[str, Any]:
+    """Expand a compact entry into the JSON payload shape used by process_stream_message.
+
+    Raises:
+        ValueError: If the entry cannot be decoded.
+        MissingSessionHeader: If the entry refers to a session whose header is unknown.
+    """
+    if msgpack is None:
+        raise ValueError("Compact stream entry received but msgpack is not installed")
+    if isinstance(raw, str):
+        raise ValueError("Compact stream entry was decoded as text; the stream must be read with decode_responses=False")
+    document = msgpack.unpackb(raw, raw=False)
+    if not isinstance(document, dict) or not document.get("uid"):
+        raise ValueError(f"Malformed compact stream entry: {document!r:.200}")
+
+    session_uid = document["uid"]
+    entry_type = document.get("t")
+    if entry_type == "start":
+        header = {
+            "token": document.get("token") or "",
+            "platform": document.get("platform") or "",
+            "meeting_id": str(document.get("meeting_id") or ""),
+        }
+        header_key = f"{REDIS_SESSION_HEADER_KEY_PREFIX}:{session_uid}"
+        async with redis_c.pipeline(transaction=True) as pipe:
+            pipe.hset(header_key, mapping=header)
+            pipe.expire(header_key, REDIS_SESSION_HEADER_TTL)
+            await pipe.execute()
+        _cache_header(session_uid, header)
+        return {"type": "session_start", "uid": session_uid, "start_timestamp": document.get("ts"), **header}
+
+    header = await _get_header(session_uid, redis_c)
+    if header is None:
+        raise MissingSessionHeader(f"No session header for compact entry of UID {session_uid}")
+
+    if entry_type == "end":
+        _header_cache.pop(session_uid, None)
+        return {"type": "session_end", "uid": session_uid, "end_timestamp": document.get("ts"), **header}
+    if entry_type == "tx":
+        segments = [
+            {"start": s[0], "end": s[1], "text": s[2], "completed": s[3], "language": s[4]}
+            for s in document.get("s", [])
+            if isinstance(s, (list, tuple)) and len(s) >= 5
+        ]
+        stream_data = {"type": "transcription", "uid": session_uid, "segments": segments, **header}
+        if "seq" in document:
+            stream_data["seq"] = document["seq"]
+            stream_data["delta"] = document.get("delta", True)
+        return stream_data
+    raise ValueError(f"Unknown compact entry type '{entry_type}' for UID {session_uid}")
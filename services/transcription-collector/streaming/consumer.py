@@ -1,153 +1,188 @@
 import logging
 import asyncio
+import json
 import redis.asyncio as aioredis
 import redis # For redis.exceptions
-from typing import Dict, Any # For message_data type hint if being very specific
+from typing import Dict, Any, List, Tuple # For message_data type hint if being very specific
 
 from config import (
     REDIS_STREAM_NAME,
     REDIS_CONSUMER_GROUP,
     CONSUMER_NAME,
     PENDING_MSG_TIMEOUT_MS,
+    STALE_CLAIM_INTERVAL,
     REDIS_STREAM_READ_COUNT,
+    REDIS_STREAM_READ_COUNT_MAX,
+    REDIS_STREAM_MAX_CONCURRENCY,
     REDIS_STREAM_BLOCK_MS,
     REDIS_SPEAKER_EVENTS_STREAM_NAME,
     REDIS_SPEAKER_EVENTS_CONSUMER_GROUP
 )
 from streaming.processors import process_stream_message, process_speaker_event_message
+from streaming.compact_format import COMPACT_FIELD, decode_stream_fields, msgpack
 
 logger = logging.getLogger(__name__)
 
-async def claim_stale_messages(redis_c: aioredis.Redis):
-    """Claims and processes stale messages from the Redis Stream for the current consumer."""
+def get_ordering_key(message_data: Dict[str, Any]) -> str:
+    """Key whose messages must be processed in stream order: the session uid, else the meeting."""
+    try:
+        if COMPACT_FIELD in message_data and msgpack is not None:
+            stream_data = msgpack.unpackb(message_data[COMPACT_FIELD], raw=False)
+        else:
+            stream_data = json.loads(message_data.get('payload') or '{}')
+        return str(stream_data.get('uid') or stream_data.get('meeting_id') or '')
+    except Exception:
+        return ''  # Undecodable messages share one group; the processor acks them
+
+async def process_message_batch(messages: List[Tuple[str, Dict[str, Any]]], redis_c: aioredis.Redis) -> List[str]:
+    """Process decoded stream messages concurrently and return the ids that can be ACKed.
+
+    Messages are grouped by session (see get_ordering_key); groups run concurrently, at most
+    REDIS_STREAM_MAX_CONCURRENCY at a time, and the messages of one group run in stream order.
+    """
+    groups: Dict[str, List[Tuple[str, Dict[str, Any]]]] = {}
+    for message_id, message_data in messages:
+        groups.setdefault(get_ordering_key(message_data), []).append((message_id, message_data))
+
+    semaphore = asyncio.Semaphore(REDIS_STREAM_MAX_CONCURRENCY)
+
+    async def process_group(group: List[Tuple[str, Dict[str, Any]]]) -> List[str]:
+        acked = []
+        async with semaphore:
+            for message_id, message_data in group:
+                try:
+                    should_ack = await process_stream_message(message_id, message_data, redis_c)
+                except Exception as e:
+                    logger.error(f"Critical error during process_stream_message call for {message_id}: {e}", exc_info=True)
+                    should_ack = False
+                if should_ack:
+                    acked.append(message_id)
+        return acked
+
+    results = await asyncio.gather(*(process_group(group) for group in groups.values()))
+    return [message_id for acked in results for message_id in acked]
+
+async def claim_stale_messages(redis_c: aioredis.Redis, stream_c: aioredis.Redis):
+    """Claims and processes stale messages from the Redis Stream for the current consumer.
+
+    Pending entries idle for more than PENDING_MSG_TIMEOUT_MS are taken over with XAUTOCLAIM,
+    whichever consumer they belong to (e.g. a replica that died or was scaled down).
+    `stream_c` is a decode_responses=False client used to read the stream, since compact
+    entries carry binary msgpack values.
+    """
     messages_claimed_total = 0
-    processed_claim_count = 0
     acked_claim_count = 0
     error_claim_count = 0
 
-    logger.info(f"Starting stale message check (consumer: {CONSUMER_NAME}, idle > {PENDING_MSG_TIMEOUT_MS}ms).")
+    logger.debug(f"Starting stale message check (consumer: {CONSUMER_NAME}, idle > {PENDING_MSG_TIMEOUT_MS}ms).")
 
     try:
+        start_id = '0-0'
         while True:
-            pending_details = await redis_c.xpending_range(
+            response = await stream_c.xautoclaim(
                 name=REDIS_STREAM_NAME,
                 groupname=REDIS_CONSUMER_GROUP,
-                min='-',
-                max='+',
-                count=100 
+                consumername=CONSUMER_NAME,
+                min_idle_time=PENDING_MSG_TIMEOUT_MS,
+                start_id=start_id,
+                count=REDIS_STREAM_READ_COUNT_MAX
             )
+            next_start_id, claimed_messages = response[0], response[1]
 
-            if not pending_details:
-                logger.debug("No more pending messages found for the group during stale check.")
-                break
-
-            stale_candidates = [
-                msg for msg in pending_details
-                if msg.get('idle', 0) > PENDING_MSG_TIMEOUT_MS
+            # Redis < 7 returns entries deleted from the stream with empty fields; they can only be acked
+            deleted_ids = [
+                message_id_bytes.decode('utf-8') if isinstance(message_id_bytes, bytes) else message_id_bytes
+                for message_id_bytes, message_data_bytes in claimed_messages if not message_data_bytes
+            ]
+            decoded_messages = [
+                (message_id_bytes.decode('utf-8') if isinstance(message_id_bytes, bytes) else message_id_bytes,
+                 decode_stream_fields(message_data_bytes))
+                for message_id_bytes, message_data_bytes in claimed_messages if message_data_bytes
             ]
 
-            if not stale_candidates:
-                logger.debug("No messages found exceeding idle time in the current pending batch.")
-                if len(pending_details) < 100:
-                    break 
-                else:
-                    logger.debug("Checked 100 pending messages, none were stale enough. More might exist but stopping check for this run to avoid long loops on very busy streams.")
-                    break
-            
-            stale_message_ids = [msg['message_id'] for msg in stale_candidates]
-            logger.info(f"Found {len(stale_message_ids)} potentially stale message(s) to claim: {stale_message_ids}")
-
-            if stale_message_ids:
-                claimed_messages = await redis_c.xclaim(
-                    name=REDIS_STREAM_NAME,
-                    groupname=REDIS_CONSUMER_GROUP,
-                    consumername=CONSUMER_NAME,
-                    min_idle_time=PENDING_MSG_TIMEOUT_MS, 
-                    message_ids=stale_message_ids,
-                )
-                
-                messages_claimed_now = len(claimed_messages)
-                messages_claimed_total += messages_claimed_now
-                if messages_claimed_now > 0:
-                    logger.info(f"Successfully claimed {messages_claimed_now} stale message(s): {[msg[0].decode('utf-8') for msg in claimed_messages]}")
+            if decoded_messages:
+                messages_claimed_total += len(decoded_messages)
+                logger.info(f"Claimed {len(decoded_messages)} stale message(s): {[message_id for message_id, _ in decoded_messages]}")
+                ids_to_ack = await process_message_batch(decoded_messages, redis_c)
+                acked_ids = set(ids_to_ack)
+                failed_ids = [message_id for message_id, _ in decoded_messages if message_id not in acked_ids]
+                if failed_ids:
+                    logger.warning(f"Processing failed for claimed stale messages {failed_ids}. Not acknowledging.")
+                    error_claim_count += len(failed_ids)
+                deleted_ids.extend(ids_to_ack)
+            if deleted_ids:
+                await redis_c.xack(REDIS_STREAM_NAME, REDIS_CONSUMER_GROUP, *deleted_ids)
+                acked_claim_count += len(deleted_ids)
 
-                for message_id_bytes, message_data_bytes in claimed_messages:
-                    message_id_str = message_id_bytes.decode('utf-8') if isinstance(message_id_bytes, bytes) else message_id_bytes
-                    message_data_decoded: Dict[str, Any] = {}
-                    if isinstance(message_data_bytes, dict):
-                        # Already decoded
-                        message_data_decoded = {k: v for k, v in message_data_bytes.items()}
-                    else:
-                        # Need to decode
-                        message_data_decoded = {k.decode('utf-8'): v.decode('utf-8') for k, v in message_data_bytes.items()}
-                    
-                    logger.info(f"Processing claimed stale message {message_id_str}...")
-                    processed_claim_count += 1
-                    try:
-                        success = await process_stream_message(message_id_str, message_data_decoded, redis_c)
-                        if success:
-                            logger.info(f"Successfully processed claimed stale message {message_id_str}. Acknowledging.")
-                            await redis_c.xack(REDIS_STREAM_NAME, REDIS_CONSUMER_GROUP, message_id_str)
-                            acked_claim_count += 1
-                        else:
-                            logger.warning(f"Processing failed for claimed stale message {message_id_str}. Not acknowledging.")
-                            error_claim_count += 1
-                    except Exception as e:
-                        logger.error(f"Error processing claimed stale message {message_id_str}: {e}", exc_info=True)
-                        error_claim_count += 1
-            
-            if not stale_candidates or len(pending_details) < 100: # Break if no stale candidates or if we didn't get a full batch of pending messages
+            if isinstance(next_start_id, bytes):
+                next_start_id = next_start_id.decode('utf-8')
+            if next_start_id == '0-0':  # Scanned the whole pending entries list
                 break
+            start_id = next_start_id
 
     except redis.exceptions.RedisError as e:
         logger.error(f"Redis error during stale message claiming: {e}", exc_info=True)
     except Exception as e:
         logger.error(f"Unexpected error during stale message claiming: {e}", exc_info=True)
 
-    logger.info(f"Stale message check finished. Total claimed: {messages_claimed_total}, Processed: {processed_claim_count}, Acked: {acked_claim_count}, Errors: {error_claim_count}")
+    if messages_claimed_total or error_claim_count:
+        logger.info(f"Stale message check finished. Claimed: {messages_claimed_total}, Acked: {acked_claim_count}, Errors: {error_claim_count}")
+
+async def reclaim_stale_messages_periodically(redis_c: aioredis.Redis, stream_c: aioredis.Redis):
+    """Background task: run claim_stale_messages every STALE_CLAIM_INTERVAL seconds.
+
+    With several replicas in the consumer group, entries read by a replica that goes away stay
+    pending under its consumer name; any surviving replica picks them up here.
+    """
+    logger.info(f"Stale message reclaim task started (interval: {STALE_CLAIM_INTERVAL}s, idle > {PENDING_MSG_TIMEOUT_MS}ms)")
+    while True:
+        try:
+            await claim_stale_messages(redis_c, stream_c)
+            await asyncio.sleep(STALE_CLAIM_INTERVAL)
+        except asyncio.CancelledError:
+            logger.info("Stale message reclaim task cancelled.")
+            break
+
+async def consume_redis_stream(redis_c: aioredis.Redis, stream_c: aioredis.Redis):
+    """Background task to consume transcription segments from Redis Stream.
 
-async def consume_redis_stream(redis_c: aioredis.Redis):
-    """Background task to consume transcription segments from Redis Stream."""
+    Entries are read through `stream_c` (decode_responses=False) so that compact msgpack
+    entries arrive as bytes; everything else uses `redis_c`.
+    """
     last_processed_id = '>' 
+    read_count = REDIS_STREAM_READ_COUNT
     logger.info(f"Starting main consumer loop for '{CONSUMER_NAME}', reading new messages ('>')...")
 
     while True:
         try:
-            response = await redis_c.xreadgroup(
+            response = await stream_c.xreadgroup(
                 groupname=REDIS_CONSUMER_GROUP,
                 consumername=CONSUMER_NAME,
                 streams={REDIS_STREAM_NAME: last_processed_id},
-                count=REDIS_STREAM_READ_COUNT,
+                count=read_count,
                 block=REDIS_STREAM_BLOCK_MS 
             )
 
             if not response:
+                read_count = REDIS_STREAM_READ_COUNT
                 continue
 
             for stream_name_bytes, messages in response:
                 # stream_name = stream_name_bytes.decode('utf-8') # Not strictly needed if only one stream
-                message_ids_to_ack = []
-                processed_count = 0
-                
-                for message_id_bytes, message_data_bytes in messages:
-                    message_id_str = message_id_bytes.decode('utf-8') if isinstance(message_id_bytes, bytes) else message_id_bytes
-                    message_data_decoded: Dict[str, Any] = {}
-                    if isinstance(message_data_bytes, dict):
-                        # Already decoded
-                        message_data_decoded = {k: v for k, v in message_data_bytes.items()}
-                    else:
-                        # Need to decode
-                        message_data_decoded = {k.decode('utf-8'): v.decode('utf-8') for k, v in message_data_bytes.items()}
-                    
-                    should_ack = False
-                    processed_count += 1
-                    try:
-                        should_ack = await process_stream_message(message_id_str, message_data_decoded, redis_c)
-                    except Exception as e:
-                        logger.error(f"Critical error during process_stream_message call for {message_id_str}: {e}", exc_info=True)
-                        should_ack = False
-                    if should_ack:
-                        message_ids_to_ack.append(message_id_str)
+                decoded_messages = [
+                    (message_id_bytes.decode('utf-8') if isinstance(message_id_bytes, bytes) else message_id_bytes,
+                     decode_stream_fields(message_data_bytes))
+                    for message_id_bytes, message_data_bytes in messages
+                ]
+                processed_count = len(decoded_messages)
+
+                # A full read means a backlog: read more per round trip. Short reads shrink it back.
+                if processed_count >= read_count:
+                    read_count = min(read_count * 2, REDIS_STREAM_READ_COUNT_MAX)
+                elif processed_count < read_count // 2:
+                    read_count = max(read_count // 2, REDIS_STREAM_READ_COUNT)
+
+                message_ids_to_ack = await process_message_batch(decoded_messages, redis_c)
                         
                 if message_ids_to_ack:
                     try:
@@ -170,6 +205,7 @@ async def consume_speaker_events_stream(redis_c: aioredis.Redis):
     """Background task to consume speaker events from Redis Stream."""
     # Note: Using CONSUMER_NAME + '-speaker' to differentiate if needed, or could be shared if logic allows.
     # Stale message claiming for this stream is not implemented here, but could be added similarly to claim_stale_messages.
+    # CONSUMER_NAME is unique per replica, so replicas share the speaker events group without colliding.
     consumer_name_speaker = f"{CONSUMER_NAME}-speaker"
     last_processed_id = '>' 
     logger.info(f"Starting speaker event consumer loop for '{consumer_name_speaker}', reading new messages ('>')...")
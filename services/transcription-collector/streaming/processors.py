@@ -13,12 +13,51 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from shared_models.database import async_session_local # For DB sessions
 from shared_models.models import User, Meeting, MeetingSession, APIToken
 from shared_models.schemas import Platform # WhisperLiveData not directly used by these functions from snippet
-from config import REDIS_SEGMENT_TTL, REDIS_SPEAKER_EVENT_KEY_PREFIX, REDIS_SPEAKER_EVENT_TTL # Added new configs (NEW)
+from config import REDIS_SEGMENT_TTL, REDIS_SPEAKER_EVENT_KEY_PREFIX, REDIS_SPEAKER_EVENT_TTL, COMPACT_HEADER_WAIT_S # Added new configs (NEW)
 # MODIFIED: Import the new utility function and only necessary statuses/base mapper if still needed elsewhere
-from mapping.speaker_mapper import get_speaker_mapping_for_segment, STATUS_UNKNOWN, STATUS_ERROR # Removed direct map_speaker_to_segment and other statuses if not directly used by this file
+from mapping.speaker_mapper import get_speaker_mappings_for_segments, STATUS_UNKNOWN, STATUS_ERROR
+from streaming.compact_format import COMPACT_FIELD, MissingSessionHeader, expand_compact_message
+from streaming.session_cache import SESSION_CONTEXT_CACHE, SessionContext, bump_session_version, get_session_version
 
 logger = logging.getLogger(__name__)
 
+# WhisperLive publishes delta updates (only changed segments, tagged with a per-session
+# "seq"); partial text from an update older than one already applied (e.g. a claimed
+# stale message, possibly on another replica) must not overwrite newer text. The last
+# applied seq of each session is kept in meeting:{id}:session_seq, and partial segments
+# are written (and indexed in segment_updates) by this script only if their seq is newer,
+# atomically with the check. Completed segments are final and always written.
+# KEYS: session seq hash, segments hash, updates zset.
+# ARGV: session uid, seq, ttl, updated_at score, field/value pairs.
+APPLY_PARTIAL_SEGMENTS_LUA = """
+local last = tonumber(redis.call('HGET', KEYS[1], ARGV[1]))
+local seq = tonumber(ARGV[2])
+if last and seq <= last then
+    return 0
+end
+redis.call('HSET', KEYS[1], ARGV[1], ARGV[2])
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+for i = 5, #ARGV, 2 do
+    redis.call('HSET', KEYS[2], ARGV[i], ARGV[i + 1])
+    redis.call('ZADD', KEYS[3], ARGV[4], ARGV[i])
+end
+return 1
+"""
+_apply_partial_segments = None
+
+def get_apply_partial_segments_script(redis_c: aioredis.Redis):
+    global _apply_partial_segments
+    if _apply_partial_segments is None:
+        _apply_partial_segments = redis_c.register_script(APPLY_PARTIAL_SEGMENTS_LUA)
+    return _apply_partial_segments
+
+def stream_entry_age_s(message_id: str) -> Optional[float]:
+    """Age in seconds of a stream entry, from the millisecond timestamp in its id."""
+    try:
+        return datetime.now(timezone.utc).timestamp() - int(str(message_id).split('-', 1)[0]) / 1000
+    except ValueError:
+        return None
+
 async def get_user_by_token(token: str, db: AsyncSession) -> User:
     """Validates an API token and returns the associated User or raises ValueError."""
     if not token:
@@ -100,230 +139,298 @@ async def process_stream_message(message_id: str, message_data: Dict[str, Any],
     """
     payload_json = "" 
     try:
-        if 'payload' not in message_data:
+        if COMPACT_FIELD in message_data:
+            try:
+                stream_data = await expand_compact_message(message_data[COMPACT_FIELD], redis_c)
+            except MissingSessionHeader as e:
+                # The session_start entry may not have been processed yet: retry via stale claiming
+                age_s = stream_entry_age_s(message_id)
+                if age_s is not None and age_s > COMPACT_HEADER_WAIT_S:
+                    logger.error(f"{e} after {age_s:.0f}s for message {message_id}. Acking to avoid loop.")
+                    return True
+                logger.warning(f"{e} (message {message_id}). Leaving it pending.")
+                return False
+            except ValueError as e:
+                logger.error(f"Failed to decode compact message {message_id}: {e}. Acking to avoid loop.")
+                return True
+            payload_json = f"<msgpack uid={stream_data.get('uid')}>"
+        elif 'payload' not in message_data:
             logger.warning(f"Message {message_id} missing 'payload' field. Skipping.")
             return True 
-        
-        payload_json = message_data['payload']
-        stream_data = json.loads(payload_json)
+        else:
+            payload_json = message_data['payload']
+            stream_data = json.loads(payload_json)
         message_type = stream_data.get("type", "transcription")
         
-        user: Optional[User] = None
-        meeting: Optional[Meeting] = None
-        internal_meeting_id: Optional[int] = None
-
-        async with async_session_local() as db:
-            try:
-                # Common fields for both event types
-                token = stream_data.get('token')
-                platform_val = stream_data.get('platform')
-                native_meeting_id = stream_data.get('meeting_id')
+        # Common fields for all event types
+        token = stream_data.get('token')
+        platform_val = stream_data.get('platform')
+        native_meeting_id = stream_data.get('meeting_id')
 
-                if not all([token, platform_val, native_meeting_id]):
-                    logger.warning(f"Message {message_id} (type: {message_type}) missing common required fields (token, platform, meeting_id). Skipping. Payload: {payload_json[:200]}...")
-                    return True
+        if not all([token, platform_val, native_meeting_id]):
+            logger.warning(f"Message {message_id} (type: {message_type}) missing common required fields (token, platform, meeting_id). Skipping. Payload: {payload_json[:200]}...")
+            return True
 
-                # Convert native_meeting_id to string to match database VARCHAR type
-                native_meeting_id = str(native_meeting_id)
-
-                user = await get_user_by_token(token, db)
-                
-                stmt_meeting = select(Meeting).where(
-                    Meeting.user_id == user.id,
-                    Meeting.platform == platform_val,
-                    Meeting.platform_specific_id == native_meeting_id
-                ).order_by(Meeting.created_at.desc())
-                result_meeting = await db.execute(stmt_meeting)
-                meeting = result_meeting.scalars().first()
-
-                if not meeting:
-                    logger.warning(f"Meeting lookup failed for message {message_id}: No meeting found for user {user.id}, platform '{platform_val}', native ID '{native_meeting_id}'")
-                    return True
-                internal_meeting_id = meeting.id
-
-                # Process different message types
-                if message_type == "session_start":
-                    return await process_session_start_event(message_id, stream_data, db, user, meeting) 
-                elif message_type == "transcription":
-                    pass # Continue with transcription processing
-                elif message_type == "session_end": # NEW: Handle session_end for cleanup
-                    session_uid = stream_data.get('uid')
-                    if not session_uid:
-                        logger.warning(f"Message {message_id} (type: session_end) missing 'uid'. Skipping cleanup.")
-                        return True # Cannot process without UID, but ack
-                    
-                    speaker_event_key = f"{REDIS_SPEAKER_EVENT_KEY_PREFIX}:{session_uid}"
-                    try:
-                        deleted_count = await redis_c.delete(speaker_event_key)
-                        logger.info(f"Processed session_end for UID '{session_uid}'. Deleted speaker events key '{speaker_event_key}' from Redis (count: {deleted_count}).")
-                        # Note: MeetingSession.session_end_utc is not updated here due to no DB model changes allowed.
-                    except redis.exceptions.RedisError as e_redis:
-                        logger.error(f"Redis error deleting speaker events for UID '{session_uid}' on session_end: {e_redis}")
-                        return False # Retryable Redis error
-                    return True # Successfully processed session_end
-                else:
-                    logger.warning(f"Message {message_id} has unknown type '{message_type}'. Skipping.")
-                    return True
+        # Convert native_meeting_id to string to match database VARCHAR type
+        native_meeting_id = str(native_meeting_id)
+        session_uid_from_payload = stream_data.get('uid')
+        cache_key = (token, platform_val, native_meeting_id, session_uid_from_payload)
 
-            except ValueError as ve: # Raised by get_user_by_token or other validation
-                logger.warning(f"Auth/Lookup or validation failed for message {message_id}: {ve}. Skipping.")
-                return True 
-            except Exception as db_err:
-                logger.error(f"DB/Lookup error preparing for message {message_id}: {db_err}", exc_info=True)
-                await db.rollback()
-                return False
+        if message_type in ("session_start", "session_end") and session_uid_from_payload:
+            # The session's start time is (re)set, or the session is over
+            SESSION_CONTEXT_CACHE.invalidate_session(session_uid_from_payload)
 
-            # --- Transcription type processing --- 
-            required_fields_transcription = ["segments"]
-            if not all(field in stream_data for field in required_fields_transcription):
-                 logger.warning(f"Transcription message {message_id} payload missing 'segments' field. Skipping. Payload: {payload_json[:200]}...")
-                 return True
-
-            segment_count = 0
-            hash_key = f"meeting:{internal_meeting_id}:segments"
-            segments_to_store = {}
-            session_uid_from_payload = stream_data.get('uid')
-            # Resolve session start time for absolute UTC timestamp computation
-            session_start_utc = None
+        # Transcription messages of a known session need no DB round-trip
+        context = None
+        session_version = None
+        if message_type == "transcription":
             try:
-                if session_uid_from_payload:
-                    stmt_session_time = select(MeetingSession).where(
-                        MeetingSession.meeting_id == meeting.id,
-                        MeetingSession.session_uid == session_uid_from_payload
-                    )
-                    result_session_time = await db.execute(stmt_session_time)
-                    session_row = result_session_time.scalars().first()
-                    if session_row and getattr(session_row, 'session_start_time', None):
-                        session_start_utc = session_row.session_start_time
-            except Exception as _sess_err:
-                logger.warning(f"[Msg {message_id}/Meet {internal_meeting_id}] Unable to resolve session start time for UID {session_uid_from_payload}: {_sess_err}")
-
-            if not session_uid_from_payload:
-                logger.warning(f"[Msg {message_id}/Meet {internal_meeting_id}] Message missing 'uid' for transcription segments. Cannot map speakers. Segments in this message will not have speaker info.")
-            
-            for i, segment in enumerate(stream_data.get('segments', [])):
-                 if not isinstance(segment, dict) or segment.get('start') is None or segment.get('end') is None:
-                     logger.warning(f"[Msg {message_id}/Meet {internal_meeting_id}] Skipping segment {i} missing structure or 'start'/'end': {segment}")
-                     continue
-                 try:
-                     start_time_float = float(segment['start'])
-                     end_time_float = float(segment['end'])
-                     text_content = segment.get('text') or ""
-                     language_content = segment.get('language')
-                 except (ValueError, TypeError) as time_err:
-                     logger.warning(f"[Msg {message_id}/Meet {internal_meeting_id}] Skipping segment {i} invalid time format: {time_err} - Segment: {segment}")
-                     continue
-                
-                 # Fix inverted timestamps
-                 if end_time_float < start_time_float:
-                     start_time_float, end_time_float = end_time_float, start_time_float
-                     logger.warning(f"[Msg {message_id}/Meet {internal_meeting_id}] Corrected inverted times to start={start_time_float}, end={end_time_float}")
-                
-                 # Skip zero/negative duration segments
-                 if end_time_float - start_time_float < 1e-3:
-                     logger.debug(f"[Msg {message_id}/Meet {internal_meeting_id}] Skipping ~zero-length segment: {segment}")
-                     continue
-                            
-                 start_time_key = f"{start_time_float:.3f}"
-                 
-                 mapping_status: str = STATUS_UNKNOWN
-
-                 if session_uid_from_payload:
-                    # MODIFIED: Call the new utility function
-                    context_log = f"[LiveMap Msg:{message_id}/Meet:{internal_meeting_id}/Seg:{start_time_key}]"
-                    mapping_result = await get_speaker_mapping_for_segment(
-                        redis_c=redis_c,
-                        session_uid=session_uid_from_payload,
-                        segment_start_ms=start_time_float * 1000,
-                        segment_end_ms=end_time_float * 1000,
-                        config_speaker_event_key_prefix=REDIS_SPEAKER_EVENT_KEY_PREFIX,
-                        context_log_msg=context_log
-                    )
-                    mapped_speaker_name = mapping_result.get("speaker_name")
-                    mapping_status = mapping_result.get("status", STATUS_ERROR) # Default to STATUS_ERROR if not present
-                 else:
-                    # This case is now handled inside get_speaker_mapping_for_segment if session_uid is None,
-                    # but keeping explicit handling here is also fine for clarity if session_uid_from_payload is None from the start.
-                    logger.warning(f"[Msg {message_id}/Meet {internal_meeting_id}/Seg {start_time_key}] No session_uid_from_payload. Cannot map speakers.")
-                    mapping_status = STATUS_UNKNOWN
-
-                 segment_redis_data = {
-                     "text": text_content,
-                     "end_time": end_time_float,
-                     "language": language_content,
-                     "updated_at": datetime.now(timezone.utc).isoformat(), 
-                     "session_uid": session_uid_from_payload,
-                     "speaker": mapped_speaker_name,
-                     "speaker_mapping_status": mapping_status
-                 }
-                 # Compute absolute UTC timestamps if session start time is known
-                 if session_start_utc is not None:
-                     try:
-                         abs_start_dt = session_start_utc + timedelta(seconds=start_time_float)
-                         abs_end_dt = session_start_utc + timedelta(seconds=end_time_float)
-                         segment_redis_data["absolute_start_time"] = abs_start_dt.isoformat()
-                         segment_redis_data["absolute_end_time"] = abs_end_dt.isoformat()
-                     except Exception as _abs_err:
-                         logger.debug(f"[Msg {message_id}/Meet {internal_meeting_id}] Failed to compute absolute times: {_abs_err}")
-                 segments_to_store[start_time_key] = json.dumps(segment_redis_data)
-                 segment_count += 1
-            
-            if segment_count > 0:
-                try:
-                    async with redis_c.pipeline(transaction=True) as pipe:
-                        pipe.sadd(f"active_meetings", str(internal_meeting_id))
-                        pipe.expire(hash_key, REDIS_SEGMENT_TTL)
-                        if segments_to_store:
-                            pipe.hset(hash_key, mapping=segments_to_store)
-                        results = await pipe.execute()
-                        if any(res is None for res in results): # Simplified critical failure check
-                            logger.error(f"Redis pipeline command failed critically for message {message_id}. Results: {results}")
-                            return False
-                        logger.info(f"Stored/Updated {segment_count} segments in Redis from message {message_id} for meeting {internal_meeting_id}. Results: {results}")
-                except redis.exceptions.RedisError as redis_err:
-                    logger.error(f"Redis pipeline error storing segments for message {message_id}: {redis_err}", exc_info=True)
-                    return False 
-                except Exception as pipe_err:
-                     logger.error(f"Unexpected pipeline error storing segments for message {message_id}: {pipe_err}", exc_info=True)
-                     return False
-                # Publish mutable transcript update via Redis Pub/Sub (quick win)
+                session_version = await get_session_version(redis_c, session_uid_from_payload)
+            except redis.exceptions.RedisError as e_redis:
+                logger.warning(f"Failed to read cache version of session {session_uid_from_payload}: {e_redis}")
+            if session_version is not None:
+                context = SESSION_CONTEXT_CACHE.get(cache_key, session_version)
+
+        if context is None:
+            async with async_session_local() as db:
                 try:
-                    updated_segments = []
-                    for k, v in segments_to_store.items():
-                        try:
-                            seg_dict = json.loads(v)
-                        except Exception:
-                            seg_dict = {"raw": v}
-                        # include numeric start for convenience
+                    user = await get_user_by_token(token, db)
+                    
+                    stmt_meeting = select(Meeting).where(
+                        Meeting.user_id == user.id,
+                        Meeting.platform == platform_val,
+                        Meeting.platform_specific_id == native_meeting_id
+                    ).order_by(Meeting.created_at.desc())
+                    result_meeting = await db.execute(stmt_meeting)
+                    meeting = result_meeting.scalars().first()
+
+                    if not meeting:
+                        logger.warning(f"Meeting lookup failed for message {message_id}: No meeting found for user {user.id}, platform '{platform_val}', native ID '{native_meeting_id}'")
+                        return True
+
+                    # Process different message types
+                    if message_type == "session_start":
+                        processed = await process_session_start_event(message_id, stream_data, db, user, meeting)
+                        if processed:
+                            # Absolute segment times depend on the session start: cached transcripts are
+                            # rebuilt and every replica drops its cached context of the session
+                            try:
+                                async with redis_c.pipeline(transaction=True) as pipe:
+                                    pipe.hdel(f"meeting:{meeting.id}:transcript_version", "epoch")
+                                    if session_uid_from_payload:
+                                        bump_session_version(pipe, session_uid_from_payload)
+                                    await pipe.execute()
+                            except redis.exceptions.RedisError as e_redis:
+                                logger.error(f"Failed to invalidate cached transcript of meeting {meeting.id}: {e_redis}")
+                        return processed
+                    elif message_type == "transcription":
+                        # Resolve session start time for absolute UTC timestamp computation
+                        session_start_utc = None
                         try:
-                            seg_start = float(k)
-                        except Exception:
-                            seg_start = k
-                        
-                        # Ensure absolute UTC time fields are included for WebSocket
-                        segment_with_times = {"start": seg_start, **seg_dict}
+                            if session_uid_from_payload:
+                                stmt_session_time = select(MeetingSession).where(
+                                    MeetingSession.meeting_id == meeting.id,
+                                    MeetingSession.session_uid == session_uid_from_payload
+                                )
+                                result_session_time = await db.execute(stmt_session_time)
+                                session_row = result_session_time.scalars().first()
+                                if session_row and getattr(session_row, 'session_start_time', None):
+                                    session_start_utc = session_row.session_start_time
+                        except Exception as _sess_err:
+                            logger.warning(f"[Msg {message_id}/Meet {meeting.id}] Unable to resolve session start time for UID {session_uid_from_payload}: {_sess_err}")
+                        context = SessionContext(user.id, meeting.id, session_start_utc)
+                        if session_version is not None:
+                            SESSION_CONTEXT_CACHE.put(cache_key, session_version, context)
+                    elif message_type == "session_end": # NEW: Handle session_end for cleanup
+                        session_uid = session_uid_from_payload
+                        if not session_uid:
+                            logger.warning(f"Message {message_id} (type: session_end) missing 'uid'. Skipping cleanup.")
+                            return True # Cannot process without UID, but ack
                         
-                        # Add absolute time fields if they exist in the stored segment
-                        if 'absolute_start_time' in seg_dict:
-                            segment_with_times['absolute_start_time'] = seg_dict['absolute_start_time']
-                        if 'absolute_end_time' in seg_dict:
-                            segment_with_times['absolute_end_time'] = seg_dict['absolute_end_time']
+                        speaker_event_key = f"{REDIS_SPEAKER_EVENT_KEY_PREFIX}:{session_uid}"
+                        try:
+                            deleted_count = await redis_c.delete(speaker_event_key)
+                            logger.info(f"Processed session_end for UID '{session_uid}'. Deleted speaker events key '{speaker_event_key}' from Redis (count: {deleted_count}).")
+                            # Note: MeetingSession.session_end_utc is not updated here due to no DB model changes allowed.
+                        except redis.exceptions.RedisError as e_redis:
+                            logger.error(f"Redis error deleting speaker events for UID '{session_uid}' on session_end: {e_redis}")
+                            return False # Retryable Redis error
+                        return True # Successfully processed session_end
+                    else:
+                        logger.warning(f"Message {message_id} has unknown type '{message_type}'. Skipping.")
+                        return True
+
+                except ValueError as ve: # Raised by get_user_by_token or other validation
+                    logger.warning(f"Auth/Lookup or validation failed for message {message_id}: {ve}. Skipping.")
+                    return True 
+                except Exception as db_err:
+                    logger.error(f"DB/Lookup error preparing for message {message_id}: {db_err}", exc_info=True)
+                    await db.rollback()
+                    return False
+
+        user_id = context.user_id
+        internal_meeting_id = context.meeting_id
+        session_start_utc = context.session_start_utc
+
+        # --- Transcription type processing --- 
+        required_fields_transcription = ["segments"]
+        if not all(field in stream_data for field in required_fields_transcription):
+             logger.warning(f"Transcription message {message_id} payload missing 'segments' field. Skipping. Payload: {payload_json[:200]}...")
+             return True
+
+        segment_count = 0
+        hash_key = f"meeting:{internal_meeting_id}:segments"
+        # Start keys scored by updated_at, so the background writer only reads segments that became immutable
+        updates_key = f"meeting:{internal_meeting_id}:segment_updates"
+        updated_at = datetime.now(timezone.utc)
+        segments_to_store = {}
+        parsed_segments: List[Tuple[str, float, float, str, Optional[str]]] = []
+
+        if not session_uid_from_payload:
+            logger.warning(f"[Msg {message_id}/Meet {internal_meeting_id}] Message missing 'uid' for transcription segments. Cannot map speakers. Segments in this message will not have speaker info.")
+
+        # Partial segments of a delta update are applied only if its seq is the newest (see APPLY_PARTIAL_SEGMENTS_LUA)
+        update_seq = stream_data.get('seq')
+        seq_guarded = bool(session_uid_from_payload) and isinstance(update_seq, int)
+        partial_keys = set()
+        
+        for i, segment in enumerate(stream_data.get('segments', [])):
+             if not isinstance(segment, dict) or segment.get('start') is None or segment.get('end') is None:
+                 logger.warning(f"[Msg {message_id}/Meet {internal_meeting_id}] Skipping segment {i} missing structure or 'start'/'end': {segment}")
+                 continue
+             try:
+                 start_time_float = float(segment['start'])
+                 end_time_float = float(segment['end'])
+                 text_content = segment.get('text') or ""
+                 language_content = segment.get('language')
+             except (ValueError, TypeError) as time_err:
+                 logger.warning(f"[Msg {message_id}/Meet {internal_meeting_id}] Skipping segment {i} invalid time format: {time_err} - Segment: {segment}")
+                 continue
+            
+             # Fix inverted timestamps
+             if end_time_float < start_time_float:
+                 start_time_float, end_time_float = end_time_float, start_time_float
+                 logger.warning(f"[Msg {message_id}/Meet {internal_meeting_id}] Corrected inverted times to start={start_time_float}, end={end_time_float}")
+            
+             # Skip zero/negative duration segments
+             if end_time_float - start_time_float < 1e-3:
+                 logger.debug(f"[Msg {message_id}/Meet {internal_meeting_id}] Skipping ~zero-length segment: {segment}")
+                 continue
                         
-                        updated_segments.append(segment_with_times)
-
-                    event_payload = {
-                        "type": "transcript.mutable",
-                        "meeting": {"platform": platform_val, "native_id": native_meeting_id},
-                        "payload": {"segments": updated_segments},
-                        "ts": datetime.now(timezone.utc).isoformat()
-                    }
-                    channel = f"tc:meeting:{user.id}:{platform_val}:{native_meeting_id}:mutable"
-                    await redis_c.publish(channel, json.dumps(event_payload))
-                except Exception as pub_err:
-                    logger.error(f"Failed to publish mutable transcript update for meeting {internal_meeting_id}: {pub_err}")
-            else:
-                logger.info(f"No valid segments found in message {message_id} for meeting {internal_meeting_id} to store in Redis.")
-            return True
+             parsed_segments.append((f"{start_time_float:.3f}", start_time_float, end_time_float, text_content, language_content))
+             if seq_guarded and not segment.get('completed'):
+                 partial_keys.add(f"{start_time_float:.3f}")
+
+        # Map all segments of the message in one go (one speaker events read per message)
+        if session_uid_from_payload and parsed_segments:
+            mapping_results = await get_speaker_mappings_for_segments(
+                redis_c=redis_c,
+                session_uid=session_uid_from_payload,
+                segments_ms=[(start * 1000, end * 1000) for _, start, end, _, _ in parsed_segments],
+                config_speaker_event_key_prefix=REDIS_SPEAKER_EVENT_KEY_PREFIX,
+                context_log_msg=f"[LiveMap Msg:{message_id}/Meet:{internal_meeting_id}]"
+            )
+        else:
+            mapping_results = [{"speaker_name": None, "status": STATUS_UNKNOWN} for _ in parsed_segments]
+
+        for (start_time_key, start_time_float, end_time_float, text_content, language_content), mapping_result in zip(parsed_segments, mapping_results):
+             mapped_speaker_name = mapping_result.get("speaker_name")
+             mapping_status = mapping_result.get("status", STATUS_ERROR) # Default to STATUS_ERROR if not present
+
+             segment_redis_data = {
+                 "text": text_content,
+                 "end_time": end_time_float,
+                 "language": language_content,
+                 "updated_at": updated_at.isoformat(),
+                 "session_uid": session_uid_from_payload,
+                 "speaker": mapped_speaker_name,
+                 "speaker_mapping_status": mapping_status
+             }
+             # Compute absolute UTC timestamps if session start time is known
+             if session_start_utc is not None:
+                 try:
+                     abs_start_dt = session_start_utc + timedelta(seconds=start_time_float)
+                     abs_end_dt = session_start_utc + timedelta(seconds=end_time_float)
+                     segment_redis_data["absolute_start_time"] = abs_start_dt.isoformat()
+                     segment_redis_data["absolute_end_time"] = abs_end_dt.isoformat()
+                 except Exception as _abs_err:
+                     logger.debug(f"[Msg {message_id}/Meet {internal_meeting_id}] Failed to compute absolute times: {_abs_err}")
+             segments_to_store[start_time_key] = json.dumps(segment_redis_data)
+             segment_count += 1
+        
+        if segment_count > 0:
+            try:
+                final_segments = {k: v for k, v in segments_to_store.items() if k not in partial_keys}
+                async with redis_c.pipeline(transaction=True) as pipe:
+                    pipe.sadd(f"active_meetings", str(internal_meeting_id))
+                    pipe.expire(hash_key, REDIS_SEGMENT_TTL)
+                    if seq_guarded:
+                        partial_args = [item for k in partial_keys if k in segments_to_store for item in (k, segments_to_store[k])]
+                        await get_apply_partial_segments_script(redis_c)(
+                            keys=[f"meeting:{internal_meeting_id}:session_seq", hash_key, updates_key],
+                            args=[session_uid_from_payload, update_seq, REDIS_SEGMENT_TTL, updated_at.timestamp(), *partial_args],
+                            client=pipe,
+                        )
+                    if final_segments:
+                        pipe.hset(hash_key, mapping=final_segments)
+                        pipe.zadd(updates_key, {start_time_key: updated_at.timestamp() for start_time_key in final_segments})
+                    if segments_to_store:
+                        pipe.expire(updates_key, REDIS_SEGMENT_TTL)
+                        # Lets cached assembled transcripts (api.transcript_cache) pick up the change
+                        pipe.hincrby(f"meeting:{internal_meeting_id}:transcript_version", "version", 1)
+                        pipe.expire(f"meeting:{internal_meeting_id}:transcript_version", REDIS_SEGMENT_TTL)
+                    results = await pipe.execute()
+                    if any(res is None for res in results): # Simplified critical failure check
+                        logger.error(f"Redis pipeline command failed critically for message {message_id}. Results: {results}")
+                        return False
+                    if seq_guarded and results[2] == 0:
+                        logger.debug(f"[Msg {message_id}/Meet {internal_meeting_id}] Update seq {update_seq} for UID {session_uid_from_payload} is older than the last applied; kept completed segments only.")
+                        segments_to_store = final_segments
+                    logger.info(f"Stored/Updated {len(segments_to_store)} segments in Redis from message {message_id} for meeting {internal_meeting_id}. Results: {results}")
+            except redis.exceptions.RedisError as redis_err:
+                logger.error(f"Redis pipeline error storing segments for message {message_id}: {redis_err}", exc_info=True)
+                return False 
+            except Exception as pipe_err:
+                 logger.error(f"Unexpected pipeline error storing segments for message {message_id}: {pipe_err}", exc_info=True)
+                 return False
+            # Publish mutable transcript update via Redis Pub/Sub (quick win)
+            try:
+                updated_segments = []
+                for k, v in segments_to_store.items():
+                    try:
+                        seg_dict = json.loads(v)
+                    except Exception:
+                        seg_dict = {"raw": v}
+                    # include numeric start for convenience
+                    try:
+                        seg_start = float(k)
+                    except Exception:
+                        seg_start = k
+                    
+                    # Ensure absolute UTC time fields are included for WebSocket
+                    segment_with_times = {"start": seg_start, **seg_dict}
+                    
+                    # Add absolute time fields if they exist in the stored segment
+                    if 'absolute_start_time' in seg_dict:
+                        segment_with_times['absolute_start_time'] = seg_dict['absolute_start_time']
+                    if 'absolute_end_time' in seg_dict:
+                        segment_with_times['absolute_end_time'] = seg_dict['absolute_end_time']
+                    
+                    updated_segments.append(segment_with_times)
+
+                event_payload = {
+                    "type": "transcript.mutable",
+                    "meeting": {"platform": platform_val, "native_id": native_meeting_id},
+                    "payload": {"segments": updated_segments},
+                    "ts": datetime.now(timezone.utc).isoformat()
+                }
+                channel = f"tc:meeting:{user_id}:{platform_val}:{native_meeting_id}:mutable"
+                await redis_c.publish(channel, json.dumps(event_payload))
+            except Exception as pub_err:
+                logger.error(f"Failed to publish mutable transcript update for meeting {internal_meeting_id}: {pub_err}")
+        else:
+            logger.info(f"No valid segments found in message {message_id} for meeting {internal_meeting_id} to store in Redis.")
+        return True
 
     except json.JSONDecodeError as e:
         logger.error(f"Failed to parse JSON payload for message {message_id}: {e}. Payload: {payload_json[:200]}... Acking to avoid loop.")
@@ -0,0 +1,96 @@
+"""In-process cache of the DB context a transcription message needs.
+
+Every message of a session carries the same token/platform/meeting_id/uid, so the
+user, meeting and session lookups in process_stream_message are resolved once per
+session and then served from here. Entries expire after SESSION_CACHE_TTL seconds and
+the cache is bounded to SESSION_CACHE_MAX_ENTRIES (least recently used first out).
+Entries of a session are dropped on its session_start (the start time changes) and
+session_end. Other replicas learn about a session_start through a per-session version
+counter in Redis: entries are stored with the version read before the lookup and are
+only served while it is unchanged. Contexts without a session start time are not cached.
+"""
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, NamedTuple, Optional, Tuple
+
+import redis.asyncio as aioredis
+
+from config import (
+    REDIS_SESSION_HEADER_TTL,
+    REDIS_SESSION_VERSION_KEY_PREFIX,
+    SESSION_CACHE_MAX_ENTRIES,
+    SESSION_CACHE_TTL,
+)
+
+CacheKey = Tuple[str, str, str, Optional[str]]  # (token, platform, native_meeting_id, session_uid)
+
+
+class SessionContext(NamedTuple):
+    user_id: int
+    meeting_id: int
+    session_start_utc: Optional[datetime]
+
+
+class SessionContextCache:
+    def __init__(self, ttl_s: float = SESSION_CACHE_TTL, max_entries: int = SESSION_CACHE_MAX_ENTRIES):
+        self.ttl_s = ttl_s
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[CacheKey, Tuple[float, str, SessionContext]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, key: CacheKey, version: str) -> Optional[SessionContext]:
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.monotonic() and entry[1] == version:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+        if entry is not None:
+            del self._entries[key]
+        self.misses += 1
+        return None
+
+    def put(self, key: CacheKey, version: str, context: SessionContext) -> None:
+        if context.session_start_utc is None:
+            # The session_start may still be on its way; look the session up again next time
+            return
+        self._entries[key] = (time.monotonic() + self.ttl_s, version, context)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate_session(self, session_uid: str) -> None:
+        """Drop every entry of a session (normally one)."""
+        for key in [key for key in self._entries if key[3] == session_uid]:
+            del self._entries[key]
+            self.invalidations += 1
+
+    def get_metrics(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "session_cache_entries": len(self._entries),
+            "session_cache_hits": self.hits,
+            "session_cache_misses": self.misses,
+            "session_cache_invalidations": self.invalidations,
+            "session_cache_hit_rate": (self.hits / lookups) if lookups else 0.0,
+        }
+
+
+def _version_key(session_uid: Optional[str]) -> str:
+    return f"{REDIS_SESSION_VERSION_KEY_PREFIX}:{session_uid}"
+
+
+async def get_session_version(redis_c: aioredis.Redis, session_uid: Optional[str]) -> str:
+    """Current cache version of a session ("0" until its first session_start)."""
+    return await redis_c.get(_version_key(session_uid)) or "0"
+
+
+def bump_session_version(pipe: aioredis.client.Pipeline, session_uid: str) -> None:
+    """Queue the version bump that invalidates every replica's cached context of a session."""
+    pipe.incr(_version_key(session_uid))
+    pipe.expire(_version_key(session_uid), REDIS_SESSION_HEADER_TTL)
+
+
+SESSION_CONTEXT_CACHE = SessionContextCache()
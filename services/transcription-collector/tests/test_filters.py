@@ -0,0 +1,42 @@
+import unittest
+
+from filters import MeetingSegmentIndex
+
+
+class TestMeetingSegmentIndex(unittest.TestCase):
+    def test_segments_are_kept_sorted_by_start(self):
+        index = MeetingSegmentIndex(window_seconds=600)
+        index.add("second", 5.0, 6.0)
+        index.add("first", 1.0, 2.0)
+        index.add("third", 9.0, 10.0)
+        self.assertEqual(index.starts, [1.0, 5.0, 9.0])
+        self.assertEqual([seg[2] for seg in index.segments], ["first", "second", "third"])
+
+    def test_candidates_include_long_segments_starting_earlier(self):
+        index = MeetingSegmentIndex(window_seconds=600)
+        index.add("long", 0.0, 30.0)
+        index.add("short", 20.0, 21.0)
+        index.add("later", 50.0, 51.0)
+        texts = [index.segments[i][2] for i in index.candidates(25.0, 26.0)]
+        self.assertEqual(texts, ["long", "short"])
+
+    def test_candidates_stop_at_the_new_segment_end(self):
+        index = MeetingSegmentIndex(window_seconds=600)
+        index.add("a", 0.0, 1.0)
+        index.add("b", 10.0, 11.0)
+        self.assertEqual(list(index.candidates(0.5, 5.0)), [0])
+
+    def test_segments_outside_the_window_are_evicted(self):
+        index = MeetingSegmentIndex(window_seconds=60)
+        index.add("old", 0.0, 1.0)
+        index.add("recent", 50.0, 51.0)
+        index.add("new", 100.0, 101.0)
+        self.assertEqual([seg[2] for seg in index.segments], ["recent", "new"])
+
+    def test_remove(self):
+        index = MeetingSegmentIndex(window_seconds=600)
+        for i in range(4):
+            index.add(str(i), float(i), i + 0.5)
+        index.remove([2, 0])
+        self.assertEqual(index.starts, [1.0, 3.0])
+        self.assertEqual(len(index), 2)
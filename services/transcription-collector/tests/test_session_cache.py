@@ -0,0 +1,51 @@
+import unittest
+from datetime import datetime, timezone
+from unittest import mock
+
+from streaming.session_cache import SessionContext, SessionContextCache
+
+KEY = ("token", "teams", "native-id", "uid-1")
+CONTEXT = SessionContext(user_id=1, meeting_id=2, session_start_utc=datetime(2026, 1, 1, tzinfo=timezone.utc))
+
+
+class TestSessionContextCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = SessionContextCache(ttl_s=60, max_entries=2)
+
+    def test_hit_with_the_same_version(self):
+        self.cache.put(KEY, "0", CONTEXT)
+        self.assertEqual(self.cache.get(KEY, "0"), CONTEXT)
+        self.assertEqual(self.cache.hits, 1)
+
+    def test_version_change_invalidates_the_entry(self):
+        self.cache.put(KEY, "0", CONTEXT)
+        self.assertIsNone(self.cache.get(KEY, "1"))
+        # The stale entry is dropped, not served again under its old version
+        self.assertIsNone(self.cache.get(KEY, "0"))
+        self.assertEqual(self.cache.misses, 2)
+
+    def test_context_without_session_start_is_not_cached(self):
+        self.cache.put(KEY, "0", CONTEXT._replace(session_start_utc=None))
+        self.assertIsNone(self.cache.get(KEY, "0"))
+
+    def test_entries_expire(self):
+        with mock.patch("streaming.session_cache.time.monotonic", return_value=100.0):
+            self.cache.put(KEY, "0", CONTEXT)
+        with mock.patch("streaming.session_cache.time.monotonic", return_value=161.0):
+            self.assertIsNone(self.cache.get(KEY, "0"))
+
+    def test_invalidate_session(self):
+        self.cache.put(KEY, "0", CONTEXT)
+        self.cache.invalidate_session("uid-1")
+        self.assertIsNone(self.cache.get(KEY, "0"))
+        self.assertEqual(self.cache.invalidations, 1)
+
+    def test_least_recently_used_entry_is_evicted(self):
+        other = ("token", "teams", "native-id", "uid-2")
+        third = ("token", "teams", "native-id", "uid-3")
+        self.cache.put(KEY, "0", CONTEXT)
+        self.cache.put(other, "0", CONTEXT)
+        self.cache.get(KEY, "0")
+        self.cache.put(third, "0", CONTEXT)
+        self.assertIsNone(self.cache.get(other, "0"))
+        self.assertEqual(self.cache.get(KEY, "0"), CONTEXT)
@@ -0,0 +1,63 @@
+import json
+import unittest
+
+from mapping.speaker_timeline import (
+    STATUS_MAPPED,
+    STATUS_MULTIPLE,
+    STATUS_NO_SPEAKER_EVENTS,
+    STATUS_UNKNOWN,
+    SpeakerTimeline,
+)
+
+
+def event(event_type, name, timestamp_ms, participant_id=None):
+    payload = {"event_type": event_type, "participant_name": name, "participant_id_meet": participant_id or name}
+    return json.dumps(payload), timestamp_ms
+
+
+class TestSpeakerTimeline(unittest.TestCase):
+    def setUp(self):
+        self.timeline = SpeakerTimeline()
+        self.timeline.add_events([
+            event("SPEAKER_START", "Alice", 0),
+            event("SPEAKER_END", "Alice", 4000),
+            event("SPEAKER_START", "Bob", 3000),
+            event("SPEAKER_END", "Bob", 9000),
+        ])
+
+    def test_no_events(self):
+        results = SpeakerTimeline().map_segments([(0, 1000)])
+        self.assertEqual(results[0]["status"], STATUS_NO_SPEAKER_EVENTS)
+
+    def test_single_speaker(self):
+        result = self.timeline.map_segments([(500, 2500)])[0]
+        self.assertEqual(result["speaker_name"], "Alice")
+        self.assertEqual(result["participant_id_meet"], "Alice")
+        self.assertEqual(result["status"], STATUS_MAPPED)
+
+    def test_longest_overlap_wins(self):
+        result = self.timeline.map_segments([(2500, 8000)])[0]
+        self.assertEqual(result["speaker_name"], "Bob")
+        self.assertEqual(result["status"], STATUS_MULTIPLE)
+
+    def test_tie_goes_to_first_speaker(self):
+        result = self.timeline.map_segments([(3000, 4000)])[0]
+        self.assertEqual(result["speaker_name"], "Alice")
+
+    def test_segment_outside_every_interval(self):
+        result = self.timeline.map_segments([(10000, 11000)])[0]
+        self.assertIsNone(result["speaker_name"])
+        self.assertEqual(result["status"], STATUS_UNKNOWN)
+
+    def test_open_interval_reaches_later_segments(self):
+        self.timeline.add_events([event("SPEAKER_START", "Carol", 20000)])
+        result = self.timeline.map_segments([(60000, 61000)])[0]
+        self.assertEqual(result["speaker_name"], "Carol")
+
+    def test_repeated_members_are_skipped(self):
+        self.timeline.add_events([event("SPEAKER_START", "Alice", 0)])
+        self.assertEqual(len(self.timeline), 4)
+
+    def test_batch_keeps_segment_order(self):
+        results = self.timeline.map_segments([(6000, 7000), (100, 900), (12000, 13000)])
+        self.assertEqual([r["speaker_name"] for r in results], ["Bob", "Alice", None])
@@ -0,0 +1,57 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from api.transcript_cache import FULL_TRANSCRIPT, TranscriptWindow
+
+BASE = datetime(2026, 1, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def at(seconds):
+    return BASE + timedelta(seconds=seconds)
+
+
+class TestTranscriptWindow(unittest.TestCase):
+    def setUp(self):
+        # (absolute start, relative start), sorted as _assemble sorts them; two sessions
+        # put segments at the same absolute start (5s), told apart by their relative start
+        self.segments = [(at(0), 0.0), (at(5), 2.0), (at(5), 5.0), (at(5), 7.0), (at(9), 9.0)]
+        self.absolute_starts = [seg[0] for seg in self.segments]
+
+    def select(self, window):
+        return window.select(self.absolute_starts, self.segments, lambda seg: seg[1])
+
+    def test_full_transcript(self):
+        self.assertTrue(FULL_TRANSCRIPT.is_full)
+        self.assertEqual(self.select(FULL_TRANSCRIPT), self.segments)
+
+    def test_absolute_bounds(self):
+        selected = self.select(TranscriptWindow(since=at(5), until=at(9)))
+        self.assertEqual([seg[1] for seg in selected], [2.0, 5.0, 7.0])
+
+    def test_relative_bounds(self):
+        selected = self.select(TranscriptWindow(since=2.0, until=9.0))
+        self.assertEqual([seg[1] for seg in selected], [2.0, 5.0, 7.0])
+
+    def test_cursor_breaks_ties_by_relative_start(self):
+        selected = self.select(TranscriptWindow(after_segment=at(5), after_segment_start=5.0))
+        self.assertEqual([seg[1] for seg in selected], [7.0, 9.0])
+
+    def test_cursor_without_relative_start_skips_every_tie(self):
+        selected = self.select(TranscriptWindow(after_segment=at(5)))
+        self.assertEqual([seg[1] for seg in selected], [9.0])
+
+    def test_cursor_pages_through_ties(self):
+        pages, cursor = [], TranscriptWindow(limit=2)
+        while True:
+            page = self.select(cursor)
+            if not page:
+                break
+            pages.append([seg[1] for seg in page])
+            cursor = TranscriptWindow(after_segment=page[-1][0], after_segment_start=page[-1][1], limit=2)
+        self.assertEqual(pages, [[0.0, 2.0], [5.0, 7.0], [9.0]])
+
+    def test_windows_have_distinct_etag_suffixes(self):
+        self.assertEqual(FULL_TRANSCRIPT.etag_suffix(), "")
+        first = TranscriptWindow(after_segment=at(5), after_segment_start=2.0).etag_suffix()
+        second = TranscriptWindow(after_segment=at(5), after_segment_start=5.0).etag_suffix()
+        self.assertNotEqual(first, second)